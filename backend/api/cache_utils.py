@@ -1,24 +1,362 @@
+import functools
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
 from django.core.cache import cache
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+"""
+============================================
+Generation-Counter Cache Keys
+============================================
+
+Every cached payload's key embeds the current "generation" of each tag it
+depends on (the team, player or season it was computed from, plus a global
+tag). Invalidating a tag just increments its counter: keys built afterwards
+contain the new number, so old entries are never read again and expire on
+their own TTL. That makes invalidation O(1) per tag on any cache backend
+(Redis or LocMem), with no key scans, delete_pattern or cache.clear().
+
+    key = versioned_key(f"recent_stats_{team_id}_{num_games}", [team_tag(team_id)])
+    ...
+    invalidate_team_cache(team_id)  # every key tagged with this team is now dead
+"""
+
+GLOBAL_TAG = "global"  # Embedded in every key; bump to invalidate everything
+ALL_STATS_TAG = "stats:all"  # League-wide stat views (best team, player search)
+PREDICTIONS_TAG = "predictions"  # Cached model predictions
+CALENDAR_TAG = "calendar"  # Week calendar (api.simulation); bumped on Game saves
+
+
+def team_tag(team_id):
+    return f"team:{team_id}"
+
+
+def game_tag(game_id):
+    return f"game:{game_id}"
+
+
+def player_tag(player_id):
+    return f"player:{player_id}"
+
+
+def season_tag(season):
+    return f"season:{season}"
+
+
+def _generation_key(tag):
+    return f"generation:{tag}"
+
+
+def _initial_generation():
+    # Start counters at the current time (ms) rather than 1: if a counter is
+    # evicted and recreated it still moves past every generation used before
+    return int(time.time() * 1000)
+
+
+def _generations(tags) -> dict:
+    """{tag: current generation} for tags, with one cache read."""
+    keys = {tag: _generation_key(tag) for tag in tags}
+    generations = cache.get_many(list(keys.values()))
+    for key in keys.values():
+        if key not in generations:
+            # add() is a no-op if another worker created it first
+            cache.add(key, _initial_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return {tag: generations[key] for tag, key in keys.items()}
+
+
+def key_version(tags=()) -> str:
+    """Current generations of GLOBAL_TAG + tags, joined ("v<g>.<t1>.<t2>")."""
+    tags = (GLOBAL_TAG, *tags)
+    generations = _generations(tags)
+    return "v" + ".".join(str(generations[tag]) for tag in tags)
+
+
+def versioned_key(base_key, tags=()) -> str:
+    """Cache key that goes stale as soon as any of its tags is invalidated."""
+    return f"{base_key}:{key_version(tags)}"
+
+
+def versioned_keys(specs) -> list:
+    """versioned_key() for many (base_key, tags) pairs with one cache read."""
+    generations = _generations(
+        {GLOBAL_TAG, *(tag for _, tags in specs for tag in tags)}
+    )
+    return [
+        f"{base_key}:v" + ".".join(str(generations[tag]) for tag in (GLOBAL_TAG, *tags))
+        for base_key, tags in specs
+    ]
+
+
+def invalidate_tags(*tags):
+    """Bump each tag's generation, orphaning every key built with it."""
+    for tag in tags:
+        key = _generation_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # No counter yet: nothing can have been cached under this tag
+            # except with an older (evicted) counter, which a fresh
+            # time-based start already moves past
+            cache.add(key, _initial_generation(), timeout=None)
+
 
 """Invalidate all cache entries for a specific team"""
 
 
 def invalidate_team_cache(team_id):
-    # Delete all possible cache keys
-    positions = ["RB", "WR", "TE", "QB"]
-    game_counts = [1, 3, 5, 10]
+    invalidate_tags(team_tag(team_id))
+
+
+"""Invalidate all cache entries for a specific player"""
+
+
+def invalidate_player_cache(player_id):
+    invalidate_tags(player_tag(player_id))
 
-    for num_games in game_counts:
-        # Invalidate recent stats
-        cache.delete(f"recent_stats_{team_id}_{num_games}")
 
-        # Invalidate defense allowed for all positions
-        for position in positions:
-            cache.delete(f"defense_allowed_{team_id}_{num_games}_{position}")
+"""Invalidate all cache entries for a specific season"""
 
 
-"""Clear all caches"""
+def invalidate_season_cache(season):
+    invalidate_tags(season_tag(season))
+
+
+"""Invalidate all caches (without clearing unrelated keys like sessions or locks)"""
 
 
 def invalidate_all_caches():
-    cache.clear()
+    invalidate_tags(GLOBAL_TAG)
+
+
+"""
+============================================
+Cached Responses
+============================================
+
+@cached_response wraps a GET action: the action only computes, the decorator
+owns the cache. On top of plain get/compute/set it adds:
+
+- Single-flight: on a miss only one worker computes a key while the others
+  wait for its result, instead of every request hitting the database at once
+  (a Redis lock shared across workers, or a per-process lock under LocMem)
+- Stale-while-revalidate: entries outlive their TTL by STALE_GRACE; once
+  expired, one worker refreshes while everyone else keeps getting the stale
+  copy
+- Probabilistic early expiry ("XFetch"): shortly before expiry each read has
+  a growing chance to refresh early, weighted by how long the payload took to
+  compute, so popular keys are refreshed before they ever expire
+- Finality: payloads that can no longer change (completed games, past
+  seasons) are kept for CACHE_TTL["final"] instead of the short analytics
+  TTL, and carry a strong ETag and Last-Modified. A conditional GET that
+  matches them gets 304 Not Modified from the cache entry alone, without
+  touching the database
+- Counters: hit / miss / stale / refresh / not_modified per action (see
+  cache_metrics)
+
+    @action(detail=False, methods=["get"], url_path="recent-stats")
+    @cached_response(lambda p: (f"team_game_log_{p['team_id']}", [team_tag(p["team_id"])]))
+    def team_game_log(self, request):
+        ...
+"""
+
+STALE_GRACE = 60 * 5  # Seconds an expired entry can still be served while refreshing
+XFETCH_BETA = 1.0  # > 1 refreshes earlier, < 1 later
+LOCK_TIMEOUT = 60  # Seconds before a crashed worker's lock is released
+LOCK_WAIT = 10  # Seconds a miss waits for another worker's computation
+CACHE_EVENTS = ("hit", "miss", "stale", "refresh", "not_modified")
+
+# Striped per-process locks for backends without cache.lock (LocMem)
+_LOCAL_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+class _KeyLock:
+    """Lock on one cache key: Redis lock if available, else a local lock"""
+
+    def __init__(self, key):
+        if hasattr(cache, "lock"):
+            self._lock = cache.lock(f"lock:{key}", timeout=LOCK_TIMEOUT)
+            self._local = False
+        else:
+            self._lock = _LOCAL_LOCKS[hash(key) % len(_LOCAL_LOCKS)]
+            self._local = True
+        self.acquired = False
+
+    def acquire(self, wait=0):
+        if self._local:
+            self.acquired = self._lock.acquire(timeout=wait or -1, blocking=bool(wait))
+        else:
+            self.acquired = self._lock.acquire(
+                blocking=bool(wait), blocking_timeout=wait or None
+            )
+        return self.acquired
+
+    def release(self):
+        if not self.acquired:
+            return
+        self.acquired = False
+        try:
+            self._lock.release()
+        except Exception:
+            # Redis lock expired (LOCK_TIMEOUT) and may belong to someone else
+            logger.warning("Cache lock was released before the refresh finished")
+
+
+def _metric_key(name, event):
+    return f"cache_metrics:{name}:{event}"
+
+
+def _count(name, event):
+    key = _metric_key(name, event)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cache_metrics(name) -> dict:
+    """Hit/miss/stale/refresh counts for one cached action."""
+    counts = cache.get_many([_metric_key(name, event) for event in CACHE_EVENTS])
+    return {event: counts.get(_metric_key(name, event), 0) for event in CACHE_EVENTS}
+
+
+def _needs_refresh(entry, now) -> bool:
+    # XFetch: refresh when now - delta * beta * ln(rand) passes the expiry.
+    # ln(rand) <= 0, so this fires early with a probability that rises as
+    # expiry approaches, sooner for payloads that are slow to compute
+    early = entry["delta"] * XFETCH_BETA * math.log(1.0 - random.random())
+    return now - early >= entry["expires_at"]
+
+
+def _etag(data) -> str:
+    # Strong validator: identical payloads always hash the same
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return quote_etag(hashlib.sha1(payload.encode()).hexdigest())
+
+
+def _validators(entry) -> dict:
+    if not entry.get("etag"):
+        return {}
+    return {
+        "ETag": entry["etag"],
+        "Last-Modified": http_date(entry["modified_at"]),
+    }
+
+
+def _not_modified(request, entry) -> bool:
+    """True if the request's If-None-Match / If-Modified-Since match a final entry."""
+    if not entry.get("etag"):
+        return False
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        return "*" in etags or entry["etag"] in etags
+    since = parse_http_date_safe(request.headers.get("If-Modified-Since"))
+    return since is not None and int(entry["modified_at"]) <= since
+
+
+def cached_response(key_func, ttl="analytics", final=None):
+    """
+    Cache a viewset action's successful responses.
+
+    Args:
+        key_func: Called with request.query_params; returns (base_key, tags).
+            If it returns None or raises KeyError/TypeError/ValueError (missing
+            or malformed params) the action runs uncached and reports the error
+        ttl: Name of the CACHE_TTL entry, or a number of seconds
+        final: Called with the response data; True if the payload can no
+            longer change (cached for CACHE_TTL["final"] with validators)
+    """
+
+    def decorator(view_method):
+        name = view_method.__name__
+
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                spec = key_func(request.query_params)
+            except (KeyError, TypeError, ValueError):
+                spec = None
+            if spec is None:
+                return view_method(self, request, *args, **kwargs)
+
+            base_key, tags = spec
+            key = versioned_key(base_key, tags)
+            timeout = settings.CACHE_TTL[ttl] if isinstance(ttl, str) else ttl
+
+            def respond(entry):
+                if _not_modified(request, entry):
+                    _count(name, "not_modified")
+                    return Response(status=304, headers=_validators(entry))
+                return Response(entry["data"], headers=_validators(entry))
+
+            def compute(previous=None):
+                start = time.monotonic()
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+                entry = {
+                    "data": response.data,
+                    "delta": time.monotonic() - start,
+                    "etag": None,
+                }
+                entry_timeout = timeout
+                if final is not None and final(response.data):
+                    entry_timeout = settings.CACHE_TTL["final"]
+                    entry["etag"] = _etag(response.data)
+                    # A refresh that produced the same payload keeps its date
+                    unchanged = previous and previous.get("etag") == entry["etag"]
+                    entry["modified_at"] = (
+                        previous["modified_at"] if unchanged else time.time()
+                    )
+                entry["expires_at"] = time.time() + entry_timeout
+                cache.set(key, entry, entry_timeout + STALE_GRACE)
+                return respond(entry)
+
+            lock = _KeyLock(key)
+            entry = cache.get(key)
+            if entry is not None:
+                now = time.time()
+                if not _needs_refresh(entry, now):
+                    _count(name, "hit")
+                    return respond(entry)
+                # Due (or nearly due): one worker refreshes, the rest serve
+                # what is cached
+                if not lock.acquire():
+                    _count(name, "stale" if now >= entry["expires_at"] else "hit")
+                    return respond(entry)
+                try:
+                    _count(name, "refresh")
+                    return compute(previous=entry)
+                finally:
+                    lock.release()
+
+            # Miss: wait for whoever is already computing this key. If the
+            # wait times out, compute anyway rather than fail the request
+            lock.acquire(wait=LOCK_WAIT)
+            try:
+                entry = cache.get(key)
+                if entry is not None:
+                    _count(name, "hit")
+                    return respond(entry)
+                _count(name, "miss")
+                return compute()
+            finally:
+                lock.release()
+
+        return wrapper
+
+    return decorator
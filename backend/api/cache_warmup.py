@@ -0,0 +1,111 @@
+"""
+============================================
+Cache Warm-up
+============================================
+
+Invalidating a tag makes every key built with it unreachable, so after a
+data refresh the first visitor to each team page pays the full query cost.
+These helpers precompute the most-requested payloads instead.
+
+Analytics payloads are produced by calling the real viewset actions with
+internal requests, so they land in the cache under exactly the keys
+@cached_response builds for the same query params from a user request.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from games.models import Game
+from predictions.services import PredictionService
+
+from .viewsets.analytics import AnalyticsViewSet
+
+logger = logging.getLogger(__name__)
+
+# Analytics action -> query param variants requested per team, matching the
+# game page's default 3-game window
+WARM_ENDPOINTS = {
+    "recent_stats": [{}],
+    "defense_allowed": [{"position": pos} for pos in ("QB", "RB", "WR", "TE")],
+    "player_stats": [{}],
+    "usage_metrics": [{}],
+    "team_game_log": [{"games": 3}],
+}
+
+
+def _timing(requests=0, seconds=0.0):
+    return {"requests": requests, "seconds": seconds}
+
+
+def warm_team_endpoints(team_ids) -> dict:
+    """
+    Request every WARM_ENDPOINTS payload for the given teams.
+
+    Returns:
+        {endpoint: {"requests": n, "seconds": total}}
+    """
+    factory = APIRequestFactory()
+    timings = defaultdict(_timing)
+
+    for endpoint, variants in WARM_ENDPOINTS.items():
+        # Internal requests skip auth and throttling (AnonRateThrottle would
+        # otherwise count them against 127.0.0.1)
+        view = AnalyticsViewSet.as_view(
+            {"get": endpoint},
+            authentication_classes=[],
+            permission_classes=[],
+            throttle_classes=[],
+        )
+        for team_id in team_ids:
+            for params in variants:
+                start = time.perf_counter()
+                response = view(factory.get("/", {"team_id": team_id, **params}))
+                timings[endpoint]["seconds"] += time.perf_counter() - start
+                timings[endpoint]["requests"] += 1
+                if response.status_code != 200:
+                    logger.warning(
+                        f"Warming {endpoint} for team {team_id} returned "
+                        f"{response.status_code}"
+                    )
+
+    return dict(timings)
+
+
+def current_week():
+    """(season, week) of the nearest upcoming game, or None after the season"""
+    return (
+        Game.objects.filter(date__gte=timezone.now().date())
+        .order_by("date")
+        .values_list("season", "week")
+        .first()
+    )
+
+
+def warm_week_predictions() -> dict:
+    """
+    Cache predict_week (and each game's prediction) for the current week.
+
+    Returns:
+        {"predict_week": {"requests": n, "seconds": total}}
+    """
+    week = current_week()
+    if week is None:
+        return {}
+
+    start = time.perf_counter()
+    PredictionService().predict_week(*week)
+    return {"predict_week": _timing(1, time.perf_counter() - start)}
+
+
+def merge_timings(results) -> dict:
+    """Sum per-endpoint timings returned by parallel warm-up chunks."""
+    merged = defaultdict(_timing)
+    for result in results:
+        for endpoint, timing in result.items():
+            merged[endpoint]["requests"] += timing["requests"]
+            merged[endpoint]["seconds"] += timing["seconds"]
+    return dict(merged)
@@ -0,0 +1,138 @@
+"""
+============================================
+Defense vs. Position Rankings
+============================================
+
+What every defense allowed to each fantasy position over its own last N
+completed games, ranked league-wide.
+
+/defense-allowed answers this for one team and one position per request, so
+ranking a defense took 32 x 4 requests. compute_defense_rankings() builds
+every (defense, position) line with two queries:
+
+- Each team's last N games: one ROW_NUMBER() window over TeamGameLog
+- Points/yards/TDs allowed: one GROUP BY (defense, game, position) over
+  player stats, where the defense is the side the player's team faced
+
+cached_defense_rankings() caches the result per (window, cutoff) so start/sit
+comparisons and the draft tools share it.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, Sum, When
+
+from games.services import recent_game_windows
+from stats.models import FootballPlayerGameStat
+from teams.models import Team
+
+from .cache_utils import ALL_STATS_TAG, CALENDAR_TAG, versioned_key
+
+RANKED_POSITIONS = ("QB", "RB", "WR", "TE")
+
+
+def compute_defense_rankings(num_games, before=None) -> dict:
+    """
+    Per-game fantasy points, yards and TDs allowed by every defense.
+
+    Args:
+        num_games: Completed games per defense
+        before: Only count games played before this date (simulation)
+
+    Returns:
+        {position: {team_id: {"team", "games", "fantasy_pts_allowed",
+        "yards_allowed", "tds_allowed", "rank", "percentile"}}}
+
+        Values are per-game totals for the whole position, with passing,
+        rushing and receiving yards (player comparisons instead average per
+        opposing player). Rank 1 allowed the fewest fantasy points to the
+        position; percentile is the share of other defenses that allowed
+        more (100 = toughest).
+    """
+    windows = {
+        team_id: set(game_ids)
+        for team_id, game_ids in recent_game_windows(None, num_games, before).items()
+    }
+    abbreviations = dict(
+        Team.objects.filter(id__in=windows).values_list("id", "abbreviation")
+    )
+
+    totals = {
+        (team_id, position): {"fpts": 0.0, "yards": 0, "tds": 0}
+        for team_id in windows
+        for position in RANKED_POSITIONS
+    }
+    all_games = set().union(*windows.values())
+    if all_games:
+        allowed = (
+            FootballPlayerGameStat.objects.filter(
+                game_id__in=all_games, position__in=RANKED_POSITIONS
+            )
+            .annotate(
+                defense_id=Case(
+                    When(team_id=F("game__home_team_id"), then=F("game__away_team_id")),
+                    When(team_id=F("game__away_team_id"), then=F("game__home_team_id")),
+                    default=None,
+                )
+            )
+            # Rows without a team (or with neither side's team) faced no
+            # known defense
+            .filter(defense_id__isnull=False)
+            .values("defense_id", "game_id", "position")
+            .annotate(
+                fpts=Sum("fantasy_points_ppr"),
+                yards=Sum(F("pass_yards") + F("rush_yards") + F("receiving_yards")),
+                tds=Sum(
+                    F("pass_touchdowns")
+                    + F("rush_touchdowns")
+                    + F("receiving_touchdowns")
+                ),
+            )
+            .order_by()
+        )
+        for row in allowed:
+            # A game counts only toward the defense whose window it is in
+            if row["game_id"] not in windows.get(row["defense_id"], ()):
+                continue
+            line = totals[(row["defense_id"], row["position"])]
+            line["fpts"] += row["fpts"] or 0
+            line["yards"] += row["yards"] or 0
+            line["tds"] += row["tds"] or 0
+
+    rankings = {}
+    for position in RANKED_POSITIONS:
+        lines = {}
+        for team_id, game_ids in windows.items():
+            total = totals[(team_id, position)]
+            games = len(game_ids)
+            lines[team_id] = {
+                "team": abbreviations.get(team_id),
+                "games": games,
+                "fantasy_pts_allowed": total["fpts"] / games,
+                "yards_allowed": total["yards"] / games,
+                "tds_allowed": total["tds"] / games,
+            }
+
+        points = sorted(line["fantasy_pts_allowed"] for line in lines.values())
+        others = max(len(points) - 1, 1)
+        for line in lines.values():
+            fewer = sum(1 for p in points if p < line["fantasy_pts_allowed"])
+            more = sum(1 for p in points if p > line["fantasy_pts_allowed"])
+            line["rank"] = fewer + 1
+            line["percentile"] = round(more / others * 100, 1)
+        rankings[position] = lines
+
+    return rankings
+
+
+def cached_defense_rankings(num_games, before=None) -> dict:
+    """compute_defense_rankings(), cached until stats or the schedule change."""
+    key = versioned_key(
+        f"defense_rankings_{num_games}_{before.isoformat() if before else 'all'}",
+        [ALL_STATS_TAG, CALENDAR_TAG],
+    )
+    rankings = cache.get(key)
+    if rankings is None:
+        rankings = compute_defense_rankings(num_games, before)
+        cache.set(key, rankings, settings.CACHE_TTL["analytics"])
+    return rankings
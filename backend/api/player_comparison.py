@@ -0,0 +1,215 @@
+"""
+============================================
+Start/Sit Player Comparisons
+============================================
+
+A comparison is a player's averages over his team's last N completed games,
+his next game on/after a cutoff date (today, or the simulated week's first
+game), and what that opponent allowed to his position over its own last N
+games.
+
+compare_players() builds them for any number of players with a fixed number
+of set-based queries (players, next games, recent windows, player averages,
+defense averages) instead of ~5 queries per player:
+
+- "Last N games per team" and "next game per team" are ROW_NUMBER() windows
+  over TeamGameLog partitioned by team, for every team at once
+- Player averages are one GROUP BY player_id over each player's own window
+- Defense numbers are conditional aggregates, one set per (opponent, position),
+  averaged per opposing player row (as they always have been, unlike the
+  per-game totals of /defense-rankings); only the league rank comes from the
+  shared cached_defense_rankings()
+"""
+
+import operator
+from functools import reduce
+
+from django.db.models import Avg, Count, F, Q
+
+from games.services import next_games, recent_game_windows
+from players.models import Player
+from stats.models import FootballPlayerGameStat
+
+from .defense_rankings import cached_defense_rankings
+
+PLAYER_AGGREGATES = {
+    "avg_fantasy_points": Avg("fantasy_points_ppr"),
+    "avg_targets": Avg("targets"),
+    "avg_receptions": Avg("receptions"),
+    "avg_receiving_yards": Avg("receiving_yards"),
+    "avg_receiving_tds": Avg("receiving_touchdowns"),
+    "avg_rush_attempts": Avg("rush_attempts"),
+    "avg_rush_yards": Avg("rush_yards"),
+    "avg_rush_tds": Avg("rush_touchdowns"),
+    "avg_pass_yards": Avg("pass_yards"),
+    "avg_pass_tds": Avg("pass_touchdowns"),
+    "avg_interceptions": Avg("interceptions"),
+    "games_played": Count("id"),
+    # Advanced metrics
+    "avg_snap_count": Avg("snap_count"),
+    "avg_snap_pct": Avg("snap_pct"),
+    "avg_air_yards": Avg("air_yards"),
+    "avg_yac": Avg("yards_after_catch"),
+}
+
+
+def _any_of(conditions):
+    return reduce(operator.or_, conditions)
+
+
+def compare_players(player_ids, num_games, cutoff) -> dict:
+    """
+    Build start/sit comparisons for many players.
+
+    Args:
+        player_ids: Player IDs (unknown IDs are left out of the result)
+        num_games: Recent games averaged, for players and opposing defenses
+        cutoff: First date that counts as "upcoming"
+
+    Returns:
+        {player_id: comparison payload} (same shape as /player-comparison)
+    """
+    players = list(Player.objects.select_related("team").filter(id__in=player_ids))
+    if not players:
+        return {}
+
+    team_ids = {player.team_id for player in players if player.team_id}
+    upcoming = next_games(team_ids, cutoff)
+    opponent_ids = {log.opponent_id for log in upcoming.values()}
+    windows = recent_game_windows(team_ids | opponent_ids, num_games)
+
+    # Each player's averages over his own team's window
+    player_stats = {}
+    player_windows = [
+        Q(player_id=player.id, game_id__in=windows[player.team_id])
+        for player in players
+        if player.team_id and windows[player.team_id]
+    ]
+    if player_windows:
+        for row in (
+            FootballPlayerGameStat.objects.filter(_any_of(player_windows))
+            .values("player_id")
+            .annotate(**PLAYER_AGGREGATES)
+            .order_by()
+        ):
+            player_stats[row["player_id"]] = row
+
+    # What each upcoming opponent allowed to each position it is facing
+    matchups = sorted(
+        {
+            (upcoming[player.team_id].opponent_id, player.position)
+            for player in players
+            if player.team_id in upcoming
+        }
+    )
+    defense_aggregates = {}
+    for i, (opponent_id, position) in enumerate(matchups):
+        allowed = Q(game_id__in=windows[opponent_id], position=position) & ~Q(
+            team_id=opponent_id
+        )
+        defense_aggregates[f"pts_{i}"] = Avg("fantasy_points_ppr", filter=allowed)
+        defense_aggregates[f"yds_{i}"] = Avg(
+            F("receiving_yards") + F("rush_yards"), filter=allowed
+        )
+        defense_aggregates[f"tds_{i}"] = Avg(
+            F("receiving_touchdowns") + F("rush_touchdowns"), filter=allowed
+        )
+    defense = {}
+    opponent_games = [game for opp in opponent_ids for game in windows[opp]]
+    if defense_aggregates and opponent_games:
+        totals = FootballPlayerGameStat.objects.filter(
+            game_id__in=opponent_games
+        ).aggregate(**defense_aggregates)
+        rankings = cached_defense_rankings(num_games)
+        for i, (opponent_id, position) in enumerate(matchups):
+            defense[(opponent_id, position)] = {
+                "fantasy_pts_allowed": totals[f"pts_{i}"] or 0,
+                "yards_allowed": totals[f"yds_{i}"] or 0,
+                "tds_allowed": totals[f"tds_{i}"] or 0,
+                "rank": rankings.get(position, {}).get(opponent_id, {}).get("rank"),
+            }
+
+    comparisons = {}
+    for player in players:
+        next_game = upcoming.get(player.team_id)
+        opp_defense = None
+        if next_game:
+            opp_defense = defense.get((next_game.opponent_id, player.position), {})
+        comparisons[player.id] = format_comparison(
+            player,
+            player_stats.get(player.id, {}),
+            next_game,
+            opp_defense,
+            num_games,
+        )
+    return comparisons
+
+
+def format_comparison(player, player_stats, next_game, opp_defense, num_games):
+    """Comparison payload from a player's averages, next game and matchup"""
+    stat = player_stats.get
+
+    matchup_data = None
+    defense_ranking = None
+    if next_game:
+        game = next_game.game
+        opponent = next_game.opponent
+        matchup_data = {
+            "game_id": game.id,
+            "opponent": opponent.abbreviation,
+            "opponent_name": opponent.name,
+            "opponent_logo_url": opponent.logo_url,
+            "is_home": next_game.is_home,
+            "game_date": game.date.isoformat(),
+            "game_time": game.time,
+            "location": game.location,
+            "weather": {
+                "temp": game.temp,
+                "wind": game.wind,
+                "roof": game.roof,
+            },
+        }
+        defense_ranking = {
+            "fantasy_pts_allowed": round(opp_defense.get("fantasy_pts_allowed", 0), 1),
+            "yards_allowed": round(opp_defense.get("yards_allowed", 0), 1),
+            "tds_allowed": round(opp_defense.get("tds_allowed", 0), 2),
+            "rank": opp_defense.get("rank"),
+        }
+
+    return {
+        "player": {
+            "id": player.id,
+            "name": player.name,
+            "position": player.position,
+            "team": player.team.abbreviation if player.team else None,
+            "team_name": player.team.name if player.team else None,
+            "image_url": player.image_url,
+        },
+        "stats": {
+            "avg_fantasy_points": round(stat("avg_fantasy_points") or 0, 1),
+            "avg_targets": round(stat("avg_targets") or 0, 1),
+            "avg_receptions": round(stat("avg_receptions") or 0, 1),
+            "avg_receiving_yards": round(stat("avg_receiving_yards") or 0, 1),
+            "avg_receiving_tds": round(stat("avg_receiving_tds") or 0, 2),
+            "avg_rush_attempts": round(stat("avg_rush_attempts") or 0, 1),
+            "avg_rush_yards": round(stat("avg_rush_yards") or 0, 1),
+            "avg_rush_tds": round(stat("avg_rush_tds") or 0, 2),
+            "avg_pass_yards": round(stat("avg_pass_yards") or 0, 1),
+            "avg_pass_tds": round(stat("avg_pass_tds") or 0, 2),
+            "avg_interceptions": round(stat("avg_interceptions") or 0, 2),
+            "games_played": stat("games_played") or 0,
+            # Advanced metrics
+            "avg_snap_count": round(stat("avg_snap_count") or 0, 1),
+            "avg_snap_pct": round(stat("avg_snap_pct") or 0, 1),
+            "avg_air_yards": round(stat("avg_air_yards") or 0, 1),
+            "avg_yac": round(stat("avg_yac") or 0, 1),
+            "adot": (
+                round((stat("avg_air_yards") or 0) / stat("avg_targets"), 1)
+                if stat("avg_targets")
+                else 0
+            ),
+        },
+        "games_analyzed": num_games,
+        "matchup": matchup_data,
+        "opponent_defense": defense_ranking,
+    }
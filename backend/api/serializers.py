@@ -1,7 +1,7 @@
-from django.db.models import Q
 from rest_framework import serializers
 
 from games.models import Game
+from games.services import format_record, season_records
 from players.models import Player
 from teams.models import Team
 
@@ -23,47 +23,30 @@ class TeamWithRecordSerializer(serializers.ModelSerializer):
         # Get the current season from context or default to latest
         season = self.context.get("season")
         if not season:
-            latest_game = Game.objects.order_by("-season").first()
-            season = latest_game.season if latest_game else 2024
-
-        # Get all completed games for this team in the season
-        completed_games = Game.objects.filter(
-            Q(home_team=obj) | Q(away_team=obj),
-            season=season,
-            home_score__isnull=False,
-            away_score__isnull=False,
-        )
+            season = self._latest_season()
 
         # In simulation mode, only count games before the simulated week
+        through_week = None
         simulation_week = self.context.get("simulation_week")
         if simulation_week is not None:
-            completed_games = completed_games.filter(week__lt=simulation_week)
-
-        wins = 0
-        losses = 0
-        ties = 0
-
-        for game in completed_games:
-            if game.home_team_id == obj.id:
-                # Team is home
-                if game.home_score > game.away_score:
-                    wins += 1
-                elif game.home_score < game.away_score:
-                    losses += 1
-                else:
-                    ties += 1
-            else:
-                # Team is away
-                if game.away_score > game.home_score:
-                    wins += 1
-                elif game.away_score < game.home_score:
-                    losses += 1
-                else:
-                    ties += 1
-
-        if ties > 0:
-            return f"{wins}-{losses}-{ties}"
-        return f"{wins}-{losses}"
+            through_week = simulation_week - 1
+
+        records = self._season_records(season, through_week)
+        return format_record(*records.get(obj.id, (0, 0, 0)))
+
+    def _latest_season(self):
+        # Looked up once per serialization, shared by every nested team
+        if "latest_season" not in self.context:
+            latest_game = Game.objects.order_by("-season").first()
+            self.context["latest_season"] = latest_game.season if latest_game else 2024
+        return self.context["latest_season"]
+
+    def _season_records(self, season, through_week):
+        # One standings query per season, shared by every nested team
+        records = self.context.setdefault("season_records", {})
+        if (season, through_week) not in records:
+            records[(season, through_week)] = season_records(season, through_week)
+        return records[(season, through_week)]
 
 
 class PlayerSerializer(serializers.ModelSerializer):
@@ -6,13 +6,70 @@ being at a specific week. Games at/after the simulated week have their
 scores masked so they appear as "upcoming."
 
 No data is mutated — everything works via query-parameter-driven overrides.
+
+The (season, week) -> cutoff date lookup comes from a process-wide week
+calendar, built with one query and rebuilt only when games change (the
+Game post_save hook bumps CALENDAR_TAG, e.g. during seed_games), and the
+context is computed once per request.
 """
 
+import threading
 from dataclasses import dataclass
+from datetime import date
 from typing import Optional
 
+from django.db.models import Min
+
 from games.models import Game
 
+from .cache_utils import CALENDAR_TAG, key_version
+
+
+@dataclass(frozen=True)
+class CalendarWeek:
+    cutoff_date: date  # Date of the week's first game
+
+
+class WeekCalendar:
+    """
+    Every (season, week) in the schedule, shared by all requests in a process.
+
+    Each lookup checks CALENDAR_TAG's generation (one cache read) and
+    rebuilds the calendar if another process has invalidated it.
+    """
+
+    def __init__(self):
+        self._weeks = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, season: int, week: int) -> Optional[CalendarWeek]:
+        return self._load().get((season, week))
+
+    def _load(self) -> dict:
+        version = key_version([CALENDAR_TAG])
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._weeks = self._build()
+                    self._version = version
+        return self._weeks
+
+    @staticmethod
+    def _build() -> dict:
+        weeks = (
+            Game.objects.values_list("season", "week")
+            .annotate(cutoff_date=Min("date"))
+            .order_by()
+        )
+        return {
+            (season, week): CalendarWeek(cutoff_date=cutoff_date)
+            for season, week, cutoff_date in weeks
+        }
+
+
+week_calendar = WeekCalendar()
+
 
 @dataclass
 class SimulationContext:
@@ -26,6 +83,15 @@ class SimulationMixin:
     """Mixin for DRF views that need simulation awareness."""
 
     def get_simulation_context(self, request) -> SimulationContext:
+        # Memoized on the request: views call this from several hooks
+        sim = getattr(request, "_simulation_context", None)
+        if sim is None:
+            sim = self._build_simulation_context(request)
+            request._simulation_context = sim
+        return sim
+
+    @staticmethod
+    def _build_simulation_context(request) -> SimulationContext:
         season = request.query_params.get("simulate_season")
         week = request.query_params.get("simulate_week")
 
@@ -38,35 +104,33 @@ class SimulationMixin:
         except (ValueError, TypeError):
             return SimulationContext(is_active=False)
 
-        # Compute cutoff date from the first game of the simulated week
-        first_game = (
-            Game.objects.filter(season=season, week=week)
-            .order_by("date")
-            .values_list("date", flat=True)
-            .first()
-        )
+        # Cutoff date is the first game of the simulated week
+        calendar_week = week_calendar.get(season, week)
 
         return SimulationContext(
             is_active=True,
             season=season,
             week=week,
-            cutoff_date=first_game,
+            cutoff_date=calendar_week.cutoff_date if calendar_week else None,
         )
 
     @staticmethod
-    def is_game_in_future(game, sim: SimulationContext) -> bool:
-        """True if game is at or after the simulation cutoff date."""
+    def is_game_in_future(game_date, sim: SimulationContext) -> bool:
+        """True if a game on this date is at or after the simulation cutoff date."""
         if not sim.is_active or not sim.cutoff_date:
             return False
-        return game.date >= sim.cutoff_date
+        if isinstance(game_date, str):
+            game_date = date.fromisoformat(game_date)
+        return game_date >= sim.cutoff_date
 
     @staticmethod
-    def mask_game_scores(game_data: dict, game, sim: SimulationContext) -> dict:
+    def mask_game_scores(game_data: dict, sim: SimulationContext) -> dict:
         """
         Null out scores for games at/after the simulated week.
+        Works on serialized game data (uses its "date"), so no queries.
         Stores actual scores in _actual_* fields for reveal functionality.
         """
-        if not SimulationMixin.is_game_in_future(game, sim):
+        if not SimulationMixin.is_game_in_future(game_data["date"], sim):
             return game_data
 
         game_data["_actual_home_score"] = game_data.get("home_score")
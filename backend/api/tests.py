@@ -1,13 +1,66 @@
+import io
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from datetime import date, timedelta
-
+from unittest import mock
+
+import numpy as np
+import polars as pl
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-
-from games.models import Game
+from rest_framework.throttling import AnonRateThrottle
+
+from api.cache_utils import (
+    ALL_STATS_TAG,
+    _KeyLock,
+    cache_metrics,
+    game_tag,
+    invalidate_all_caches,
+    invalidate_tags,
+    invalidate_team_cache,
+    player_tag,
+    season_tag,
+    team_tag,
+    versioned_key,
+)
+from api.cache_warmup import merge_timings, warm_team_endpoints
+from api.simulation import SimulationMixin, week_calendar
+from api.viewsets.analytics import MAX_COMPARISON_PLAYERS
+from draft.engine import DraftEngine
+from draft.models import DraftPick, DraftSession
+from draft.recommendations import ROLLOUT_CHUNK, recommend
+from draft.simulator import (
+    cached_adp,
+    player_pool,
+    simulate_drafts,
+    snake_order,
+    summarize,
+)
+from draft.tasks import request_adp, simulate_adp
+from games.models import Game, TeamGameLog, TeamStanding
+from games.services import season_records
 from players.models import Player
-from stats.models import FootballPlayerGameStat, FootballTeamGameStat
+from predictions.bulk_features import BulkFeatureBuilder
+from predictions.feature_store import TeamFeatureStore, refresh_snapshots
+from predictions.features import FeatureExtractor, InsufficientDataError
+from predictions.ml_models import GamePredictionModel
+from predictions.models import PredictionModelVersion, TeamFeatureSnapshot
+from predictions.services import PredictionService
+from predictions.training import TrainingDataBuilder
+from stats.cube import get_stats_cube, reset_stats_cube
+from stats.ingest import seed_stats_frames
+from stats.models import FootballPlayerGameStat, FootballTeamGameStat, PlayerRollingStat
+from stats.rolling import SEASON_TO_DATE, refresh_rolling_stats
+from stats.scoring import ScoringRules
 from teams.models import Team
 
 
@@ -113,6 +166,8 @@ class BaseTestCase(APITestCase):
         cls.qb1_stats = FootballPlayerGameStat.objects.create(
             player=cls.qb1,
             game=cls.past_game,
+            team=cls.team1,
+            position="QB",
             pass_attempts=35,
             pass_completions=28,
             pass_yards=320,
@@ -128,6 +183,8 @@ class BaseTestCase(APITestCase):
         cls.rb1_stats = FootballPlayerGameStat.objects.create(
             player=cls.rb1,
             game=cls.past_game,
+            team=cls.team1,
+            position="RB",
             rush_attempts=18,
             rush_yards=95,
             rush_touchdowns=1,
@@ -142,6 +199,8 @@ class BaseTestCase(APITestCase):
         cls.te1_stats = FootballPlayerGameStat.objects.create(
             player=cls.te1,
             game=cls.past_game,
+            team=cls.team1,
+            position="TE",
             targets=10,
             receptions=8,
             receiving_yards=85,
@@ -157,6 +216,8 @@ class BaseTestCase(APITestCase):
         cls.wr1_stats = FootballPlayerGameStat.objects.create(
             player=cls.wr1,
             game=cls.past_game,
+            team=cls.team2,
+            position="WR",
             targets=7,
             receptions=5,
             receiving_yards=68,
@@ -206,6 +267,10 @@ class BaseTestCase(APITestCase):
             def_interceptions=0,
         )
 
+    def setUp(self):
+        # Responses are cached across requests; start every test cold
+        cache.clear()
+
     def get_results(self, response):
         """Extract results list from paginated or non-paginated response."""
         if isinstance(response.data, dict) and "results" in response.data:
@@ -516,6 +581,20 @@ class AnalyticsAPITests(BaseTestCase):
         self.assertIn("per_game", response.data)
         self.assertIn("season_avg", response.data)
 
+    def test_traded_player_stats_stay_with_old_team(self):
+        """Stat rows keep the team the player had in that game"""
+        Player.objects.filter(id=self.te1.id).update(team=self.team3)
+        response = self.client.get(
+            f"/api/analytics/usage-metrics/?team_id={self.team1.id}"
+        )
+        self.assertIn(
+            "Travis Kelce", [t["name"] for t in response.data["target_share"]]
+        )
+        response = self.client.get(
+            f"/api/analytics/usage-metrics/?team_id={self.team3.id}"
+        )
+        self.assertEqual(response.data["target_share"], [])
+
     def test_best_team_success(self):
         """Test best-team endpoint"""
         response = self.client.get("/api/analytics/best-team/")
@@ -690,6 +769,1181 @@ class DraftAPITests(BaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+class DraftAITests(BaseTestCase):
+    """AI drafting from the ranked pool: live engine and mock-draft simulator"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(24):
+            player = Player.objects.create(
+                id=f"00-99{i:05d}",
+                name=f"Depth {i}",
+                position=["RB", "WR", "TE"][i % 3],
+                status="ACT",
+                team=cls.team3,
+                season=2025,
+            )
+            FootballPlayerGameStat.objects.create(
+                player=player,
+                game=cls.past_game,
+                team=cls.team3,
+                position=player.position,
+                fantasy_points_ppr=15.0 - i * 0.5,
+            )
+
+    def create(self, **config):
+        response = self.client.post("/api/draft/create/", config, format="json")
+        return DraftSession.objects.get(pk=response.data["session_id"])
+
+    def test_position_limits(self):
+        pool = [
+            (1, "a", "TE", 30.0),
+            (2, "b", "TE", 29.0),
+            (3, "c", "TE", 28.0),
+            (4, "d", "WR", 10.0),
+        ]
+        engine = DraftEngine(None, pool, [(1, 1), (2, 1)])
+        self.assertEqual(engine.best_available(1), 4)  # TE limit reached
+        self.assertEqual(engine.best_available(2), 3)
+
+        engine = DraftEngine(None, pool, [(1, 1), (2, 1), (4, 2)])
+        self.assertEqual(engine.best_available(1), 3)  # Nothing else left
+
+    def test_turn_is_one_write(self):
+        session = self.create(num_teams=12, num_rounds=2, user_team_position=6)
+        self.assertEqual(session.current_pick, 6)
+        picks = list(session.picks.values_list("overall_pick", "player__name"))
+        self.assertEqual(len(picks), 5)
+        # Best available in ranking order
+        self.assertEqual(picks[0], (1, "Patrick Mahomes"))
+        self.assertEqual(picks[4], (5, "Depth 0"))
+
+        # User pick, then 12 AI picks from the cached pool snapshot: session,
+        # player, already-drafted check, user insert, picks so far, then one
+        # bulk insert and one session update (plus the turn's and the AI
+        # batch's savepoint/release)
+        with self.assertNumQueries(11):
+            response = self.client.post(
+                f"/api/draft/{session.id}/pick/",
+                {"player_id": "00-9900007"},
+                format="json",
+            )
+        self.assertEqual(len(response.data["ai_picks"]), 12)
+        self.assertEqual(response.data["current_pick"], 19)
+        self.assertEqual(DraftPick.objects.filter(session=session).count(), 18)
+
+    def test_failed_turn_rolls_back(self):
+        session = self.create(num_teams=4, num_rounds=3, user_team_position=1)
+        board = self.client.get(f"/api/draft/{session.id}/board/").data
+
+        with mock.patch.object(
+            DraftPick.objects, "bulk_create", side_effect=IntegrityError
+        ):
+            with self.assertRaises(IntegrityError), self.assertLogs("django.request"):
+                self.client.post(
+                    f"/api/draft/{session.id}/pick/",
+                    {"player_id": self.qb1.id},
+                    format="json",
+                )
+        # Neither the user's pick nor the board cache moved on
+        session.refresh_from_db()
+        self.assertEqual(session.current_pick, 1)
+        self.assertFalse(session.picks.exists())
+        self.assertEqual(self.client.get(f"/api/draft/{session.id}/board/").data, board)
+
+        response = self.client.post(
+            f"/api/draft/{session.id}/pick/", {"player_id": self.qb1.id}, format="json"
+        )
+        self.assertEqual(response.data["current_pick"], 8)
+
+    def test_snapshot_survives_cache_loss(self):
+        session = self.create(num_teams=2, num_rounds=3, user_team_position=1)
+        cache.clear()
+        response = self.client.post(
+            f"/api/draft/{session.id}/pick/",
+            {"player_id": self.te1.id},
+            format="json",
+        )
+        drafted = list(session.picks.values_list("player_id", flat=True))
+        self.assertEqual(len(drafted), len(set(drafted)))
+        self.assertEqual(response.data["current_pick"], 4)
+
+    def test_recommendations(self):
+        session = self.create(num_teams=4, num_rounds=3, user_team_position=1)
+        response = self.client.get(f"/api/draft/{session.id}/recommendations/?top=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["next_pick"], 8)
+        recs = response.data["recommendations"]
+        self.assertEqual(len(recs), 3)
+        # The only QB: nothing like him is left by the user's next turn
+        self.assertEqual(recs[0]["player"]["name"], "Patrick Mahomes")
+        self.assertEqual(recs[0]["vor"], 26.8)
+        values = [rec["expected_roster_value"] for rec in recs]
+        self.assertEqual(values, sorted(values, reverse=True))
+        self.assertGreater(recs[0]["expected_roster_value"], 26.8)
+
+        # The time budget bounds the rollouts, but one chunk always runs
+        result = recommend(session, budget_ms=0)
+        self.assertEqual(result["rollouts"], ROLLOUT_CHUNK)
+
+        self.client.post(
+            f"/api/draft/{session.id}/pick/", {"player_id": self.qb1.id}, format="json"
+        )
+        session.refresh_from_db()
+        self.assertEqual(session.current_pick, 8)
+        # Back-to-back turns at the end of the snake
+        response = self.client.get(f"/api/draft/{session.id}/recommendations/")
+        self.assertEqual(response.data["next_pick"], 9)
+
+    def test_recommendations_off_turn(self):
+        session = self.create(num_teams=4, num_rounds=3, user_team_position=3)
+        session.current_pick = 1
+        session.save()
+        response = self.client.get(f"/api/draft/{session.id}/recommendations/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_pick_stream(self):
+        session = await sync_to_async(self.create)(
+            num_teams=4, num_rounds=3, user_team_position=1
+        )
+        response = await self.async_client.post(
+            f"/api/draft/{session.id}/pick/stream/",
+            {"player_id": self.qb1.id},
+            content_type="application/json",
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in response.streaming_content])
+
+        events = [
+            (lines[0].removeprefix("event: "), json.loads(lines[1][6:]))
+            for lines in (event.split("\n") for event in body.decode().split("\n\n"))
+            if lines[0]
+        ]
+        self.assertEqual([name for name, _ in events], ["pick"] * 6 + ["done"])
+        self.assertEqual(events[0][1]["overall_pick"], 2)
+        self.assertEqual(events[-1][1]["current_pick"], 8)
+
+        # Reconnecting clients fetch only what they missed
+        response = await sync_to_async(self.client.get)(
+            f"/api/draft/{session.id}/board/?since_pick=5"
+        )
+        self.assertEqual([p["overall_pick"] for p in response.data["picks"]], [6, 7])
+
+        response = await self.async_client.post(
+            f"/api/draft/{session.id}/pick/stream/",
+            {"player_id": self.qb1.id},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pick_stream_is_throttled(self):
+        cache.clear()
+        url = "/api/draft/999/pick/stream/"
+        throttled = {
+            "DEFAULT_THROTTLE_CLASSES": ["rest_framework.throttling.AnonRateThrottle"]
+        }
+        with self.settings(REST_FRAMEWORK=throttled), mock.patch.object(
+            AnonRateThrottle, "rate", "1/min", create=True
+        ):
+            response = self.client.post(url, {}, content_type="application/json")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            response = self.client.post(url, {}, content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "60")
+
+    def test_board_is_cached_and_incremental(self):
+        session = self.create(num_teams=4, num_rounds=3, user_team_position=1)
+        url = f"/api/draft/{session.id}/board/"
+        self.client.get(url)
+        with self.assertNumQueries(1):  # Just the session
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/draft/{session.id}/pick/",
+                {"player_id": self.qb1.id},
+                format="json",
+            )
+        with self.assertNumQueries(1):
+            incremental = self.client.get(url).data
+        self.assertEqual(
+            [p["overall_pick"] for p in incremental["picks"]], list(range(1, 8))
+        )
+        self.assertEqual(incremental["picks"][0]["player"]["team"], "KC")
+
+        cache.clear()
+        self.assertEqual(self.client.get(url).data, incremental)
+
+    def test_roster_projections(self):
+        session = self.create(num_teams=2, num_rounds=3, user_team_position=1)
+        for player in (self.qb1, self.wr1):
+            self.client.post(
+                f"/api/draft/{session.id}/pick/",
+                {"player_id": player.id},
+                format="json",
+            )
+        self.client.get(f"/api/draft/{session.id}/board/")
+
+        # Session only: board and projections come from the session's cache
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/draft/{session.id}/roster/")
+        self.assertEqual(
+            [(p["player"]["name"], p["avg_fpts"]) for p in response.data["roster"]],
+            [("Patrick Mahomes", 26.8), ("Deebo Samuel", 17.3)],
+        )
+        self.assertEqual(response.data["projected_weekly_total"], 44.1)
+
+        # Players outside the pool: one grouped aggregate
+        self.wr1.status = "RES"
+        self.wr1.save()
+        cache.clear()
+        response = self.client.get(f"/api/draft/{session.id}/roster/")
+        self.assertEqual(response.data["roster"][1]["avg_fpts"], 17.3)
+
+    def test_snake_order(self):
+        self.assertEqual(snake_order(3, 2).tolist(), [0, 1, 2, 2, 1, 0])
+
+    def test_simulated_drafts(self):
+        pool = player_pool("PPR", 12)
+        picks = simulate_drafts(
+            pool["values"], pool["positions"], 4, 3, num_drafts=300, noise=2.0, seed=1
+        )
+        self.assertEqual(picks.shape, (300, 12))
+        # No player twice in a draft
+        self.assertTrue(all(len(set(row)) == 12 for row in picks.tolist()))
+        again = simulate_drafts(
+            pool["values"], pool["positions"], 4, 3, num_drafts=300, noise=2.0, seed=1
+        )
+        self.assertTrue((picks == again).all())
+
+        players = summarize(picks, pool, 4)
+        self.assertEqual(players[0]["name"], "Patrick Mahomes")
+        self.assertEqual(players[0]["drafted_pct"], 100.0)
+        self.assertEqual(sum(players[0]["rounds"]), 100.0)
+        adps = [p["adp"] for p in players]
+        self.assertEqual(adps, sorted(adps))
+
+    def test_positional_runs(self):
+        pool = {
+            "ids": ["a", "b", "c", "d"],
+            "names": ["a", "b", "c", "d"],
+            "teams": [None] * 4,
+            "positions": np.array([1, 1, 1, 2]),
+            "values": np.array([4.0, 3.0, 2.0, 1.0]),
+        }
+        players = summarize(np.array([[0, 1, 2, 3], [3, 0, 1, 2]]), pool, 2)
+        runs = {p["id"]: p["run_pct"] for p in players}
+        self.assertEqual(runs, {"a": 100.0, "b": 100.0, "c": 100.0, "d": 0.0})
+        self.assertEqual(players[-1]["rounds"], [0.0, 100.0])  # c: picks 3 and 4
+
+    def test_adp_endpoint(self):
+        cache.clear()
+        url = "/api/draft/adp/?num_teams=4&num_rounds=3&noise=0"
+        # A miss queues the simulation instead of running it in the request
+        with mock.patch("draft.tasks.simulate_adp.delay") as delay:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(response["Retry-After"], "5")
+            self.client.get(url)  # Already queued
+        delay.assert_called_once_with("PPR", 4, 3, 0.0)
+
+        simulate_adp(*delay.call_args.args)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["players"][0]["name"], "Patrick Mahomes")
+        self.assertEqual(response.data["players"][0]["adp"], 1.0)
+        # Noise is simulated at whole points, so nearby values share a run
+        with self.assertNumQueries(0):
+            response = self.client.get(f"{url}.4")
+        self.assertEqual(response.data["noise"], 0.0)
+
+        for params in ("scoring_format=TEN", "num_teams=40", "noise=lots"):
+            response = self.client.get(f"/api/draft/adp/?{params}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # More picks than ranked players: the simulation's error is cached
+        url = "/api/draft/adp/?num_teams=4&num_rounds=20"
+        with mock.patch("draft.tasks.simulate_adp.delay", side_effect=simulate_adp):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+    def test_concurrent_adp_misses_queue_once(self):
+        cache.clear()
+        with mock.patch("draft.tasks.simulate_adp.delay") as delay:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(
+                    pool.map(
+                        lambda noise: request_adp("PPR", 4, 3, noise), [3, 3.2, 2.9]
+                    )
+                )
+            self.assertEqual(delay.call_count, 1)
+
+            # Finishing (or failing) the run lets a later miss queue again
+            with mock.patch("draft.tasks.compute_adp", side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    simulate_adp("PPR", 4, 3, 3.0)
+            self.assertIsNone(cached_adp("PPR", 4, 3, 3))
+            request_adp("PPR", 4, 3, 3)
+            self.assertEqual(delay.call_count, 2)
+
+    def test_simulate_command_fills_adp_cache(self):
+        call_command(
+            "simulate_drafts",
+            teams=4,
+            rounds=3,
+            drafts=300,
+            workers=2,
+            seed=1,
+            stdout=io.StringIO(),
+        )
+        response = self.client.get("/api/draft/adp/?num_teams=4&num_rounds=3")
+        self.assertEqual(response.data["drafts"], 300)
+
+
+class TeamGameLogTests(BaseTestCase):
+    """Per-team game rows stay in sync with Game"""
+
+    def test_two_rows_per_game(self):
+        home, away = (
+            TeamGameLog.objects.filter(game=self.past_game)
+            .order_by("-is_home")
+            .values_list("team_id", "opponent_id", "points_for", "result")
+        )
+        self.assertEqual(home, (self.team1.id, self.team2.id, 31, "W"))
+        self.assertEqual(away, (self.team2.id, self.team1.id, 24, "L"))
+
+    def test_unplayed_game_has_no_result(self):
+        log = TeamGameLog.objects.get(game=self.upcoming_game, team=self.team3)
+        self.assertIsNone(log.points_for)
+        self.assertIsNone(log.result)
+
+    def test_score_update_resyncs(self):
+        self.upcoming_game.home_score = 20
+        self.upcoming_game.away_score = 20
+        self.upcoming_game.save()
+        results = TeamGameLog.objects.filter(game=self.upcoming_game).values_list(
+            "result", flat=True
+        )
+        self.assertEqual(list(results), ["T", "T"])
+
+    def test_new_game_refreshes_cached_team_views(self):
+        url = (
+            f"/api/analytics/head-to-head/?team1_id={self.team1.id}"
+            f"&team2_id={self.team2.id}"
+        )
+        self.assertEqual(len(self.client.get(url).data["matchups"]), 1)
+
+        Game.objects.create(
+            id="2024_10_KC_SF",
+            season=2024,
+            week=10,
+            date=self.past_game.date - timedelta(weeks=30),
+            home_team=self.team2,
+            away_team=self.team1,
+            home_score=17,
+            away_score=20,
+        )
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["matchups"]), 2)
+        self.assertEqual(response.data["series_record"]["team1_wins"], 2)
+
+    def test_game_record_from_logs(self):
+        response = self.client.get(f"/api/games/{self.past_game.id}/")
+        self.assertEqual(response.data["home_team"]["record"], "1-0")
+        self.assertEqual(response.data["away_team"]["record"], "0-1")
+
+
+class AnalyticsQueryCountTests(BaseTestCase):
+    """Query counts don't grow with the number of games requested"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for weeks_ago in range(2, 6):
+            game = Game.objects.create(
+                id=f"2024_{weeks_ago:02d}_SF_KC",
+                season=2024,
+                week=18 - weeks_ago,
+                date=cls.past_game.date - timedelta(weeks=weeks_ago),
+                home_team=cls.team1,
+                away_team=cls.team2,
+                home_score=20,
+                away_score=17,
+            )
+            for team in (cls.team1, cls.team2):
+                FootballTeamGameStat.objects.create(
+                    team=team, game=game, pass_yards=200, rush_yards=100
+                )
+            for player in (cls.rb1, cls.te1):
+                FootballPlayerGameStat.objects.create(
+                    player=player,
+                    game=game,
+                    team_id=player.team_id,
+                    position=player.position,
+                    targets=5,
+                    rush_attempts=10,
+                )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_head_to_head_query_count(self):
+        for limit in (1, 5):
+            url = (
+                f"/api/analytics/head-to-head/?team1_id={self.team1.id}"
+                f"&team2_id={self.team2.id}&limit={limit}"
+            )
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(len(response.data["matchups"]), limit)
+
+    def test_usage_trends_query_count(self):
+        for num_games in (1, 5):
+            url = f"/api/analytics/usage-trends/?team_id={self.team1.id}&games={num_games}"
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(len(response.data["per_game"]), num_games)
+
+        latest = response.data["per_game"][-1]
+        self.assertEqual(latest["target_shares"], {"Travis Kelce": 71.4})
+        self.assertEqual(latest["carry_shares"], {"Isiah Pacheco": 81.8})
+
+
+class TeamStandingTests(BaseTestCase):
+    """Records come from TeamStanding, one query per season"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Week 3: KC loses at PHI (KC's week 2 game is still upcoming)
+        cls.week3_game = Game.objects.create(
+            id="2025_03_KC_PHI",
+            season=2025,
+            week=3,
+            date=cls.upcoming_game.date + timedelta(days=7),
+            home_team=cls.team3,
+            away_team=cls.team1,
+            home_score=27,
+            away_score=20,
+        )
+
+    def test_standings_are_cumulative_and_skip_unplayed_weeks(self):
+        standings = TeamStanding.objects.filter(team=self.team1, season=2025)
+        self.assertEqual(
+            list(standings.order_by("week").values_list("week", "wins", "losses")),
+            [(1, 1, 0), (3, 1, 1)],
+        )
+        self.assertEqual(season_records(2025)[self.team1.id], (1, 1, 0))
+        self.assertEqual(season_records(2025, through_week=2)[self.team1.id], (1, 0, 0))
+        self.assertNotIn(self.team3.id, season_records(2025, through_week=2))
+
+    def test_saving_a_game_refreshes_standings(self):
+        Game.objects.filter(id=self.week3_game.id).update(away_score=30)
+        self.week3_game.refresh_from_db()
+        self.week3_game.save()
+        self.assertEqual(season_records(2025)[self.team1.id], (2, 0, 0))
+
+    def test_moving_a_game_refreshes_the_standings_it_left(self):
+        self.week3_game.away_team = self.team2
+        self.week3_game.save()
+        self.assertEqual(season_records(2025)[self.team1.id], (1, 0, 0))
+        self.assertEqual(season_records(2025)[self.team2.id], (0, 2, 0))
+
+        self.week3_game.season = 2024
+        self.week3_game.save()
+        self.assertEqual(season_records(2025)[self.team2.id], (0, 1, 0))
+        self.assertNotIn(self.team3.id, season_records(2025))
+        self.assertEqual(season_records(2024)[self.team3.id], (1, 0, 0))
+
+    def test_game_list_reads_records_in_one_query_per_season(self):
+        # Count, page of games, one standings query for 2025
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/games/?season=2025")
+        records = {
+            game["id"]: game["away_team"]["record"] for game in response.data["results"]
+        }
+        self.assertEqual(records["2025_03_KC_PHI"], "1-1")
+
+    def test_simulation_uses_record_before_simulated_week(self):
+        response = self.client.get(
+            f"/api/games/{self.week3_game.id}/?simulate_season=2025&simulate_week=3"
+        )
+        self.assertEqual(response.data["away_team"]["record"], "1-0")
+        self.assertEqual(response.data["home_team"]["record"], "0-0")
+
+
+class SimulationContextTests(BaseTestCase):
+    """Simulation cutoffs come from the week calendar, once per request"""
+
+    def setUp(self):
+        super().setUp()
+        self.sim_url = "/api/games/?season=2025&simulate_season=2025&simulate_week=1"
+        week_calendar.get(2025, 1)  # build outside the query counts
+
+    def test_calendar_weeks(self):
+        self.assertEqual(week_calendar.get(2025, 1).cutoff_date, self.past_game.date)
+        self.assertIsNone(week_calendar.get(2025, 9))
+
+        # A week's cutoff is its first game's date
+        Game.objects.create(
+            id="2025_01_PHI_SF",
+            season=2025,
+            week=1,
+            date=self.past_game.date - timedelta(days=3),
+            home_team=self.team2,
+            away_team=self.team3,
+        )
+        self.assertEqual(
+            week_calendar.get(2025, 1).cutoff_date,
+            self.past_game.date - timedelta(days=3),
+        )
+
+    def test_calendar_is_rebuilt_when_games_are_saved(self):
+        Game.objects.create(
+            id="2025_09_PHI_SF",
+            season=2025,
+            week=9,
+            date=self.upcoming_game.date + timedelta(weeks=7),
+            home_team=self.team2,
+            away_team=self.team3,
+        )
+        self.assertEqual(
+            week_calendar.get(2025, 9).cutoff_date,
+            self.upcoming_game.date + timedelta(weeks=7),
+        )
+
+    def test_simulated_list_masks_without_extra_queries(self):
+        # Count, page of games, one standings query: same as without simulation
+        with self.assertNumQueries(3):
+            response = self.client.get(self.sim_url)
+
+        masked = {game["id"]: game for game in response.data["results"]}
+        self.assertIsNone(masked[self.past_game.id]["home_score"])
+        self.assertEqual(masked[self.past_game.id]["_actual_home_score"], 31)
+
+    def test_simulated_retrieve_masks_without_refetching(self):
+        url = f"/api/games/{self.past_game.id}/?simulate_season=2025&simulate_week=2"
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["home_score"], 31)
+
+    def test_context_is_built_once_per_request(self):
+        with mock.patch.object(
+            SimulationMixin,
+            "_build_simulation_context",
+            wraps=SimulationMixin._build_simulation_context,
+        ) as build:
+            self.client.get(self.sim_url)
+        self.assertEqual(build.call_count, 1)
+
+
+class FinalResponseTests(BaseTestCase):
+    """Final payloads: long TTL, validators and 304s from the cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/analytics/game-box-score/?game_id={self.past_game.id}"
+
+    def test_final_payload_has_validators_and_long_ttl(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        entry = cache.get(
+            versioned_key(
+                f"game_box_score_{self.past_game.id}", [game_tag(self.past_game.id)]
+            )
+        )
+        self.assertGreater(entry["expires_at"], time.time() + 60 * 60 * 24)
+
+    def test_conditional_get_is_not_modified_without_queries(self):
+        response = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            by_etag = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+            by_date = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        self.assertEqual(by_etag.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cache_metrics("game_box_score")["not_modified"], 2)
+
+        stale = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_saving_the_game_invalidates_it(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.past_game.home_score = 34
+        self.past_game.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["home_team"]["score"], 34)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_game_lists_are_final_only_when_every_game_is(self):
+        completed = self.client.get("/api/games/?season=2025&week=1")
+        self.assertIn("ETag", completed)
+
+        with_upcoming = self.client.get("/api/games/?season=2025")
+        self.assertNotIn("ETag", with_upcoming)
+
+
+class PlayerComparisonBatchTests(BaseTestCase):
+    """Batch start/sit comparisons: fixed query count, cached per player"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # PHI (KC's next opponent) allowed a WR line two weeks ago
+        phi_game = Game.objects.create(
+            id="2025_00_SF_PHI",
+            season=2025,
+            week=0,
+            date=cls.past_game.date - timedelta(days=7),
+            home_team=cls.team3,
+            away_team=cls.team2,
+            home_score=14,
+            away_score=10,
+        )
+        FootballPlayerGameStat.objects.create(
+            player=cls.wr1,
+            game=phi_game,
+            team=cls.team2,
+            position="WR",
+            receiving_yards=90,
+            rush_yards=10,
+            receiving_touchdowns=1,
+            fantasy_points_ppr=22.0,
+        )
+        cls.wr2 = Player.objects.create(
+            id="00-0099999",
+            name="Backup WR",
+            position="WR",
+            status="ACT",
+            team=cls.team1,
+            season=2025,
+        )
+
+    def batch_url(self, *player_ids):
+        return (
+            f"/api/analytics/player-comparison-batch/?player_ids={','.join(player_ids)}"
+        )
+
+    def test_matches_single_player_endpoint(self):
+        response = self.client.get(self.batch_url(self.te1.id, "nobody", self.qb1.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry["player"]["id"] for entry in response.data["players"]],
+            [self.te1.id, self.qb1.id],
+        )
+        self.assertEqual(response.data["not_found"], ["nobody"])
+
+        cache.clear()
+        single = self.client.get(
+            f"/api/analytics/player-comparison/?player_id={self.qb1.id}"
+        )
+        self.assertEqual(response.data["players"][1], single.data)
+
+    def test_defense_allowed_to_position(self):
+        slot_wr = Player.objects.create(
+            id="00-0099998", name="Slot WR", position="WR", team=self.team2
+        )
+        FootballPlayerGameStat.objects.create(
+            player=slot_wr,
+            game=Game.objects.get(id="2025_00_SF_PHI"),
+            team=self.team2,
+            position="WR",
+            receiving_yards=40,
+            pass_yards=20,
+            fantasy_points_ppr=10.0,
+        )
+        response = self.client.get(self.batch_url(self.wr2.id))
+        entry = response.data["players"][0]
+        self.assertEqual(entry["matchup"]["opponent"], "PHI")
+        # Averaged per opposing WR, rushing + receiving yards only
+        self.assertEqual(
+            entry["opponent_defense"],
+            {
+                "fantasy_pts_allowed": 16.0,
+                "yards_allowed": 70.0,
+                "tds_allowed": 0.5,
+                "rank": 3,  # SF allowed no WR points, KC allowed 17.3
+            },
+        )
+
+    def test_query_count_does_not_grow_with_players(self):
+        # Players, next games, recent windows, player averages, defense, plus
+        # three for the league-wide defense rankings
+        with self.assertNumQueries(8):
+            self.client.get(self.batch_url(self.qb1.id))
+        cache.clear()
+        with self.assertNumQueries(8):
+            self.client.get(
+                self.batch_url(self.qb1.id, self.rb1.id, self.te1.id, self.wr2.id)
+            )
+
+    def test_comparisons_are_cached_per_player(self):
+        self.client.get(self.batch_url(self.qb1.id))
+        with self.assertNumQueries(0):
+            self.client.get(self.batch_url(self.qb1.id))
+        # Only the uncached player is computed, against cached defense rankings
+        with self.assertNumQueries(5):
+            self.client.get(self.batch_url(self.qb1.id, self.wr2.id))
+
+    def test_requires_player_ids(self):
+        response = self.client.get("/api/analytics/player-comparison-batch/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        too_many = [str(i) for i in range(MAX_COMPARISON_PLAYERS + 1)]
+        response = self.client.get(self.batch_url(*too_many))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DefenseRankingsTests(BaseTestCase):
+    """League-wide defense vs. position rankings"""
+
+    url = "/api/analytics/defense-rankings/"
+
+    def test_rankings(self):
+        # Window queries, team names, one grouped stats query
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        qb = response.data["positions"]["QB"]
+        self.assertEqual([line["team"] for line in qb], ["KC", "SF"])
+        self.assertEqual((qb[0]["rank"], qb[0]["percentile"]), (1, 100.0))
+        self.assertEqual(qb[1]["fantasy_pts_allowed"], 26.8)
+        self.assertEqual(qb[1]["yards_allowed"], 345)
+        self.assertEqual((qb[1]["rank"], qb[1]["percentile"]), (2, 0.0))
+        # KC's defense faced Samuel
+        wr = {line["team"]: line for line in response.data["positions"]["WR"]}
+        self.assertEqual(wr["KC"]["fantasy_pts_allowed"], 17.3)
+
+    def test_stats_without_a_team_are_not_charged_to_a_defense(self):
+        free_agent = Player.objects.create(
+            id="00-0099999", name="Free Agent", position="QB", season=2025
+        )
+        FootballPlayerGameStat.objects.create(
+            player=free_agent,
+            game=self.past_game,
+            team=None,
+            position="QB",
+            pass_yards=300,
+            fantasy_points_ppr=30.0,
+        )
+        response = self.client.get(f"{self.url}?position=QB")
+        qb = {line["team"]: line for line in response.data["positions"]["QB"]}
+        self.assertEqual(qb["KC"]["fantasy_pts_allowed"], 0)
+        self.assertEqual(qb["SF"]["fantasy_pts_allowed"], 26.8)
+
+    def test_position_filter(self):
+        response = self.client.get(f"{self.url}?position=TE")
+        self.assertEqual(list(response.data["positions"]), ["TE"])
+
+        response = self.client.get(f"{self.url}?position=K")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_simulation_ignores_later_games(self):
+        response = self.client.get(f"{self.url}?simulate_season=2025&simulate_week=1")
+        self.assertEqual(response.data["positions"]["QB"], [])
+
+
+class StatsCubeTests(BaseTestCase):
+    """Cube-backed analytics return exactly what the ORM path returns"""
+
+    def setUp(self):
+        super().setUp()
+        reset_stats_cube()
+
+    def both_paths(self, url):
+        orm = self.client.get(url)
+        cache.clear()
+        with override_settings(STATS_CUBE_ENABLED=True):
+            cube = self.client.get(url)
+        cache.clear()
+        return orm, cube
+
+    def test_matches_orm(self):
+        urls = [
+            f"/api/analytics/player-trend/?player_id={self.te1.id}",
+            f"/api/analytics/player-trend/?player_id={self.wr1.id}&games=1",
+        ]
+        for team in (self.team1, self.team2, self.team3):
+            urls += [
+                f"/api/analytics/recent-stats/?team_id={team.id}",
+                f"/api/analytics/player-stats/?team_id={team.id}",
+                f"/api/analytics/usage-metrics/?team_id={team.id}&games=2",
+            ]
+            urls += [
+                f"/api/analytics/defense-allowed/?team_id={team.id}&position={pos}"
+                for pos in ("QB", "RB", "WR", "TE")
+            ]
+        for url in urls:
+            with self.subTest(url=url):
+                orm, cube = self.both_paths(url)
+                self.assertEqual(cube.status_code, status.HTTP_200_OK)
+                self.assertEqual(cube.data, orm.data)
+
+    def test_reloads_when_stats_change(self):
+        with override_settings(STATS_CUBE_ENABLED=True):
+            cube = get_stats_cube()
+            self.assertIs(get_stats_cube(), cube)
+            invalidate_tags(ALL_STATS_TAG)
+            self.assertIsNot(get_stats_cube(), cube)
+        self.assertIsNone(get_stats_cube())
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command("benchmark_stats_cube", repeat=1, stdout=out)
+        self.assertIn("Cube responses match the ORM", out.getvalue())
+
+
+class PlayerRollingStatTests(BaseTestCase):
+    """Per-window player aggregates behind best-team and player search"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        last_season = Game.objects.create(
+            id="2024_18_KC_SF",
+            season=2024,
+            week=18,
+            date=cls.past_game.date - timedelta(days=240),
+            home_team=cls.team2,
+            away_team=cls.team1,
+            home_score=20,
+            away_score=17,
+        )
+        FootballPlayerGameStat.objects.create(
+            player=cls.te1,
+            game=last_season,
+            team=cls.team1,
+            position="TE",
+            targets=6,
+            fantasy_points_ppr=12.5,
+        )
+        refresh_rolling_stats()
+
+    def rolling(self, player, window):
+        return PlayerRollingStat.objects.get(player=player, window=window)
+
+    def test_windows(self):
+        self.assertEqual(self.rolling(self.te1, 1).avg_fantasy_points, 20.5)
+        last_3 = self.rolling(self.te1, 3)
+        self.assertEqual(last_3.games_played, 2)
+        self.assertEqual(last_3.avg_fantasy_points, 16.5)
+        self.assertEqual(last_3.avg_targets, 8.0)
+        # Season to date stops at last season's game
+        season = self.rolling(self.te1, SEASON_TO_DATE)
+        self.assertEqual((season.season, season.games_played), (2025, 1))
+
+    def test_incremental_refresh(self):
+        game = Game.objects.create(
+            id="2025_00_SF_PHI",
+            season=2025,
+            week=0,
+            date=self.past_game.date - timedelta(days=7),
+            home_team=self.team3,
+            away_team=self.team2,
+            home_score=14,
+            away_score=10,
+        )
+        FootballPlayerGameStat.objects.create(
+            player=self.wr1,
+            game=game,
+            team=self.team2,
+            position="WR",
+            fantasy_points_ppr=22.0,
+        )
+        te1_rows = set(
+            PlayerRollingStat.objects.filter(player=self.te1).values_list("id")
+        )
+
+        # Five windows for the one player
+        self.assertEqual(refresh_rolling_stats([self.wr1.id]), 5)
+        self.assertEqual(self.rolling(self.wr1, 3).games_played, 2)
+        self.assertEqual(
+            set(PlayerRollingStat.objects.filter(player=self.te1).values_list("id")),
+            te1_rows,
+        )
+
+    def test_best_team_respects_window(self):
+        response = self.client.get("/api/analytics/best-team/?games=1")
+        self.assertEqual(response.data["roster"]["TE"][0]["avg_fpts"], 20.5)
+        response = self.client.get("/api/analytics/best-team/?games=3")
+        self.assertEqual(response.data["roster"]["TE"][0]["avg_fpts"], 16.5)
+
+        # One top-N read per position
+        cache.clear()
+        with self.assertNumQueries(4):
+            self.client.get("/api/analytics/best-team/?games=season")
+
+        response = self.client.get("/api/analytics/best-team/?games=4")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_sorted_by_window(self):
+        response = self.client.get("/api/players/search/?games=1")
+        self.assertEqual(
+            [p["name"] for p in response.data["players"]],
+            ["Patrick Mahomes", "Travis Kelce", "Isiah Pacheco", "Deebo Samuel"],
+        )
+        response = self.client.get("/api/players/search/?search=Kelce&games=3")
+        self.assertEqual(response.data["players"][0]["stats"]["games_played"], 2)
+        self.assertEqual(
+            response.data["players"][0]["stats"]["avg_fantasy_points"], 16.5
+        )
+
+        response = self.client.get("/api/players/search/?games=all")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ScoringFormatTests(BaseTestCase):
+    """PPR / Half PPR / Standard columns and custom draft scoring"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        refresh_rolling_stats()
+
+    def test_format_columns_derived_on_save(self):
+        self.te1_stats.refresh_from_db()
+        self.assertEqual(self.te1_stats.fantasy_points_half, 16.5)
+        self.assertEqual(self.te1_stats.fantasy_points_std, 12.5)
+
+    def test_best_team_and_search_by_format(self):
+        response = self.client.get("/api/analytics/best-team/?games=1&scoring=half")
+        self.assertEqual(response.data["roster"]["TE"][0]["avg_fpts"], 16.5)
+        response = self.client.get("/api/analytics/best-team/?games=1&scoring=STD")
+        self.assertEqual(response.data["roster"]["TE"][0]["avg_fpts"], 12.5)
+
+        response = self.client.get("/api/players/search/?games=1&scoring=STD")
+        self.assertEqual(
+            [p["name"] for p in response.data["players"]],
+            ["Patrick Mahomes", "Isiah Pacheco", "Travis Kelce", "Deebo Samuel"],
+        )
+
+        for url in ("/api/analytics/best-team/", "/api/players/search/"):
+            response = self.client.get(f"{url}?scoring=TEN")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_custom_draft_scoring(self):
+        # 5 points per reception puts the pass catchers first
+        response = self.client.post(
+            "/api/draft/create/",
+            {
+                "num_teams": 2,
+                "num_rounds": 1,
+                "scoring_format": "CUSTOM",
+                "scoring_rules": {"reception": 5, "bonuses": [["receptions", 8, 3]]},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        session_id = response.data["session_id"]
+
+        players = self.client.get(f"/api/draft/{session_id}/available/").data["players"]
+        self.assertEqual(players[0]["name"], "Travis Kelce")
+        # 85 yds * 0.1 + 1 TD * 6 + 8 rec * 5 + 3 bonus
+        self.assertEqual(players[0]["avg_fpts"], 57.5)
+
+    def test_invalid_draft_scoring(self):
+        for payload in (
+            {"scoring_format": "TEN"},
+            {"scoring_format": "CUSTOM", "scoring_rules": {"sacks": 1}},
+            {"scoring_format": "CUSTOM", "scoring_rules": {"reception": "lots"}},
+            {"scoring_format": "CUSTOM", "scoring_rules": {"bonuses": [["x", 1, 1]]}},
+        ):
+            response = self.client.post("/api/draft/create/", payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CacheGenerationTests(BaseTestCase):
+    """Generation-counter cache keys invalidate exactly what they tag"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidating_a_team_only_changes_its_keys(self):
+        team1_key = versioned_key("recent_stats_1_3", [team_tag(1)])
+        team2_key = versioned_key("recent_stats_2_3", [team_tag(2)])
+
+        invalidate_team_cache(1)
+
+        self.assertNotEqual(versioned_key("recent_stats_1_3", [team_tag(1)]), team1_key)
+        self.assertEqual(versioned_key("recent_stats_2_3", [team_tag(2)]), team2_key)
+
+    def test_global_invalidation_changes_every_key(self):
+        keys = [
+            versioned_key("a", [team_tag(1)]),
+            versioned_key("b", [player_tag("00-1")]),
+            versioned_key("c", [season_tag(2025)]),
+        ]
+        invalidate_all_caches()
+        self.assertNotEqual(
+            [
+                versioned_key("a", [team_tag(1)]),
+                versioned_key("b", [player_tag("00-1")]),
+                versioned_key("c", [season_tag(2025)]),
+            ],
+            keys,
+        )
+
+    def test_invalidating_unknown_tag_is_safe(self):
+        invalidate_tags(team_tag(999))
+        self.assertTrue(versioned_key("x", [team_tag(999)]))
+
+    def test_endpoint_recomputes_after_team_invalidation(self):
+        url = f"/api/analytics/team-game-log/?team_id={self.team1.id}"
+        self.assertEqual(len(self.client.get(url).data["games"]), 1)
+
+        Game.objects.filter(id=self.past_game.id).update(home_score=None)
+        TeamGameLog.objects.filter(game=self.past_game).update(result=None)
+        self.assertEqual(len(self.client.get(url).data["games"]), 1)  # cached
+
+        invalidate_team_cache(self.team1.id)
+        self.assertEqual(len(self.client.get(url).data["games"]), 0)
+
+
+class CachedResponseTests(BaseTestCase):
+    """@cached_response: hits, misses, stale serving and early refresh"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = f"/api/analytics/team-game-log/?team_id={self.team1.id}"
+        self.key = versioned_key(
+            f"team_game_log_{self.team1.id}_5", [team_tag(self.team1.id)]
+        )
+
+    def expire_entry(self):
+        entry = cache.get(self.key)
+        entry["expires_at"] = 0
+        cache.set(self.key, entry)
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        metrics = cache_metrics("team_game_log")
+        self.assertEqual(metrics["miss"], 1)
+        self.assertEqual(metrics["hit"], 1)
+
+    def test_errors_are_not_cached(self):
+        url = f"/api/analytics/defense-allowed/?team_id={self.team1.id}&position=K"
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(cache_metrics("defense_allowed")["miss"], 2)
+        self.assertEqual(cache_metrics("defense_allowed")["hit"], 0)
+
+        # Missing params: the action runs uncached and reports the error
+        self.client.get("/api/analytics/team-game-log/")
+        self.assertEqual(cache_metrics("team_game_log")["miss"], 0)
+
+    def test_expired_entry_is_refreshed(self):
+        self.client.get(self.url)
+        TeamGameLog.objects.filter(game=self.past_game).update(result=None)
+        self.expire_entry()
+
+        self.assertEqual(len(self.client.get(self.url).data["games"]), 0)
+        self.assertEqual(cache_metrics("team_game_log")["refresh"], 1)
+
+    def test_expired_entry_is_served_stale_while_another_worker_refreshes(self):
+        self.client.get(self.url)
+        TeamGameLog.objects.filter(game=self.past_game).update(result=None)
+        self.expire_entry()
+
+        lock = _KeyLock(self.key)
+        self.assertTrue(lock.acquire())
+        try:
+            with self.assertNumQueries(0):
+                response = self.client.get(self.url)
+        finally:
+            lock.release()
+
+        self.assertEqual(len(response.data["games"]), 1)
+        self.assertEqual(cache_metrics("team_game_log")["stale"], 1)
+
+    def test_probabilistic_early_refresh(self):
+        self.client.get(self.url)
+        entry = cache.get(self.key)
+        entry["delta"] = 1.0
+        entry["expires_at"] = time.time() + 5
+        cache.set(self.key, entry)
+
+        # ln(1 - 0.0) = 0: never early; ln(1 - 0.999999) ~ -13.8: 13.8s early
+        with mock.patch("api.cache_utils.random.random", return_value=0.0):
+            self.client.get(self.url)
+        self.assertEqual(cache_metrics("team_game_log")["refresh"], 0)
+
+        with mock.patch("api.cache_utils.random.random", return_value=0.999999):
+            self.client.get(self.url)
+        self.assertEqual(cache_metrics("team_game_log")["refresh"], 1)
+
+
+class CacheWarmupTests(BaseTestCase):
+    """Warm-up fills the same keys user requests read"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warmed_endpoints_are_cache_hits(self):
+        timings = warm_team_endpoints([self.team1.id])
+
+        self.assertEqual(timings["defense_allowed"]["requests"], 4)
+        self.assertEqual(timings["team_game_log"]["requests"], 1)
+        # The URLs the game page requests (frontend/src/api/analytics.js)
+        team = f"team_id={self.team1.id}"
+        urls = [
+            f"/api/analytics/recent-stats/?games=3&{team}",
+            f"/api/analytics/defense-allowed/?games=3&{team}&position=WR",
+            f"/api/analytics/player-stats/?games=3&{team}",
+            f"/api/analytics/usage-metrics/?games=3&{team}",
+            f"/api/analytics/team-game-log/?{team}&games=3",
+        ]
+        with self.assertNumQueries(0):
+            for url in urls:
+                self.client.get(url)
+        self.assertEqual(cache_metrics("recent_stats")["hit"], 1)
+        self.assertEqual(cache_metrics("team_game_log")["hit"], 1)
+
+    def test_merge_timings(self):
+        merged = merge_timings(
+            [
+                {"recent_stats": {"requests": 8, "seconds": 1.0}},
+                {"recent_stats": {"requests": 8, "seconds": 0.5}},
+                {"predict_week": {"requests": 1, "seconds": 2.0}},
+            ]
+        )
+        self.assertEqual(merged["recent_stats"], {"requests": 16, "seconds": 1.5})
+        self.assertEqual(merged["predict_week"]["requests"], 1)
+
+
+class StatConstraintTests(BaseTestCase):
+    """One stat row per (player, game) and (team, game)"""
+
+    def test_duplicate_player_stat_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FootballPlayerGameStat.objects.create(
+                player=self.qb1, game=self.past_game, team=self.team1, position="QB"
+            )
+
+    def test_duplicate_team_stat_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FootballTeamGameStat.objects.create(team=self.team1, game=self.past_game)
+
+    def test_explain_queries_command(self):
+        out = io.StringIO()
+        call_command("explain_queries", repeat=1, stdout=out)
+        self.assertIn("team recent games", out.getvalue())
+
+
 class DraftModelTests(TestCase):
     """Tests for Draft model methods"""
 
@@ -765,7 +2019,12 @@ class ModelTests(TestCase):
             away_team=self.team,
         )
         stat = FootballPlayerGameStat.objects.create(
-            player=self.player, game=game, targets=10, air_yards=120
+            player=self.player,
+            game=game,
+            team=self.team,
+            position="WR",
+            targets=10,
+            air_yards=120,
         )
         self.assertEqual(stat.adot, 12.0)
 
@@ -780,6 +2039,497 @@ class ModelTests(TestCase):
             away_team=self.team,
         )
         stat = FootballPlayerGameStat.objects.create(
-            player=self.player, game=game, targets=0, air_yards=0
+            player=self.player,
+            game=game,
+            team=self.team,
+            position="WR",
+            targets=0,
+            air_yards=0,
         )
         self.assertEqual(stat.adot, 0.0)
+
+
+class FeatureLeagueTestCase(TestCase):
+    """Synthetic 4-team league spanning two seasons, for feature tests"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(7)
+        teams = [
+            Team.objects.create(id=100 + i, name=f"Team {i}", abbreviation=f"T{i}")
+            for i in range(4)
+        ]
+        rotation = [[(0, 1), (2, 3)], [(0, 2), (1, 3)], [(0, 3), (1, 2)]]
+
+        for season, num_weeks, start in (
+            (2023, 6, date(2023, 9, 7)),
+            (2024, 8, date(2024, 9, 5)),
+        ):
+            for week in range(1, num_weeks + 1):
+                for slot, (home, away) in enumerate(rotation[week % 3]):
+                    game_date = start + timedelta(days=7 * (week - 1) + slot)
+                    home_score = rng.randint(10, 35)
+                    away_score = rng.randint(10, 35)
+                    if season == 2024 and week == 3 and slot == 0:
+                        away_score = home_score  # a tie
+                    game = Game.objects.create(
+                        id=f"{season}_{week:02d}_T{away}_T{home}",
+                        season=season,
+                        week=week,
+                        date=game_date,
+                        home_team=teams[home],
+                        away_team=teams[away],
+                        home_score=home_score,
+                        away_score=away_score,
+                        roof="dome" if slot else "outdoors",
+                        temp=None if week == 2 else rng.randint(30, 80),
+                        wind=rng.randint(0, 15),
+                    )
+                    for team in (teams[home], teams[away]):
+                        if season == 2024 and week == 5 and team == teams[home]:
+                            continue  # a missing stat row
+                        FootballTeamGameStat.objects.create(
+                            team=team,
+                            game=game,
+                            pass_attempts=rng.randint(20, 45),
+                            pass_completions=rng.randint(10, 20),
+                            pass_yards=rng.randint(150, 350),
+                            pass_touchdowns=rng.randint(0, 4),
+                            rush_attempts=rng.randint(15, 35),
+                            rush_yards=rng.randint(50, 180),
+                            rush_touchdowns=rng.randint(0, 3),
+                            interceptions=rng.randint(0, 2),
+                            fumbles_lost=rng.randint(0, 2),
+                            def_sacks=rng.randint(0, 5),
+                            def_interceptions=rng.randint(0, 2),
+                            def_fumbles_forced=rng.randint(0, 2),
+                        )
+
+        # An upcoming game (no score yet) can still be featurized
+        Game.objects.create(
+            id="2024_09_T1_T0",
+            season=2024,
+            week=9,
+            date=date(2024, 11, 7),
+            home_team=teams[0],
+            away_team=teams[1],
+            home_score=None,
+            away_score=None,
+        )
+
+
+class BulkFeatureBuilderTests(FeatureLeagueTestCase):
+    """Parity tests: bulk feature matrix vs. per-game FeatureExtractor"""
+
+    def test_matches_per_game_extractor(self):
+        """Every row matches build_game_features, including insufficient-data rows"""
+        games = list(Game.objects.order_by("date", "id"))
+
+        for num_games in (3, 5):
+            with self.subTest(num_games=num_games):
+                X, valid = BulkFeatureBuilder(num_games=num_games).build(games)
+                extractor = FeatureExtractor(num_games=num_games)
+                self.assertEqual(
+                    X.shape, (len(games), len(FeatureExtractor.get_feature_names()))
+                )
+
+                for row, game in enumerate(games):
+                    try:
+                        expected = extractor.build_game_features(game)
+                    except InsufficientDataError:
+                        self.assertFalse(valid[row], game.id)
+                        continue
+                    self.assertTrue(valid[row], game.id)
+                    np.testing.assert_allclose(
+                        X[row], expected, rtol=1e-5, err_msg=game.id
+                    )
+
+    def test_bulk_build_uses_constant_queries(self):
+        """Bulk mode loads games and team stats once, regardless of game count"""
+        games = list(Game.objects.order_by("date"))
+        with self.assertNumQueries(2):
+            BulkFeatureBuilder(num_games=5).build(games)
+
+    def test_training_builder_bulk_matches_per_game(self):
+        """TrainingDataBuilder returns identical datasets in both modes"""
+        builder = TrainingDataBuilder(seasons=[2023, 2024], num_games_for_features=5)
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            bulk = builder.build(bulk=True)
+            per_game = builder.build(bulk=False)
+
+        self.assertGreater(len(bulk[0]), 0)
+        for bulk_array, per_game_array in zip(bulk, per_game):
+            np.testing.assert_allclose(bulk_array, per_game_array, rtol=1e-5)
+
+
+class TeamFeatureStoreTests(FeatureLeagueTestCase):
+    """Serving features from snapshots vs. per-game FeatureExtractor"""
+
+    def assert_matches_extractor(self, store, game):
+        extractor = FeatureExtractor(num_games=store.num_games)
+        try:
+            expected = extractor.build_game_features(game)
+        except InsufficientDataError:
+            with self.assertRaises(InsufficientDataError):
+                store.build_game_features(game)
+            return
+        np.testing.assert_allclose(
+            store.build_game_features(game), expected, rtol=1e-5, err_msg=game.id
+        )
+
+    def test_refresh_creates_one_snapshot_per_team_game(self):
+        count = refresh_snapshots()
+        self.assertEqual(
+            count, 2 * Game.objects.filter(home_score__isnull=False).count()
+        )
+        self.assertEqual(TeamFeatureSnapshot.objects.count(), count)
+
+        # Refreshing again replaces rather than duplicates
+        refresh_snapshots(team_ids=[100], since=date(2024, 10, 1))
+        self.assertEqual(TeamFeatureSnapshot.objects.count(), count)
+
+    def test_snapshots_match_per_game_extractor(self):
+        refresh_snapshots(num_games=3)
+        refresh_snapshots(num_games=5)
+        for num_games in (3, 5):
+            store = TeamFeatureStore(num_games=num_games)
+            for game in Game.objects.order_by("date", "id"):
+                with self.subTest(num_games=num_games, game=game.id):
+                    self.assert_matches_extractor(store, game)
+
+    def test_fresh_snapshot_is_one_query_per_team(self):
+        refresh_snapshots()
+        game = Game.objects.get(id="2024_09_T1_T0")
+        with self.assertNumQueries(2):
+            TeamFeatureStore(num_games=5).build_game_features(game)
+
+    def test_stale_snapshot_falls_back_to_extractor(self):
+        refresh_snapshots()
+        upcoming = Game.objects.get(id="2024_09_T1_T0")
+        store = TeamFeatureStore(num_games=5)
+        self.assertIsNotNone(store.get_snapshot(100, upcoming.date))
+
+        # A result lands without a refresh: snapshot no longer reflects form
+        Game.objects.create(
+            id="2024_09_T2_T0_extra",
+            season=2024,
+            week=9,
+            date=upcoming.date - timedelta(days=2),
+            home_team_id=100,
+            away_team_id=102,
+            home_score=3,
+            away_score=40,
+        )
+        self.assertIsNone(store.get_snapshot(100, upcoming.date))
+        self.assert_matches_extractor(store, upcoming)
+
+    def test_missing_snapshots_fall_back_to_extractor(self):
+        store = TeamFeatureStore(num_games=5)
+        self.assert_matches_extractor(store, Game.objects.get(id="2024_09_T1_T0"))
+
+    def test_many_games_match_per_game_extractor(self):
+        refresh_snapshots()
+        store = TeamFeatureStore(num_games=5)
+        extractor = FeatureExtractor(num_games=5)
+        # Early games are older than the snapshots read, so both the snapshot
+        # and the bulk fallback paths are covered
+        games = list(Game.objects.order_by("date", "id"))
+        for game, features in zip(games, store.build_many_game_features(games)):
+            with self.subTest(game=game.id):
+                try:
+                    expected = extractor.build_game_features(game)
+                except InsufficientDataError:
+                    self.assertIsInstance(features, InsufficientDataError)
+                    continue
+                np.testing.assert_allclose(features, expected, rtol=1e-5)
+
+    def test_many_games_query_count(self):
+        week = list(Game.objects.filter(season=2024, week=8))
+        store = TeamFeatureStore(num_games=5)
+        # No snapshots: the snapshot query, then one bulk load (games, stats)
+        with self.assertNumQueries(3):
+            store.build_many_game_features(week)
+        refresh_snapshots()
+        with self.assertNumQueries(1):
+            store.build_many_game_features(week)
+
+
+class PredictWeekTests(FeatureLeagueTestCase):
+    """predict_week runs the models once for the whole week"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Game.objects.create(
+            id="2024_09_T3_T2",
+            season=2024,
+            week=9,
+            date=date(2024, 11, 10),
+            home_team_id=102,
+            away_team_id=103,
+            home_score=None,
+            away_score=None,
+        )
+        refresh_snapshots()
+        PredictionModelVersion.objects.create(version="test", is_active=True)
+
+        builder = TrainingDataBuilder(seasons=[2023, 2024], num_games_for_features=5)
+        cls.model = GamePredictionModel()
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            X, y_winner, y_spread, y_total = builder.build()
+            cls.model.train(X, y_winner, y_spread, y_total)
+
+    def setUp(self):
+        cache.clear()
+        self.service = PredictionService()
+        self.service._model = self.model
+        self.service._model_version = "test"
+
+    def test_week_predictions_use_one_model_call(self):
+        with mock.patch.object(
+            self.model, "predict", wraps=self.model.predict
+        ) as predict:
+            predictions = self.service.predict_week(2024, 9)
+
+        predict.assert_called_once()
+        self.assertEqual(
+            [p["game_id"] for p in predictions], ["2024_09_T1_T0", "2024_09_T3_T2"]
+        )
+        store = TeamFeatureStore(num_games=5)
+        for prediction in predictions:
+            game = Game.objects.get(id=prediction["game_id"])
+            expected = self.model.predict(store.build_game_features(game))
+            self.assertEqual(
+                prediction["prediction"]["predicted_winner"],
+                expected["predicted_winner"],
+            )
+            for key in ("home_win_probability", "predicted_spread", "predicted_total"):
+                self.assertAlmostEqual(
+                    prediction["prediction"][key], expected[key], places=3
+                )
+
+    def test_week_predictions_fill_per_game_cache(self):
+        predictions = self.service.predict_week(2024, 9)
+        with mock.patch.object(self.model, "predict") as predict:
+            single = self.service.predict_game("2024_09_T3_T2")
+        predict.assert_not_called()
+        self.assertEqual(single, predictions[1])
+
+    def test_unpredictable_games_get_error_entries(self):
+        predictions = self.service.predict_week(2023, 1, simulate=True)
+        self.assertTrue(predictions)
+        for prediction in predictions:
+            self.assertIn("Cannot make prediction", prediction["error"])
+
+
+class StatIngestTests(TestCase):
+    """Bulk seed_stats path: Polars reshaping + bulk upserts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kc = Team.objects.create(id=2310, name="Chiefs", abbreviation="KC")
+        cls.sf = Team.objects.create(id=4500, name="49ers", abbreviation="SF")
+        cls.qb = Player.objects.create(id="00-1", name="QB One", position="QB")
+        cls.wr = Player.objects.create(id="00-2", name="WR Two", position="WR")
+        cls.game = Game.objects.create(
+            id="2025_01_SF_KC",
+            season=2025,
+            week=1,
+            date=date(2025, 9, 7),
+            home_team=cls.kc,
+            away_team=cls.sf,
+            home_score=27,
+            away_score=20,
+        )
+
+    def player_frame(self, qb_yards=250):
+        return pl.DataFrame(
+            {
+                "player_id": ["00-1", "00-2", "00-9", "00-1", "00-3"],
+                "position": ["QB", "WR", "RB", "QB", "K"],
+                "season": [2025, 2025, 2025, 2025, 2025],
+                "week": [1, 1, 1, 2, 1],
+                "team": ["KC", "SF", "KC", "KC", "KC"],
+                "opponent_team": ["SF", "KC", "SF", "DEN", "SF"],
+                "completions": [20, 0, 0, 18, 0],
+                "attempts": [30, 0, 0, 25, 0],
+                "passing_yards": [qb_yards, 0, 0, 200, 0],
+                "receiving_yards": [0, 95, 0, 0, 0],
+                "targets": [0, 8, 0, 0, 0],
+                "receiving_air_yards": [None, 80.0, None, None, None],
+                "sack_fumbles": [1, 0, 0, 0, 0],
+                "rushing_fumbles": [2, 0, 0, 0, 0],
+                "sack_fumbles_lost": [1, 0, 0, 0, 0],
+                "rushing_fumbles_lost": [1, 0, 0, 0, 0],
+                "receiving_2pt_conversions": [0, 1, 0, 0, 0],
+                "fantasy_points_ppr": [18.5, 15.5, 3.0, 12.0, 8.0],
+            }
+        )
+
+    def team_frame(self, kc_yards=250):
+        return pl.DataFrame(
+            {
+                "team": ["KC", "SF", "XXX"],
+                "opponent_team": ["SF", "KC", "KC"],
+                "season": [2025, 2025, 2025],
+                "week": [1, 1, 1],
+                "passing_yards": [kc_yards, 180, 0],
+                "rushing_yards": [120, 90, 0],
+                "sack_fumbles": [1, 0, 0],
+                "rushing_fumbles": [1, 1, 0],
+                "receiving_fumbles": [0, 0, 0],
+            }
+        )
+
+    def snap_frame(self):
+        return pl.DataFrame(
+            {
+                "player_id": ["00-1", "00-2"],
+                "season": [2025, 2025],
+                "week": [1, 2],
+                "offense_snaps": [65, 40],
+                "offense_pct": [1.0, 0.6],
+            }
+        )
+
+    def test_seed_stats_frames(self):
+        result = seed_stats_frames(
+            self.player_frame(), self.team_frame(), self.snap_frame()
+        )
+
+        self.assertEqual(result.player_rows, 2)
+        self.assertEqual(result.player_skipped, 2)  # unknown player, no game
+        self.assertEqual(result.team_rows, 2)
+        self.assertEqual(result.team_skipped, 1)
+        self.assertEqual(result.changed_games, {self.game.id})
+        self.assertEqual(result.changed_teams, {self.kc.id, self.sf.id})
+        self.assertEqual(result.changed_players, {self.qb.id, self.wr.id})
+        self.assertEqual(result.feature_since, self.game.date)
+
+        qb = FootballPlayerGameStat.objects.get(player=self.qb, game=self.game)
+        self.assertEqual((qb.pass_yards, qb.pass_completions), (250, 20))
+        self.assertEqual((qb.snap_count, qb.snap_pct), (65, 1.0))
+        wr = FootballPlayerGameStat.objects.get(player=self.wr, game=self.game)
+        self.assertEqual((wr.receiving_yards, wr.air_yards), (95, 80.0))
+        self.assertEqual(wr.snap_count, 0)  # snap row is for another week
+        # Fumbles, fumbles lost and two-point conversions; custom scoring
+        # charges only the fumbles lost
+        self.assertEqual((qb.fumbles, qb.fumbles_lost, wr.two_pt), (3, 2, 1))
+        points = (
+            FootballPlayerGameStat.objects.filter(pk=qb.pk)
+            .annotate(points=ScoringRules(pass_yard=0, pass_td=0).expression())
+            .values_list("points", flat=True)
+            .get()
+        )
+        self.assertEqual(points, -4.0)
+        # Team and position as of the game, not the players' current ones
+        self.assertEqual((qb.team_id, qb.position), (self.kc.id, "QB"))
+        self.assertEqual((wr.team_id, wr.position), (self.sf.id, "WR"))
+
+        kc = FootballTeamGameStat.objects.get(team=self.kc, game=self.game)
+        self.assertEqual((kc.pass_yards, kc.fumbles), (250, 2))
+
+    def test_reseeding_updates_in_place(self):
+        seed_stats_frames(self.player_frame(), self.team_frame())
+        seed_stats_frames(self.player_frame(qb_yards=300), self.team_frame())
+
+        self.assertEqual(FootballPlayerGameStat.objects.count(), 2)
+        self.assertEqual(FootballTeamGameStat.objects.count(), 2)
+        qb = FootballPlayerGameStat.objects.get(player=self.qb, game=self.game)
+        self.assertEqual(qb.pass_yards, 300)
+
+    def test_unchanged_rows_are_skipped(self):
+        seed_stats_frames(self.player_frame(), self.team_frame())
+        result = seed_stats_frames(self.player_frame(qb_yards=300), self.team_frame())
+
+        self.assertEqual((result.player_rows, result.player_unchanged), (1, 1))
+        self.assertEqual((result.team_rows, result.team_unchanged), (0, 2))
+        self.assertEqual(result.changed_players, {self.qb.id})
+        self.assertEqual(result.changed_games, {self.game.id})
+        self.assertEqual(result.feature_teams, set())
+
+        result = seed_stats_frames(self.player_frame(qb_yards=300), self.team_frame())
+        self.assertEqual(result.player_rows + result.team_rows, 0)
+        self.assertEqual(result.changed_games, set())
+
+    def test_team_line_change_refreshes_opponent_features(self):
+        seed_stats_frames(self.player_frame(), self.team_frame())
+        refresh_snapshots()
+
+        # Only KC's line changes, but it is what SF's defense allowed
+        result = seed_stats_frames(self.player_frame(), self.team_frame(kc_yards=300))
+        self.assertEqual(result.feature_teams, {self.kc.id, self.sf.id})
+        self.assertEqual(result.feature_since, self.game.date)
+
+        refresh_snapshots(team_ids=result.feature_teams, since=result.feature_since)
+        sf = TeamFeatureSnapshot.objects.get(team=self.sf)
+        self.assertEqual(sf.features["def_pass_yards_allowed"], 300)
+
+    def test_scoped_sync(self):
+        result = seed_stats_frames(self.player_frame(), self.team_frame(), week=2)
+        self.assertEqual(result.player_rows + result.team_rows, 0)
+
+        result = seed_stats_frames(
+            self.player_frame(), self.team_frame(), game_ids=["2025_02_KC_DEN"]
+        )
+        self.assertEqual(result.player_rows + result.team_rows, 0)
+
+        result = seed_stats_frames(
+            self.player_frame(), self.team_frame(), week=1, game_ids=[self.game.id]
+        )
+        self.assertEqual(result.player_rows, 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # 3 preloads + (stored hashes + one upsert) per table
+        with self.assertNumQueries(7):
+            seed_stats_frames(self.player_frame(), self.team_frame())
+
+
+class SeedGamesTests(TestCase):
+    """seed_games syncs logs and standings once per season, not per row"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kc = Team.objects.create(id=2310, name="Chiefs", abbreviation="KC")
+        cls.sf = Team.objects.create(id=4500, name="49ers", abbreviation="SF")
+
+    def schedule(self):
+        rows = [
+            ("2025_01_SF_KC", 1, "2025-09-07", "SF", "KC", 20, 27),
+            ("2025_02_KC_SF", 2, "2025-09-14", "KC", "SF", 24, 17),
+            ("2025_03_SF_KC", 3, "2025-09-21", "SF", "KC", None, None),
+        ]
+        return pl.DataFrame(
+            [
+                {
+                    "game_id": game_id,
+                    "season": 2025,
+                    "game_type": "REG",
+                    "week": week,
+                    "gameday": gameday,
+                    "gametime": "13:00",
+                    "away_team": away,
+                    "home_team": home,
+                    "away_score": away_score,
+                    "home_score": home_score,
+                    "location": "Home",
+                    "total": None,
+                    "overtime": 0,
+                    "roof": "outdoors",
+                    "temp": None,
+                    "wind": None,
+                }
+                for game_id, week, gameday, away, home, away_score, home_score in rows
+            ]
+        )
+
+    def test_seed_games(self):
+        with mock.patch(
+            "nflreadpy.load_schedules", return_value=self.schedule()
+        ), mock.patch("games.signals.sync_team_game_logs") as per_row:
+            call_command("seed_games", stdout=io.StringIO())
+
+        per_row.assert_not_called()
+        self.assertEqual(TeamGameLog.objects.count(), 6)
+        self.assertEqual(season_records(2025)[self.kc.id], (2, 0, 0))
+        self.assertEqual(season_records(2025)[self.sf.id], (0, 2, 0))
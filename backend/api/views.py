@@ -1,5 +1,6 @@
-from django.core.cache import cache
-from django.db.models import Avg, Sum
+from urllib.parse import urlencode
+
+from django.db.models import F, FilteredRelation, Q
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -7,9 +8,11 @@ from rest_framework.response import Response
 
 from games.models import Game
 from players.models import Player
-from stats.models import FootballPlayerGameStat
+from stats.rolling import FORMAT_AVERAGES, parse_window
+from stats.scoring import parse_format
 from teams.models import Team
 
+from .cache_utils import ALL_STATS_TAG, cached_response, season_tag
 from .serializers import (
     GameSerializer,
     PlayerSerializer,
@@ -17,6 +20,17 @@ from .serializers import (
 )
 from .simulation import SimulationMixin
 
+# PlayerRollingStat columns returned by /players/search
+ROLLING_STAT_FIELDS = (
+    "games_played",
+    "avg_targets",
+    "avg_receptions",
+    "avg_receiving_yards",
+    "avg_rush_attempts",
+    "avg_rush_yards",
+    "avg_pass_yards",
+)
+
 
 class TeamViewSet(viewsets.ModelViewSet):
     queryset = Team.objects.all()
@@ -56,22 +70,38 @@ class PlayerViewSet(viewsets.ModelViewSet):
         return qs.order_by("name")
 
     @action(detail=False, methods=["get"], url_path="search")
+    @cached_response(
+        lambda p: (
+            f"player_search_{p.get('search', '')}_{p.get('position')}_{p.get('team')}"
+            f"_{parse_window(p.get('games', 3))}_{parse_format(p.get('scoring'))}"
+            f"_{int(p.get('limit', 50))}",
+            [ALL_STATS_TAG],
+        ),
+        ttl=60 * 5,
+    )
     def search_with_stats(self, request):
         """
         Search players with their recent fantasy stats
-        Query params: search, position, team, games (default=3), limit (default=50)
+        Query params: search, position, team, games (1/3/5/10/season, default=3),
+        scoring (PPR/HALF/STD, default=PPR), limit (default=50)
         """
         search = request.query_params.get("search", "")
         position = request.query_params.get("position")
         team = request.query_params.get("team")
-        num_games = int(request.query_params.get("games", 3))
         limit = int(request.query_params.get("limit", 50))
-
-        # Build cache key
-        cache_key = f"player_search_{search}_{position}_{team}_{num_games}_{limit}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+        try:
+            window = parse_window(request.query_params.get("games", 3))
+        except ValueError:
+            return Response(
+                {"Error": "'games' must be one of 1, 3, 5, 10 or 'season'"},
+                status=400,
+            )
+        try:
+            scoring = parse_format(request.query_params.get("scoring"))
+        except ValueError:
+            return Response(
+                {"Error": "'scoring' must be one of PPR, HALF or STD"}, status=400
+            )
 
         # Base queryset - only fantasy-relevant positions
         qs = Player.objects.filter(
@@ -85,33 +115,19 @@ class PlayerViewSet(viewsets.ModelViewSet):
         if team:
             qs = qs.filter(team__abbreviation=team)
 
-        # Get player IDs
-        player_ids = list(qs.values_list("id", flat=True)[: limit * 2])
-
-        # Get recent stats for these players
-        stats = (
-            FootballPlayerGameStat.objects.filter(player_id__in=player_ids)
-            .values("player_id")
-            .annotate(
-                avg_fantasy_points=Avg("fantasy_points_ppr"),
-                total_fantasy_points=Sum("fantasy_points_ppr"),
-                games_played=Sum(1),
-                avg_targets=Avg("targets"),
-                avg_receptions=Avg("receptions"),
-                avg_receiving_yards=Avg("receiving_yards"),
-                avg_rush_attempts=Avg("rush_attempts"),
-                avg_rush_yards=Avg("rush_yards"),
-                avg_pass_yards=Avg("pass_yards"),
-            )
-        )
-
-        # Create a lookup dict for stats
-        stats_lookup = {s["player_id"]: s for s in stats}
+        # Join each player's precomputed aggregate for the requested window and
+        # let the database sort and cut the list
+        qs = qs.annotate(
+            rolling=FilteredRelation(
+                "rolling_stats", condition=Q(rolling_stats__window=window)
+            ),
+            avg_fantasy_points=F(f"rolling__{FORMAT_AVERAGES[scoring]}"),
+            **{name: F(f"rolling__{name}") for name in ROLLING_STAT_FIELDS},
+        ).order_by(F("avg_fantasy_points").desc(nulls_last=True), "name")
 
         # Build response
         players_data = []
         for player in qs[:limit]:
-            player_stats = stats_lookup.get(player.id, {})
             players_data.append(
                 {
                     "id": player.id,
@@ -122,41 +138,27 @@ class PlayerViewSet(viewsets.ModelViewSet):
                     "image_url": player.image_url,
                     "status": player.status,
                     "stats": {
-                        "avg_fantasy_points": round(
-                            player_stats.get("avg_fantasy_points") or 0, 1
-                        ),
+                        "avg_fantasy_points": round(player.avg_fantasy_points or 0, 1),
                         "total_fantasy_points": round(
-                            player_stats.get("total_fantasy_points") or 0, 1
-                        ),
-                        "games_played": player_stats.get("games_played") or 0,
-                        "avg_targets": round(player_stats.get("avg_targets") or 0, 1),
-                        "avg_receptions": round(
-                            player_stats.get("avg_receptions") or 0, 1
+                            (player.avg_fantasy_points or 0)
+                            * (player.games_played or 0),
+                            1,
                         ),
+                        "games_played": player.games_played or 0,
+                        "avg_targets": round(player.avg_targets or 0, 1),
+                        "avg_receptions": round(player.avg_receptions or 0, 1),
                         "avg_receiving_yards": round(
-                            player_stats.get("avg_receiving_yards") or 0, 1
-                        ),
-                        "avg_rush_attempts": round(
-                            player_stats.get("avg_rush_attempts") or 0, 1
-                        ),
-                        "avg_rush_yards": round(
-                            player_stats.get("avg_rush_yards") or 0, 1
-                        ),
-                        "avg_pass_yards": round(
-                            player_stats.get("avg_pass_yards") or 0, 1
+                            player.avg_receiving_yards or 0, 1
                         ),
+                        "avg_rush_attempts": round(player.avg_rush_attempts or 0, 1),
+                        "avg_rush_yards": round(player.avg_rush_yards or 0, 1),
+                        "avg_pass_yards": round(player.avg_pass_yards or 0, 1),
                     },
                 }
             )
 
-        # Sort by average fantasy points descending
-        players_data.sort(key=lambda x: x["stats"]["avg_fantasy_points"], reverse=True)
-
         response_data = {"count": len(players_data), "players": players_data}
 
-        # Cache for 5 minutes
-        cache.set(cache_key, response_data, 300)
-
         return Response(response_data)
 
 
@@ -174,7 +176,7 @@ class GameViewSet(SimulationMixin, viewsets.ModelViewSet):
 
     # add filtering logic for 'week' and 'season' to query
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().select_related("home_team", "away_team")
 
         week = self.request.query_params.get("week")
         season = self.request.query_params.get("season")
@@ -192,20 +194,23 @@ class GameViewSet(SimulationMixin, viewsets.ModelViewSet):
         if not sim.is_active:
             return data
 
-        game_lookup = {
-            g.id: g
-            for g in Game.objects.filter(
-                id__in=[item["id"] for item in data]
-            ).select_related("home_team", "away_team")
-        }
-
         for item in data:
-            game = game_lookup.get(item["id"])
-            if game:
-                self.mask_game_scores(item, game, sim)
+            self.mask_game_scores(item, sim)
 
         return data
 
+    # Season listings are cached; once every game in them is final they are
+    # kept long-term and served with validators (see cached_response)
+    @cached_response(
+        lambda p: (
+            f"games_list_{urlencode(sorted(p.items()))}",
+            [season_tag(p["season"])],
+        ),
+        ttl="games",
+        final=lambda data: all(
+            game["home_score"] is not None for game in data["results"]
+        ),
+    )
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         sim = self.get_simulation_context(request)
@@ -223,8 +228,7 @@ class GameViewSet(SimulationMixin, viewsets.ModelViewSet):
         response = super().retrieve(request, *args, **kwargs)
         sim = self.get_simulation_context(request)
         if sim.is_active:
-            game = self.get_object()
-            self.mask_game_scores(response.data, game, sim)
+            self.mask_game_scores(response.data, sim)
         return response
 
     # path to get current week (/current_week)
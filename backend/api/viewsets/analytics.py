@@ -9,11 +9,35 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from api.cache_utils import (
+    ALL_STATS_TAG,
+    CALENDAR_TAG,
+    cached_response,
+    game_tag,
+    player_tag,
+    season_tag,
+    team_tag,
+    versioned_keys,
+)
+from api.defense_rankings import RANKED_POSITIONS, cached_defense_rankings
+from api.player_comparison import compare_players
 from api.simulation import SimulationMixin
-from games.models import Game
+from games.models import Game, TeamGameLog
 from players.models import Player
-from stats.models import FootballPlayerGameStat, FootballTeamGameStat
-from teams.models import Team
+from stats.cube import get_stats_cube
+from stats.models import FootballPlayerGameStat, FootballTeamGameStat, PlayerRollingStat
+from stats.rolling import FORMAT_AVERAGES, parse_window
+from stats.scoring import parse_format
+
+MAX_COMPARISON_PLAYERS = 25  # Players per /player-comparison-batch request
+
+
+def _team_key(prefix, default_games):
+    """Cache key for actions keyed on 'team_id' and 'games'"""
+    return lambda p: (
+        f"{prefix}_{p['team_id']}_{int(p.get('games', default_games))}",
+        [team_tag(p["team_id"])],
+    )
 
 
 class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
@@ -23,6 +47,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
     """
 
     @action(detail=False, methods=["get"], url_path="recent-stats")
+    @cached_response(_team_key("recent_stats", default_games=3))
     def recent_stats(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 3))
@@ -30,48 +55,42 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        # Create cache key
-        cache_key = f"recent_stats_{team_id}_{num_games}"
-
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        # If not in cache, fetch from database
-        query = FootballTeamGameStat.objects.filter(team_id=team_id)
-        stats = query.order_by("-game__date")[:num_games]
-
-        # Aggregate stats from query
-        past_stats = stats.aggregate(
-            # Passing stats
-            pass_att=Avg("pass_attempts"),
-            pass_yds=Avg("pass_yards"),
-            pass_tds=Avg("pass_touchdowns"),
-            completion_pct=Avg(
-                F("pass_completions") * 100.0 / NullIf(F("pass_attempts"), 0)
-            ),
-            # Rushing stats
-            rush_att=Avg("rush_attempts"),
-            rush_yds=Avg("rush_yards"),
-            rush_tds=Avg("rush_touchdowns"),
-            # General + Defensive stats
-            total_yards=Avg(F("rush_yards") + F("pass_yards")),
-            off_turnovers_total=Sum(F("interceptions") + F("fumbles_lost")),
-            def_turnovers_total=Sum(F("def_interceptions") + F("def_fumbles_forced")),
-        )
-
-        # Calculate points per average
-        games_data = []
-        for stat in stats:
-            game = stat.game
-            if game.home_team_id == int(team_id):
-                points = game.home_score
-            else:
-                points = game.away_score
-            games_data.append(points)
+        cube = get_stats_cube()
+        if cube is not None:
+            past_stats = cube.team_recent_stats(team_id, num_games)
+            points_avg = past_stats["points"] or 0
+        else:
+            query = FootballTeamGameStat.objects.filter(team_id=team_id)
+            stats = query.order_by("-game__date")[:num_games]
+
+            # Aggregate stats from query
+            past_stats = stats.aggregate(
+                # Passing stats
+                pass_att=Avg("pass_attempts"),
+                pass_yds=Avg("pass_yards"),
+                pass_tds=Avg("pass_touchdowns"),
+                completion_pct=Avg(
+                    F("pass_completions") * 100.0 / NullIf(F("pass_attempts"), 0)
+                ),
+                # Rushing stats
+                rush_att=Avg("rush_attempts"),
+                rush_yds=Avg("rush_yards"),
+                rush_tds=Avg("rush_touchdowns"),
+                # General + Defensive stats
+                total_yards=Avg(F("rush_yards") + F("pass_yards")),
+                off_turnovers_total=Sum(F("interceptions") + F("fumbles_lost")),
+                def_turnovers_total=Sum(
+                    F("def_interceptions") + F("def_fumbles_forced")
+                ),
+            )
 
-        points_avg = sum(games_data) / len(games_data) if games_data else 0
+            # Calculate points per average over the same games
+            points_avg = (
+                TeamGameLog.objects.filter(
+                    team_id=team_id, game_id__in=[stat.game_id for stat in stats]
+                ).aggregate(points=Avg("points_for"))["points"]
+                or 0
+            )
 
         # Initialize response data
         response_data = {
@@ -93,9 +112,6 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "points_per_game": round(points_avg, 2),
         }
 
-        # Store in cache
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
-
         return Response(response_data)
 
     """
@@ -105,6 +121,13 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
     """
 
     @action(detail=False, methods=["get"], url_path="defense-allowed")
+    @cached_response(
+        lambda p: (
+            f"defense_allowed_{p['team_id']}_{int(p.get('games', 3))}"
+            f"_{p.get('position', 'RB')}",
+            [team_tag(p["team_id"])],
+        )
+    )
     def defense_allowed(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 3))
@@ -113,14 +136,6 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        # Create cache key
-        cache_key = f"defense_allowed_{team_id}_{num_games}_{position}"
-
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
         # If not in cache, fetch from database
         valid_positions = ["RB", "WR", "TE", "QB"]
         if position not in valid_positions:
@@ -131,51 +146,58 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                 status=400,
             )
 
-        # Get game information using params (# of games, position, team)
-        games = (
-            Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
-            .exclude(home_score=None)
-            .order_by("-date")[:num_games]
-            .values_list("id", flat=True)
-        )
+        cube = get_stats_cube()
+        if cube is not None:
+            games_analyzed, aggregate_stats = cube.defense_allowed(
+                team_id, num_games, position
+            )
+        else:
+            # Get game information using params (# of games, position, team)
+            games = (
+                Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+                .exclude(home_score=None)
+                .order_by("-date")[:num_games]
+                .values_list("id", flat=True)
+            )
 
-        # Get opponent stats using params
-        opponent_stats = (
-            FootballPlayerGameStat.objects.filter(game_id__in=games)
-            .filter(player__position=position)
-            .exclude(player__team_id=team_id)
-        )
+            # Get opponent stats using params
+            opponent_stats = (
+                FootballPlayerGameStat.objects.filter(game_id__in=games)
+                .filter(position=position)
+                .exclude(team_id=team_id)
+            )
 
-        # Aggregate stats from query
-        aggregate_stats = opponent_stats.aggregate(
-            # Rushing stats
-            rush_att=Sum("rush_attempts"),
-            rush_yds=Sum("rush_yards"),
-            rush_tds=Sum("rush_touchdowns"),
-            # Receiving stats (for RB, WR, TE)
-            targets=Sum("targets"),
-            rec_receptions=Sum("receptions"),
-            rec_yds=Sum("receiving_yards"),
-            rec_tds=Sum("receiving_touchdowns"),
-            # Passing stats (for QB)
-            pass_att=Sum("pass_attempts"),
-            pass_comp=Sum("pass_completions"),
-            pass_yds=Sum("pass_yards"),
-            pass_tds=Sum("pass_touchdowns"),
-            interceptions=Sum("interceptions"),
-            sacks=Sum("sacks"),
-            # Other stats
-            fantasy_pts=Sum("fantasy_points_ppr"),
-            total_yards_allowed=Sum(
-                F("rush_yards") + F("receiving_yards") + F("pass_yards")
-            ),
-        )
+            # Aggregate stats from query
+            aggregate_stats = opponent_stats.aggregate(
+                # Rushing stats
+                rush_att=Sum("rush_attempts"),
+                rush_yds=Sum("rush_yards"),
+                rush_tds=Sum("rush_touchdowns"),
+                # Receiving stats (for RB, WR, TE)
+                targets=Sum("targets"),
+                rec_receptions=Sum("receptions"),
+                rec_yds=Sum("receiving_yards"),
+                rec_tds=Sum("receiving_touchdowns"),
+                # Passing stats (for QB)
+                pass_att=Sum("pass_attempts"),
+                pass_comp=Sum("pass_completions"),
+                pass_yds=Sum("pass_yards"),
+                pass_tds=Sum("pass_touchdowns"),
+                interceptions=Sum("interceptions"),
+                sacks=Sum("sacks"),
+                # Other stats
+                fantasy_pts=Sum("fantasy_points_ppr"),
+                total_yards_allowed=Sum(
+                    F("rush_yards") + F("receiving_yards") + F("pass_yards")
+                ),
+            )
+            games_analyzed = len(games)
 
         # Initialize response data
         response_data = {
             "team_id": team_id,
             "position": position,
-            "games_analyzed": len(games),
+            "games_analyzed": games_analyzed,
         }
 
         # Add rushing stats (relevant for RB, QB, WR, TE)
@@ -223,8 +245,62 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             (aggregate_stats["total_yards_allowed"] or 0) / num_games, 2
         )
 
-        # Store in cache
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
+        return Response(response_data)
+
+    """
+    GET --> Fantasy points, yards and TDs allowed per game to each position by every defense, ranked
+    Query params: 'games' (default=3), 'position' (optional: RB, WR, TE, QB)
+    Rank 1 allowed the fewest fantasy points; percentile 100 is the toughest defense
+    """
+
+    @action(detail=False, methods=["get"], url_path="defense-rankings")
+    @cached_response(
+        lambda p: (
+            f"defense_rankings_{int(p.get('games', 3))}_{p.get('position')}"
+            f"_{p.get('simulate_season')}_{p.get('simulate_week')}",
+            [ALL_STATS_TAG, CALENDAR_TAG],
+        )
+    )
+    def defense_rankings(self, request):
+        num_games = int(request.query_params.get("games", 3))
+        position = request.query_params.get("position")
+
+        if position is not None and position not in RANKED_POSITIONS:
+            return Response(
+                {
+                    "Error": f'Invalid position. Must be one of: {", ".join(RANKED_POSITIONS)}'
+                },
+                status=400,
+            )
+
+        # In simulation only games before the simulated week count
+        sim = self.get_simulation_context(request)
+        before = sim.cutoff_date if sim.is_active else None
+        rankings = cached_defense_rankings(num_games, before)
+
+        positions = [position] if position else RANKED_POSITIONS
+        response_data = {
+            "games_analyzed": num_games,
+            "positions": {
+                pos: [
+                    {
+                        "team_id": team_id,
+                        "team": line["team"],
+                        "games": line["games"],
+                        "fantasy_pts_allowed": round(line["fantasy_pts_allowed"], 2),
+                        "yards_allowed": round(line["yards_allowed"], 2),
+                        "tds_allowed": round(line["tds_allowed"], 2),
+                        "rank": line["rank"],
+                        "percentile": line["percentile"],
+                    }
+                    for team_id, line in sorted(
+                        rankings[pos].items(),
+                        key=lambda item: (item[1]["rank"], item[1]["team"] or ""),
+                    )
+                ]
+                for pos in positions
+            },
+        }
 
         return Response(response_data)
 
@@ -235,6 +311,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
     """
 
     @action(detail=False, methods=["get"], url_path="player-stats")
+    @cached_response(_team_key("player_stats", default_games=3))
     def player_stats(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 3))
@@ -242,58 +319,57 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        # Create cache key
-        cache_key = f"player_stats_{team_id}_{num_games}"
-
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        # Get relevant games for this team
-        games = (
-            Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
-            .exclude(home_score=None)
-            .order_by("-date")[:num_games]
-            .values_list("id", flat=True)
-        )
-
-        # Get player stats for this team in these games
-        player_stats_qs = (
-            FootballPlayerGameStat.objects.filter(
-                game_id__in=games, player__team_id=team_id
+        cube = get_stats_cube()
+        if cube is not None:
+            games_analyzed, player_stats_qs = cube.team_player_averages(
+                team_id, num_games
+            )
+        else:
+            # Get relevant games for this team
+            games = (
+                Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+                .exclude(home_score=None)
+                .order_by("-date")[:num_games]
+                .values_list("id", flat=True)
             )
-            .values("player_id", "player__name", "player__position")
-            .annotate(
-                rush_attempts=Avg("rush_attempts"),
-                rush_yards=Avg("rush_yards"),
-                rush_touchdowns=Avg("rush_touchdowns"),
-                targets=Avg("targets"),
-                receptions=Avg("receptions"),
-                receiving_yards=Avg("receiving_yards"),
-                receiving_touchdowns=Avg("receiving_touchdowns"),
-                pass_attempts=Avg("pass_attempts"),
-                pass_completions=Avg("pass_completions"),
-                pass_yards=Avg("pass_yards"),
-                pass_touchdowns=Avg("pass_touchdowns"),
-                interceptions=Avg("interceptions"),
-                sacks=Avg("sacks"),
-                fantasy_points=Avg("fantasy_points_ppr"),
-                games_played=Count("id"),
-                # Advanced metrics
-                avg_snap_count=Avg("snap_count"),
-                avg_snap_pct=Avg("snap_pct"),
-                avg_air_yards=Avg("air_yards"),
-                avg_yac=Avg("yards_after_catch"),
+
+            # Get player stats for this team in these games
+            player_stats_qs = (
+                FootballPlayerGameStat.objects.filter(
+                    game_id__in=games, team_id=team_id
+                )
+                .values("player_id", "player__name", "position")
+                .annotate(
+                    rush_attempts=Avg("rush_attempts"),
+                    rush_yards=Avg("rush_yards"),
+                    rush_touchdowns=Avg("rush_touchdowns"),
+                    targets=Avg("targets"),
+                    receptions=Avg("receptions"),
+                    receiving_yards=Avg("receiving_yards"),
+                    receiving_touchdowns=Avg("receiving_touchdowns"),
+                    pass_attempts=Avg("pass_attempts"),
+                    pass_completions=Avg("pass_completions"),
+                    pass_yards=Avg("pass_yards"),
+                    pass_touchdowns=Avg("pass_touchdowns"),
+                    interceptions=Avg("interceptions"),
+                    sacks=Avg("sacks"),
+                    fantasy_points=Avg("fantasy_points_ppr"),
+                    games_played=Count("id"),
+                    # Advanced metrics
+                    avg_snap_count=Avg("snap_count"),
+                    avg_snap_pct=Avg("snap_pct"),
+                    avg_air_yards=Avg("air_yards"),
+                    avg_yac=Avg("yards_after_catch"),
+                )
             )
-        )
+            games_analyzed = len(games)
 
         # Group by position
         grouped = defaultdict(list)
         valid_positions = ["QB", "RB", "WR", "TE"]
 
         for stat in player_stats_qs:
-            pos = stat["player__position"]
+            pos = stat["position"]
             if pos in valid_positions:
                 # Calculate aDOT
                 air_yards = stat["avg_air_yards"] or 0
@@ -344,13 +420,10 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
 
         response_data = {
             "team_id": team_id,
-            "games_analyzed": len(games),
+            "games_analyzed": games_analyzed,
             "players": players_dict,
         }
 
-        # Store in cache
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
-
         return Response(response_data)
 
     """
@@ -359,6 +432,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
     """
 
     @action(detail=False, methods=["get"], url_path="usage-metrics")
+    @cached_response(_team_key("usage_metrics", default_games=3))
     def usage_metrics(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 3))
@@ -366,20 +440,44 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        # Create cache key
-        cache_key = f"usage_metrics_{team_id}_{num_games}"
+        cube = get_stats_cube()
+        if cube is not None:
+            team_stats, target_stats, carry_stats = cube.usage(team_id, num_games)
+        else:
+            # Get team stats for pass/run split
+            team_stats = (
+                FootballTeamGameStat.objects.filter(team_id=team_id)
+                .order_by("-game__date")[:num_games]
+                .aggregate(pass_att=Avg("pass_attempts"), rush_att=Avg("rush_attempts"))
+            )
 
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+            # Get games for player stats
+            games = (
+                Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+                .exclude(home_score=None)
+                .order_by("-date")[:num_games]
+                .values_list("id", flat=True)
+            )
 
-        # Get team stats for pass/run split
-        team_stats = (
-            FootballTeamGameStat.objects.filter(team_id=team_id)
-            .order_by("-game__date")[:num_games]
-            .aggregate(pass_att=Avg("pass_attempts"), rush_att=Avg("rush_attempts"))
-        )
+            # Target share (WR + TE for receivers chart)
+            target_stats = (
+                FootballPlayerGameStat.objects.filter(
+                    game_id__in=games, team_id=team_id
+                )
+                .filter(position__in=["WR", "TE"])
+                .values("player_id", "player__name", "position")
+                .annotate(total_targets=Sum("targets"))
+            )
+
+            # Carry share (RB only)
+            carry_stats = (
+                FootballPlayerGameStat.objects.filter(
+                    game_id__in=games, team_id=team_id
+                )
+                .filter(position="RB")
+                .values("player_id", "player__name", "position")
+                .annotate(total_carries=Sum("rush_attempts"))
+            )
 
         total_plays = (team_stats["pass_att"] or 0) + (team_stats["rush_att"] or 0)
         pass_pct = (
@@ -389,24 +487,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             (team_stats["rush_att"] / total_plays * 100) if total_plays > 0 else 0
         )
 
-        # Get games for player stats
-        games = (
-            Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
-            .exclude(home_score=None)
-            .order_by("-date")[:num_games]
-            .values_list("id", flat=True)
-        )
-
         # Target share (WR + TE for receivers chart)
-        target_stats = (
-            FootballPlayerGameStat.objects.filter(
-                game_id__in=games, player__team_id=team_id
-            )
-            .filter(player__position__in=["WR", "TE"])
-            .values("player_id", "player__name", "player__position")
-            .annotate(total_targets=Sum("targets"))
-        )
-
         total_targets = sum(t["total_targets"] or 0 for t in target_stats)
         target_share = []
         for t in target_stats:
@@ -415,7 +496,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                     {
                         "player_id": t["player_id"],
                         "name": t["player__name"],
-                        "position": t["player__position"],
+                        "position": t["position"],
                         "targets": round(t["total_targets"] / num_games, 1),
                         "target_share_percentage": (
                             round(t["total_targets"] / total_targets * 100, 1)
@@ -427,15 +508,6 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         target_share.sort(key=lambda x: x["target_share_percentage"], reverse=True)
 
         # Carry share (RB only)
-        carry_stats = (
-            FootballPlayerGameStat.objects.filter(
-                game_id__in=games, player__team_id=team_id
-            )
-            .filter(player__position="RB")
-            .values("player_id", "player__name", "player__position")
-            .annotate(total_carries=Sum("rush_attempts"))
-        )
-
         total_carries = sum(c["total_carries"] or 0 for c in carry_stats)
         carry_share = []
         for c in carry_stats:
@@ -444,7 +516,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                     {
                         "player_id": c["player_id"],
                         "name": c["player__name"],
-                        "position": c["player__position"],
+                        "position": c["position"],
                         "rush_attempts": round(c["total_carries"] / num_games, 1),
                         "carry_share_percentage": (
                             round(c["total_carries"] / total_carries * 100, 1)
@@ -468,9 +540,6 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "carry_share": carry_share,
         }
 
-        # Store in cache
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
-
         return Response(response_data)
 
     """
@@ -480,6 +549,10 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
     """
 
     @action(detail=False, methods=["get"], url_path="game-box-score")
+    @cached_response(
+        lambda p: (f"game_box_score_{p['game_id']}", [game_tag(p["game_id"])]),
+        final=lambda data: True,  # Only played games have a box score
+    )
     def game_box_score(self, request):
         game_id = request.query_params.get("game_id")
 
@@ -528,9 +601,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         # Get top performers for each team
         def get_top_performers(team):
             player_stats = (
-                FootballPlayerGameStat.objects.filter(
-                    game_id=game_id, player__team=team
-                )
+                FootballPlayerGameStat.objects.filter(game_id=game_id, team=team)
                 .select_related("player")
                 .order_by("-fantasy_points_ppr")[:5]
             )
@@ -542,7 +613,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                         {
                             "player_id": ps.player.id,
                             "name": ps.player.name,
-                            "position": ps.player.position,
+                            "position": ps.position,
                             "fantasy_points": round(ps.fantasy_points_ppr, 1),
                             "pass_yards": ps.pass_yards,
                             "pass_tds": ps.pass_touchdowns,
@@ -591,159 +662,94 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not player_id:
             return Response({"Error": "'player_id' is required"}, status=400)
 
-        # Get player info
-        try:
-            player = Player.objects.select_related("team").get(id=player_id)
-        except Player.DoesNotExist:
+        comparison = self._player_comparisons(request, [player_id], num_games)
+        if player_id not in comparison:
             return Response({"Error": "Player not found"}, status=404)
 
-        # Get player's recent stats
-        player_games = (
-            Game.objects.filter(Q(home_team=player.team) | Q(away_team=player.team))
-            .exclude(home_score=None)
-            .order_by("-date")[:num_games]
-            .values_list("id", flat=True)
-        )
+        return Response(comparison[player_id])
 
-        player_stats = FootballPlayerGameStat.objects.filter(
-            player_id=player_id, game_id__in=player_games
-        ).aggregate(
-            avg_fantasy_points=Avg("fantasy_points_ppr"),
-            avg_targets=Avg("targets"),
-            avg_receptions=Avg("receptions"),
-            avg_receiving_yards=Avg("receiving_yards"),
-            avg_receiving_tds=Avg("receiving_touchdowns"),
-            avg_rush_attempts=Avg("rush_attempts"),
-            avg_rush_yards=Avg("rush_yards"),
-            avg_rush_tds=Avg("rush_touchdowns"),
-            avg_pass_yards=Avg("pass_yards"),
-            avg_pass_tds=Avg("pass_touchdowns"),
-            avg_interceptions=Avg("interceptions"),
-            games_played=Count("id"),
-            # Advanced metrics
-            avg_snap_count=Avg("snap_count"),
-            avg_snap_pct=Avg("snap_pct"),
-            avg_air_yards=Avg("air_yards"),
-            avg_yac=Avg("yards_after_catch"),
-        )
+    """
+    GET API --> Player comparison data for several players at once
+    Query params: 'player_ids' (required, comma-separated), 'games' (default=3)
+    Returns one /player-comparison payload per player, in request order
+    """
 
-        # Get upcoming game (use simulation cutoff if active)
-        sim = self.get_simulation_context(request)
-        if sim.is_active and sim.cutoff_date:
-            cutoff = sim.cutoff_date
-        else:
-            cutoff = timezone.now().date()
-        upcoming_game = (
-            Game.objects.filter(Q(home_team=player.team) | Q(away_team=player.team))
-            .filter(date__gte=cutoff)
-            .order_by("date")
-            .first()
+    @action(detail=False, methods=["get"], url_path="player-comparison-batch")
+    def player_comparison_batch(self, request):
+        # Comma-separated, de-duplicated, request order kept
+        player_ids = list(
+            dict.fromkeys(
+                player_id
+                for player_id in request.query_params.get("player_ids", "").split(",")
+                if player_id
+            )
         )
+        num_games = int(request.query_params.get("games", 3))
 
-        matchup_data = None
-        defense_ranking = None
-
-        if upcoming_game and player.team:
-            # Determine opponent
-            if upcoming_game.home_team_id == player.team.id:
-                opponent = upcoming_game.away_team
-                is_home = True
-            else:
-                opponent = upcoming_game.home_team
-                is_home = False
-
-            # Get opponent's defense ranking vs this position
-            opp_games = (
-                Game.objects.filter(Q(home_team=opponent) | Q(away_team=opponent))
-                .exclude(home_score=None)
-                .order_by("-date")[:num_games]
-                .values_list("id", flat=True)
-            )
+        if not player_ids:
+            return Response({"Error": "'player_ids' is required"}, status=400)
 
-            # Stats allowed to this position
-            position = player.position
-            opp_defense_stats = (
-                FootballPlayerGameStat.objects.filter(game_id__in=opp_games)
-                .filter(player__position=position)
-                .exclude(player__team=opponent)
-                .aggregate(
-                    fantasy_pts_allowed=Avg("fantasy_points_ppr"),
-                    yards_allowed=Avg(F("receiving_yards") + F("rush_yards")),
-                    tds_allowed=Avg(F("receiving_touchdowns") + F("rush_touchdowns")),
-                )
+        if len(player_ids) > MAX_COMPARISON_PLAYERS:
+            return Response(
+                {"Error": f"At most {MAX_COMPARISON_PLAYERS} players per request"},
+                status=400,
             )
 
-            matchup_data = {
-                "game_id": upcoming_game.id,
-                "opponent": opponent.abbreviation,
-                "opponent_name": opponent.name,
-                "opponent_logo_url": opponent.logo_url,
-                "is_home": is_home,
-                "game_date": upcoming_game.date.isoformat(),
-                "game_time": upcoming_game.time,
-                "location": upcoming_game.location,
-                "weather": {
-                    "temp": upcoming_game.temp,
-                    "wind": upcoming_game.wind,
-                    "roof": upcoming_game.roof,
-                },
-            }
-
-            defense_ranking = {
-                "fantasy_pts_allowed": round(
-                    opp_defense_stats["fantasy_pts_allowed"] or 0, 1
-                ),
-                "yards_allowed": round(opp_defense_stats["yards_allowed"] or 0, 1),
-                "tds_allowed": round(opp_defense_stats["tds_allowed"] or 0, 2),
-            }
+        comparisons = self._player_comparisons(request, player_ids, num_games)
 
         response_data = {
-            "player": {
-                "id": player.id,
-                "name": player.name,
-                "position": player.position,
-                "team": player.team.abbreviation if player.team else None,
-                "team_name": player.team.name if player.team else None,
-                "image_url": player.image_url,
-            },
-            "stats": {
-                "avg_fantasy_points": round(player_stats["avg_fantasy_points"] or 0, 1),
-                "avg_targets": round(player_stats["avg_targets"] or 0, 1),
-                "avg_receptions": round(player_stats["avg_receptions"] or 0, 1),
-                "avg_receiving_yards": round(
-                    player_stats["avg_receiving_yards"] or 0, 1
-                ),
-                "avg_receiving_tds": round(player_stats["avg_receiving_tds"] or 0, 2),
-                "avg_rush_attempts": round(player_stats["avg_rush_attempts"] or 0, 1),
-                "avg_rush_yards": round(player_stats["avg_rush_yards"] or 0, 1),
-                "avg_rush_tds": round(player_stats["avg_rush_tds"] or 0, 2),
-                "avg_pass_yards": round(player_stats["avg_pass_yards"] or 0, 1),
-                "avg_pass_tds": round(player_stats["avg_pass_tds"] or 0, 2),
-                "avg_interceptions": round(player_stats["avg_interceptions"] or 0, 2),
-                "games_played": player_stats["games_played"] or 0,
-                # Advanced metrics
-                "avg_snap_count": round(player_stats["avg_snap_count"] or 0, 1),
-                "avg_snap_pct": round(player_stats["avg_snap_pct"] or 0, 1),
-                "avg_air_yards": round(player_stats["avg_air_yards"] or 0, 1),
-                "avg_yac": round(player_stats["avg_yac"] or 0, 1),
-                "adot": (
-                    round(
-                        (player_stats["avg_air_yards"] or 0)
-                        / (player_stats["avg_targets"] or 1),
-                        1,
-                    )
-                    if player_stats["avg_targets"]
-                    else 0
-                ),
-            },
             "games_analyzed": num_games,
-            "matchup": matchup_data,
-            "opponent_defense": defense_ranking,
+            "players": [comparisons[pid] for pid in player_ids if pid in comparisons],
+            "not_found": [pid for pid in player_ids if pid not in comparisons],
         }
 
         return Response(response_data)
 
+    def _player_comparisons(self, request, player_ids, num_games):
+        """
+        Comparisons for player_ids, cached per (player, window, cutoff).
+
+        The cutoff is the simulated week's first game date, or today, so
+        live and simulated comparisons never share a cache entry.
+        """
+        sim = self.get_simulation_context(request)
+        if sim.is_active and sim.cutoff_date:
+            cutoff = sim.cutoff_date
+        else:
+            cutoff = timezone.now().date()
+
+        keys = versioned_keys(
+            [
+                (
+                    f"player_comparison_{player_id}_{num_games}_{cutoff.isoformat()}",
+                    [player_tag(player_id), ALL_STATS_TAG, CALENDAR_TAG],
+                )
+                for player_id in player_ids
+            ]
+        )
+        cached = cache.get_many(keys)
+
+        missing = [pid for pid, key in zip(player_ids, keys) if key not in cached]
+        computed = compare_players(missing, num_games, cutoff) if missing else {}
+        cache.set_many(
+            {
+                key: computed[pid]
+                for pid, key in zip(player_ids, keys)
+                if pid in computed
+            },
+            settings.CACHE_TTL["analytics"],
+        )
+
+        comparisons = {}
+        for pid, key in zip(player_ids, keys):
+            if key in cached:
+                comparisons[pid] = cached[key]
+            elif pid in computed:
+                comparisons[pid] = computed[pid]
+        return comparisons
+
     @action(detail=False, methods=["get"], url_path="team-game-log")
+    @cached_response(_team_key("team_game_log", default_games=5))
     def team_game_log(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 5))
@@ -751,46 +757,36 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        cache_key = f"team_game_log_{team_id}_{num_games}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        team_stats = (
-            FootballTeamGameStat.objects.filter(team_id=team_id)
-            .select_related("game", "game__home_team", "game__away_team")
-            .order_by("-game__date")[:num_games]
+        logs = (
+            TeamGameLog.objects.filter(team_id=team_id, result__isnull=False)
+            .select_related("opponent")
+            .order_by("-date")[:num_games]
         )
+        logs = list(logs)
+        team_stats = {
+            stat.game_id: stat
+            for stat in FootballTeamGameStat.objects.filter(
+                team_id=team_id, game_id__in=[log.game_id for log in logs]
+            )
+        }
 
         games_list = []
-        for stat in team_stats:
-            game = stat.game
-            is_home = game.home_team_id == int(team_id)
-            opponent = game.away_team if is_home else game.home_team
-            team_score = game.home_score if is_home else game.away_score
-            opp_score = game.away_score if is_home else game.home_score
-
-            if team_score is None:
+        for log in logs:
+            stat = team_stats.get(log.game_id)
+            if stat is None:
                 continue
 
-            if team_score > opp_score:
-                result = "W"
-            elif team_score < opp_score:
-                result = "L"
-            else:
-                result = "T"
-
             games_list.append(
                 {
-                    "game_id": game.id,
-                    "week": game.week,
-                    "date": game.date.isoformat(),
-                    "opponent": opponent.abbreviation,
-                    "opponent_logo_url": opponent.logo_url,
-                    "is_home": is_home,
-                    "team_score": team_score,
-                    "opp_score": opp_score,
-                    "result": result,
+                    "game_id": log.game_id,
+                    "week": log.week,
+                    "date": log.date.isoformat(),
+                    "opponent": log.opponent.abbreviation,
+                    "opponent_logo_url": log.opponent.logo_url,
+                    "is_home": log.is_home,
+                    "team_score": log.points_for,
+                    "opp_score": log.points_against,
+                    "result": log.result,
                     "pass_yards": stat.pass_yards,
                     "rush_yards": stat.rush_yards,
                     "total_yards": stat.pass_yards + stat.rush_yards,
@@ -806,10 +802,18 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "games": games_list,
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
 
     @action(detail=False, methods=["get"], url_path="head-to-head")
+    @cached_response(
+        lambda p: (
+            f"head_to_head_{p['team1_id']}_{p['team2_id']}_{int(p.get('limit', 5))}",
+            [team_tag(p["team1_id"]), team_tag(p["team2_id"])],
+        ),
+        # Completed games only; a new or rescored game bumps both team tags
+        # (games/signals.py)
+        final=lambda data: True,
+    )
     def head_to_head(self, request):
         team1_id = request.query_params.get("team1_id")
         team2_id = request.query_params.get("team2_id")
@@ -820,56 +824,34 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                 {"Error": "'team1_id' and 'team2_id' are required"}, status=400
             )
 
-        cache_key = f"head_to_head_{team1_id}_{team2_id}_{limit}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+        logs = list(
+            TeamGameLog.objects.filter(
+                team_id=team1_id, opponent_id=team2_id, result__isnull=False
+            ).order_by("-date")[:limit]
+        )
 
-        games = (
-            Game.objects.filter(
-                (Q(home_team_id=team1_id) & Q(away_team_id=team2_id))
-                | (Q(home_team_id=team2_id) & Q(away_team_id=team1_id))
+        # Both teams' stat lines for these games in one query
+        team_stats = {
+            (stat.game_id, stat.team_id): stat
+            for stat in FootballTeamGameStat.objects.filter(
+                game_id__in=[log.game_id for log in logs],
+                team_id__in=[team1_id, team2_id],
             )
-            .exclude(home_score=None)
-            .order_by("-date")[:limit]
-        )
+        }
 
         matchups = []
-        team1_wins = 0
-        team2_wins = 0
-        ties = 0
-
-        for game in games:
-            if game.home_team_id == int(team1_id):
-                t1_score = game.home_score
-                t2_score = game.away_score
-            else:
-                t1_score = game.away_score
-                t2_score = game.home_score
-
-            if t1_score > t2_score:
-                team1_wins += 1
-            elif t2_score > t1_score:
-                team2_wins += 1
-            else:
-                ties += 1
-
-            # Get team stats for this game
-            t1_stats = FootballTeamGameStat.objects.filter(
-                game=game, team_id=team1_id
-            ).first()
-            t2_stats = FootballTeamGameStat.objects.filter(
-                game=game, team_id=team2_id
-            ).first()
+        for log in logs:
+            t1_stats = team_stats.get((log.game_id, int(team1_id)))
+            t2_stats = team_stats.get((log.game_id, int(team2_id)))
 
             matchups.append(
                 {
-                    "game_id": game.id,
-                    "season": game.season,
-                    "week": game.week,
-                    "date": game.date.isoformat(),
-                    "team1_score": t1_score,
-                    "team2_score": t2_score,
+                    "game_id": log.game_id,
+                    "season": log.season,
+                    "week": log.week,
+                    "date": log.date.isoformat(),
+                    "team1_score": log.points_for,
+                    "team2_score": log.points_against,
                     "team1_total_yards": (
                         (t1_stats.pass_yards + t1_stats.rush_yards) if t1_stats else 0
                     ),
@@ -889,6 +871,11 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
                 }
             )
 
+        results = [log.result for log in logs]
+        team1_wins = results.count("W")
+        team2_wins = results.count("L")
+        ties = results.count("T")
+
         response_data = {
             "matchups": matchups,
             "series_record": {
@@ -898,10 +885,15 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             },
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
 
     @action(detail=False, methods=["get"], url_path="common-opponents")
+    @cached_response(
+        lambda p: (
+            f"common_opponents_{p['team1_id']}_{p['team2_id']}_{p['season']}",
+            [team_tag(p["team1_id"]), team_tag(p["team2_id"]), season_tag(p["season"])],
+        )
+    )
     def common_opponents(self, request):
         team1_id = request.query_params.get("team1_id")
         team2_id = request.query_params.get("team2_id")
@@ -915,40 +907,30 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not season:
             return Response({"Error": "'season' is required"}, status=400)
 
-        cache_key = f"common_opponents_{team1_id}_{team2_id}_{season}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
         season = int(season)
 
-        # Find opponents each team played
-        def get_opponents_and_results(tid):
-            games = (
-                Game.objects.filter(
-                    Q(home_team_id=tid) | Q(away_team_id=tid), season=season
-                )
-                .exclude(home_score=None)
-                .select_related("home_team", "away_team")
+        # Both teams' completed games this season, from each team's side
+        logs = (
+            TeamGameLog.objects.filter(
+                team_id__in=[team1_id, team2_id], season=season, result__isnull=False
             )
+            .select_related("opponent")
+            .order_by("date")
+        )
 
-            results = defaultdict(list)
-            for g in games:
-                is_home = g.home_team_id == int(tid)
-                opp = g.away_team if is_home else g.home_team
-                score = g.home_score if is_home else g.away_score
-                opp_score = g.away_score if is_home else g.home_score
-                results[opp.id].append(
-                    {
-                        "score": score,
-                        "opp_score": opp_score,
-                        "week": g.week,
-                    }
-                )
-            return results
-
-        t1_results = get_opponents_and_results(team1_id)
-        t2_results = get_opponents_and_results(team2_id)
+        results = {int(team1_id): defaultdict(list), int(team2_id): defaultdict(list)}
+        opponents = {}
+        for log in logs:
+            opponents[log.opponent_id] = log.opponent
+            results[log.team_id][log.opponent_id].append(
+                {
+                    "score": log.points_for,
+                    "opp_score": log.points_against,
+                    "week": log.week,
+                }
+            )
+        t1_results = results[int(team1_id)]
+        t2_results = results[int(team2_id)]
 
         # Exclude each other
         common_ids = set(t1_results.keys()) & set(t2_results.keys())
@@ -957,10 +939,7 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
 
         common_opponents = []
         for opp_id in common_ids:
-            try:
-                opp_team = Team.objects.get(id=opp_id)
-            except Team.DoesNotExist:
-                continue
+            opp_team = opponents[opp_id]
             common_opponents.append(
                 {
                     "opponent_abbreviation": opp_team.abbreviation,
@@ -976,10 +955,10 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "common_opponents": common_opponents,
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
 
     @action(detail=False, methods=["get"], url_path="usage-trends")
+    @cached_response(_team_key("usage_trends", default_games=5))
     def usage_trends(self, request):
         team_id = request.query_params.get("team_id")
         num_games = int(request.query_params.get("games", 5))
@@ -987,22 +966,24 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not team_id:
             return Response({"Error": "'team_id' is required"}, status=400)
 
-        cache_key = f"usage_trends_{team_id}_{num_games}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
         games = (
             Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
             .exclude(home_score=None)
             .order_by("-date")[:num_games]
         )
 
+        games = list(games)
+
+        # Every game's player stats in one query, grouped by game
+        stats_by_game = defaultdict(list)
+        for ps in FootballPlayerGameStat.objects.filter(
+            game_id__in=[game.id for game in games], team_id=team_id
+        ).select_related("player"):
+            stats_by_game[ps.game_id].append(ps)
+
         per_game = []
-        for game in reversed(list(games)):  # chronological order
-            player_stats = FootballPlayerGameStat.objects.filter(
-                game=game, player__team_id=team_id
-            ).select_related("player")
+        for game in reversed(games):  # chronological order
+            player_stats = stats_by_game[game.id]
 
             # Compute totals for the team in this game
             total_targets = sum(ps.targets for ps in player_stats)
@@ -1011,19 +992,11 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             target_shares = {}
             carry_shares = {}
             for ps in player_stats:
-                if (
-                    ps.player.position in ["WR", "TE"]
-                    and ps.targets > 0
-                    and total_targets > 0
-                ):
+                if ps.position in ["WR", "TE"] and ps.targets > 0 and total_targets > 0:
                     target_shares[ps.player.name] = round(
                         ps.targets / total_targets * 100, 1
                     )
-                if (
-                    ps.player.position == "RB"
-                    and ps.rush_attempts > 0
-                    and total_carries > 0
-                ):
+                if ps.position == "RB" and ps.rush_attempts > 0 and total_carries > 0:
                     carry_shares[ps.player.name] = round(
                         ps.rush_attempts / total_carries * 100, 1
                     )
@@ -1041,10 +1014,15 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "per_game": per_game,
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
 
     @action(detail=False, methods=["get"], url_path="player-trend")
+    @cached_response(
+        lambda p: (
+            f"player_trend_{p['player_id']}_{int(p.get('games', 10))}",
+            [player_tag(p["player_id"])],
+        )
+    )
     def player_trend(self, request):
         player_id = request.query_params.get("player_id")
         num_games = int(request.query_params.get("games", 10))
@@ -1052,48 +1030,64 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
         if not player_id:
             return Response({"Error": "'player_id' is required"}, status=400)
 
-        cache_key = f"player_trend_{player_id}_{num_games}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
         try:
             player = Player.objects.select_related("team").get(id=player_id)
         except Player.DoesNotExist:
             return Response({"Error": "Player not found"}, status=404)
 
-        games = (
-            Game.objects.filter(Q(home_team=player.team) | Q(away_team=player.team))
-            .exclude(home_score=None)
-            .order_by("-date")[:num_games]
-            .values_list("id", flat=True)
-        )
+        cube = get_stats_cube()
+        if cube is not None:
+            lines = cube.player_games(player_id, player.team_id, num_games)
+        else:
+            games = (
+                Game.objects.filter(Q(home_team=player.team) | Q(away_team=player.team))
+                .exclude(home_score=None)
+                .order_by("-date")[:num_games]
+                .values_list("id", flat=True)
+            )
 
-        stats = (
-            FootballPlayerGameStat.objects.filter(
-                player_id=player_id, game_id__in=games
+            stats = (
+                FootballPlayerGameStat.objects.filter(
+                    player_id=player_id, game_id__in=games
+                )
+                .select_related("game", "game__home_team", "game__away_team")
+                .order_by("game__date")
             )
-            .select_related("game", "game__home_team", "game__away_team")
-            .order_by("game__date")
-        )
+
+            lines = []
+            for s in stats:
+                g = s.game
+                opponent = (
+                    g.away_team if g.home_team_id == player.team_id else g.home_team
+                )
+                lines.append(
+                    {
+                        "week": g.week,
+                        "opponent": opponent.abbreviation,
+                        "fantasy_points_ppr": s.fantasy_points_ppr,
+                        "pass_yards": s.pass_yards,
+                        "rush_yards": s.rush_yards,
+                        "receiving_yards": s.receiving_yards,
+                        "targets": s.targets,
+                        "receptions": s.receptions,
+                    }
+                )
 
         per_game = []
         all_fpts = []
-        for s in stats:
-            g = s.game
-            opponent = g.away_team if g.home_team_id == player.team_id else g.home_team
-            fpts = round(s.fantasy_points_ppr, 1)
+        for line in lines:
+            fpts = round(line["fantasy_points_ppr"], 1)
             all_fpts.append(fpts)
             per_game.append(
                 {
-                    "week": g.week,
-                    "opponent": opponent.abbreviation,
+                    "week": line["week"],
+                    "opponent": line["opponent"],
                     "fantasy_points": fpts,
-                    "pass_yards": s.pass_yards,
-                    "rush_yards": s.rush_yards,
-                    "receiving_yards": s.receiving_yards,
-                    "targets": s.targets,
-                    "receptions": s.receptions,
+                    "pass_yards": line["pass_yards"],
+                    "rush_yards": line["rush_yards"],
+                    "receiving_yards": line["receiving_yards"],
+                    "targets": line["targets"],
+                    "receptions": line["receptions"],
                 }
             )
 
@@ -1117,58 +1111,62 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "trend": trend,
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
 
     @action(detail=False, methods=["get"], url_path="best-team")
+    @cached_response(
+        lambda p: (
+            f"best_team_{parse_window(p.get('games', 3))}"
+            f"_{parse_format(p.get('scoring'))}",
+            [ALL_STATS_TAG],
+        )
+    )
     def best_team(self, request):
-        num_games = int(request.query_params.get("games", 3))
-
-        cache_key = f"best_team_{num_games}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        from django.db.models import Avg as DjAvg
-
-        # Get players with avg fantasy points
-        player_stats = (
-            FootballPlayerGameStat.objects.values(
-                "player_id",
-                "player__name",
-                "player__position",
-                "player__team__abbreviation",
-                "player__image_url",
+        try:
+            window = parse_window(request.query_params.get("games", 3))
+        except ValueError:
+            return Response(
+                {"Error": "'games' must be one of 1, 3, 5, 10 or 'season'"},
+                status=400,
             )
-            .annotate(
-                avg_fpts=DjAvg("fantasy_points_ppr"),
-                games_played=Count("id"),
+        try:
+            scoring = parse_format(request.query_params.get("scoring"))
+        except ValueError:
+            return Response(
+                {"Error": "'scoring' must be one of PPR, HALF or STD"}, status=400
             )
-            .filter(games_played__gte=1)
-            .order_by("-avg_fpts")
-        )
+        average = FORMAT_AVERAGES[scoring]
 
-        # Filter to recent N games per player
-        # For simplicity, we use overall averages but filter by min games
+        # Indexed top-N reads on (window, position, -<format average>); one
+        # extra RB/WR/TE each so the FLEX slot is the best player left over
         position_limits = {"QB": 1, "RB": 2, "WR": 2, "TE": 1}
         roster = {"QB": [], "RB": [], "WR": [], "TE": [], "FLEX": []}
+        flex_candidates = []
+
+        for pos, limit in position_limits.items():
+            fetch = limit + 1 if pos in ["RB", "WR", "TE"] else limit
+            leaders = (
+                PlayerRollingStat.objects.filter(window=window, position=pos)
+                .select_related("player__team")
+                .order_by(f"-{average}")[:fetch]
+            )
+            for rolling in leaders:
+                player = rolling.player
+                entry = {
+                    "player_id": player.id,
+                    "name": player.name,
+                    "position": pos,
+                    "team": player.team.abbreviation if player.team else None,
+                    "image_url": player.image_url,
+                    "avg_fpts": round(getattr(rolling, average), 1),
+                }
+                if len(roster[pos]) < limit:
+                    roster[pos].append(entry)
+                else:
+                    flex_candidates.append(entry)
 
-        for ps in player_stats:
-            pos = ps["player__position"]
-            if pos not in position_limits:
-                continue
-            entry = {
-                "player_id": ps["player_id"],
-                "name": ps["player__name"],
-                "position": pos,
-                "team": ps["player__team__abbreviation"],
-                "image_url": ps["player__image_url"],
-                "avg_fpts": round(ps["avg_fpts"], 1),
-            }
-            if len(roster[pos]) < position_limits[pos]:
-                roster[pos].append(entry)
-            elif pos in ["RB", "WR", "TE"] and len(roster["FLEX"]) == 0:
-                roster["FLEX"].append(entry)
+        if flex_candidates:
+            roster["FLEX"].append(max(flex_candidates, key=lambda p: p["avg_fpts"]))
 
         total = sum(p["avg_fpts"] for slot in roster.values() for p in slot)
 
@@ -1177,5 +1175,4 @@ class AnalyticsViewSet(SimulationMixin, viewsets.ViewSet):
             "projected_weekly_total": round(total, 1),
         }
 
-        cache.set(cache_key, response_data, settings.CACHE_TTL["analytics"])
         return Response(response_data)
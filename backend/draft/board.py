@@ -0,0 +1,96 @@
+"""
+Cached Draft Board
+
+The board endpoint is polled while a draft runs, and used to re-read and
+re-serialize every pick with its player and team joins on each poll.
+Instead, each session's board is cached as compact tuples (BOARD_FIELDS)
+and extended in place as picks are committed: the user's pick by
+record_user_pick, AI turns by DraftEngine. The database is only read again
+if the cached board is evicted or falls out of step (a gap in pick
+numbers), in which case it's rebuilt with one query.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+BOARD_FIELDS = (
+    "overall_pick",
+    "round_number",
+    "team_number",
+    "is_user",
+    "player_id",
+    "name",
+    "position",
+    "team",
+    "image_url",
+)
+
+
+def _board_key(session_id):
+    return f"draft_board_{session_id}"
+
+
+def board_row(pick, team, image_url) -> tuple:
+    """BOARD_FIELDS of a pick whose .player has name and position loaded"""
+    return (
+        pick.overall_pick,
+        pick.round_number,
+        pick.team_number,
+        pick.is_user,
+        pick.player_id,
+        pick.player.name,
+        pick.player.position,
+        team,
+        image_url,
+    )
+
+
+def board_rows(session) -> list:
+    """Every pick of a session as BOARD_FIELDS tuples, in pick order."""
+    key = _board_key(session.id)
+    rows = cache.get(key)
+    if rows is None:
+        rows = [
+            board_row(
+                pick,
+                pick.player.team.abbreviation if pick.player.team else None,
+                pick.player.image_url,
+            )
+            for pick in session.picks.select_related("player", "player__team")
+        ]
+        cache.set(key, rows, settings.CACHE_TTL["draft"])
+    return rows
+
+
+def append_picks(session_id, rows):
+    """Add new picks to a cached board (no-op if the board isn't cached)."""
+    if not rows:
+        return
+    key = _board_key(session_id)
+    cached = cache.get(key)
+    if cached is None:
+        return
+    next_pick = cached[-1][0] + 1 if cached else 1
+    if rows[0][0] != next_pick:
+        # Out of step with the database: rebuild on the next read
+        cache.delete(key)
+        return
+    cache.set(key, cached + list(rows), settings.CACHE_TTL["draft"])
+
+
+def expand_row(row) -> dict:
+    """A board tuple in the board endpoint's pick shape"""
+    pick = dict(zip(BOARD_FIELDS, row))
+    return {
+        "overall_pick": pick["overall_pick"],
+        "round_number": pick["round_number"],
+        "team_number": pick["team_number"],
+        "is_user": pick["is_user"],
+        "player": {
+            "id": pick["player_id"],
+            "name": pick["name"],
+            "position": pick["position"],
+            "team": pick["team"],
+            "image_url": pick["image_url"],
+        },
+    }
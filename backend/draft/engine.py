@@ -0,0 +1,188 @@
+"""
+In-Memory Draft Engine
+
+Advancing a draft used to cost, for every AI pick, a full Avg/Count
+annotation over every stat row (get_available_players), a roster query and
+a DraftPick insert: up to 22 heavy aggregates between two user turns of a
+12-team draft.
+
+WHY:
+----
+A player's ranking can't change mid-draft in any way the AI cares about, so
+the ranked pool only needs computing once per session. Everything after that
+is bookkeeping: remove the drafted player, bump a position count.
+
+HOW IT WORKS:
+-------------
+- The ranked pool (id, name, position, avg points, team, image, in draft
+  order) is snapshotted into the cache the first time a session is loaded;
+  it doubles as the session's projection map (roster endpoint)
+- One max-heap per position; drafted players are dropped lazily when they
+  reach the top, so a pick is O(log n)
+- Per-team position counts are rebuilt from the session's picks (one query)
+- A turn's AI picks are written with one bulk_create and one session update,
+  and appended to the cached board (draft/board.py) once the transaction
+  commits
+"""
+
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from players.models import Player
+
+from .board import append_picks, board_row
+from .models import DraftPick
+from .services import DraftAI
+
+# Position limits for AI teams
+POSITION_LIMITS = {
+    "QB": 2,
+    "RB": 5,
+    "WR": 5,
+    "TE": 2,
+}
+
+
+def _pool_key(session_id):
+    return f"draft_pool_{session_id}"
+
+
+def ranked_pool(session) -> list:
+    """
+    The session's ranked player pool, snapshotted on first use.
+
+    Returns:
+        [(player_id, name, position, avg_fpts, team, image_url)] best first,
+        drafted players included (the engine skips them)
+    """
+    key = _pool_key(session.id)
+    pool = cache.get(key)
+    if pool is None:
+        pool = [
+            (
+                p["id"],
+                p["name"],
+                p["position"],
+                p["avg_fpts"] or 0,
+                p["team__abbreviation"],
+                p["image_url"],
+            )
+            for p in DraftAI.get_ranked_players(session).values(
+                "id", "name", "position", "avg_fpts", "team__abbreviation", "image_url"
+            )
+        ]
+        cache.set(key, pool, settings.CACHE_TTL["draft"])
+    return pool
+
+
+class DraftEngine:
+    """Ranked pool and rosters of one draft session, held in memory."""
+
+    def __init__(self, session, pool, picks):
+        """
+        Args:
+            session: DraftSession
+            pool: ranked_pool() entries
+            picks: (player_id, team_number) of every pick made so far
+        """
+        self.session = session
+        self.players = {entry[0]: entry for entry in pool}
+        self.drafted = set()
+        self.rosters = {}  # team -> {position: count}
+        self.team_players = {}  # team -> [player_id] in pick order
+        self.heaps = {}
+        for rank, entry in enumerate(pool):
+            # Pool order is the ranking, so the index doubles as the heap key
+            self.heaps.setdefault(entry[2], []).append((rank, entry[0]))
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+        for player_id, team_number in picks:
+            self._mark_drafted(player_id, team_number)
+
+    @classmethod
+    def load(cls, session) -> "DraftEngine":
+        picks = session.picks.values_list("player_id", "team_number")
+        return cls(session, ranked_pool(session), picks)
+
+    def _mark_drafted(self, player_id, team_number):
+        self.drafted.add(player_id)
+        entry = self.players.get(player_id)
+        position = entry[2] if entry else None
+        roster = self.rosters.setdefault(team_number, {})
+        roster[position] = roster.get(position, 0) + 1
+        self.team_players.setdefault(team_number, []).append(player_id)
+
+    def _top(self, position):
+        """(rank, player_id) of the best undrafted player at a position"""
+        heap = self.heaps.get(position)
+        while heap and heap[0][1] in self.drafted:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def best_available(self, team_number):
+        """
+        Best undrafted player for a team: the top of the ranking among
+        positions still under POSITION_LIMITS, else the top overall.
+
+        Returns:
+            Player ID, or None when the pool is exhausted
+        """
+        roster = self.rosters.get(team_number, {})
+        tops = {position: self._top(position) for position in self.heaps}
+        open_tops = [
+            top
+            for position, top in tops.items()
+            if top and roster.get(position, 0) < POSITION_LIMITS.get(position, 0)
+        ]
+        candidates = open_tops or [top for top in tops.values() if top]
+        if not candidates:
+            return None
+        return min(candidates)[1]
+
+    def auto_pick_until_user(self) -> list:
+        """
+        AI picks until it's the user's turn or the draft is complete.
+
+        Returns:
+            Unsaved-then-bulk-created DraftPicks, with .player populated
+            from the pool (no per-pick queries)
+        """
+        session = self.session
+        picks = []
+        while session.current_pick <= session.total_picks:
+            current_team = session.get_team_for_pick(session.current_pick)
+            if current_team == session.user_team_position:
+                break
+
+            player_id = self.best_available(current_team)
+            if player_id is None:
+                break
+            self._mark_drafted(player_id, current_team)
+
+            entry = self.players[player_id]
+            picks.append(
+                DraftPick(
+                    session=session,
+                    player=Player(id=player_id, name=entry[1], position=entry[2]),
+                    team_number=current_team,
+                    round_number=(session.current_pick - 1) // session.num_teams + 1,
+                    overall_pick=session.current_pick,
+                    is_user=False,
+                )
+            )
+            session.current_pick += 1
+            session.current_round = (session.current_pick - 1) // session.num_teams + 1
+
+        if session.current_pick > session.total_picks:
+            session.status = "completed"
+
+        rows = [board_row(pick, *self.players[pick.player_id][4:6]) for pick in picks]
+        with transaction.atomic():
+            DraftPick.objects.bulk_create(picks)
+            session.save(update_fields=["current_pick", "current_round", "status"])
+            # The board only sees picks that were actually saved
+            transaction.on_commit(lambda: append_picks(session.id, rows))
+        return picks
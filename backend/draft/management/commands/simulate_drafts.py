@@ -0,0 +1,105 @@
+"""
+Django Management Command: Simulate Drafts
+
+Runs Monte Carlo mock drafts (see draft/simulator.py) across a process pool
+and stores the ADP result under the key /api/draft/adp/ reads, so the live
+draft UI serves the larger run until stats change.
+
+Usage:
+    python manage.py simulate_drafts
+    python manage.py simulate_drafts --teams 12 --rounds 16 --scoring HALF
+    python manage.py simulate_drafts --drafts 20000 --noise 3 --workers 8
+"""
+
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from draft.simulator import DEFAULT_NOISE, adp_cache_key, compute_adp, noise_level
+from stats.scoring import FORMAT_COLUMNS
+
+
+class Command(BaseCommand):
+    help = "Simulate mock drafts and cache average draft positions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--teams", type=int, default=10, help="Teams per draft (default: 10)"
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=15, help="Rounds per draft (default: 15)"
+        )
+        parser.add_argument(
+            "--scoring",
+            type=str.upper,
+            choices=list(FORMAT_COLUMNS),
+            default="PPR",
+            help="Scoring format (default: PPR)",
+        )
+        parser.add_argument(
+            "--noise",
+            type=float,
+            default=DEFAULT_NOISE,
+            help=(
+                "Std dev of each pick's valuation error, rounded to whole points "
+                f"like the API's (default: {DEFAULT_NOISE})"
+            ),
+        )
+        parser.add_argument(
+            "--drafts",
+            type=int,
+            default=10000,
+            help="Drafts to simulate (default: 10000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes (default: CPU count)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Random seed for a repeatable run"
+        )
+        parser.add_argument(
+            "--top", type=int, default=20, help="Players to print (default: 20)"
+        )
+
+    def handle(self, *args, **options):
+        options["noise"] = noise_level(options["noise"])
+        start = time.perf_counter()
+        try:
+            result = compute_adp(
+                options["scoring"],
+                options["teams"],
+                options["rounds"],
+                num_drafts=options["drafts"],
+                noise=options["noise"],
+                workers=options["workers"],
+                seed=options["seed"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        key = adp_cache_key(
+            options["scoring"], options["teams"], options["rounds"], options["noise"]
+        )
+        cache.set(key, result, settings.CACHE_TTL["draft"])
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"{options['drafts']} drafts, {options['teams']} teams x "
+                f"{options['rounds']} rounds ({options['scoring']}) in {elapsed:.1f}s"
+            )
+        )
+        for player in result["players"][: options["top"]]:
+            self.stdout.write(
+                f"  {player['adp']:6.1f}  {player['position']:<3} {player['name']:<28}"
+                f"drafted {player['drafted_pct']:5.1f}%  in runs {player['run_pct']:5.1f}%"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Cached ADP for {len(result['players'])} players")
+        )
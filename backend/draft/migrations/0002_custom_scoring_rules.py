@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("draft", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="scoring_rules",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="draftsession",
+            name="scoring_format",
+            field=models.CharField(
+                choices=[
+                    ("PPR", "PPR"),
+                    ("HALF", "Half PPR"),
+                    ("STD", "Standard"),
+                    ("CUSTOM", "Custom"),
+                ],
+                default="PPR",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 
 from players.models import Player
+from stats.scoring import CUSTOM_FORMAT, ScoringRules
 
 
 class DraftSession(models.Model):
@@ -8,6 +9,7 @@ class DraftSession(models.Model):
         ("PPR", "PPR"),
         ("HALF", "Half PPR"),
         ("STD", "Standard"),
+        ("CUSTOM", "Custom"),
     ]
     STATUS_CHOICES = [
         ("setup", "Setup"),
@@ -24,12 +26,21 @@ class DraftSession(models.Model):
     scoring_format = models.CharField(
         max_length=10, choices=SCORING_CHOICES, default="PPR"
     )
+    # stats.scoring.ScoringRules.to_dict() for CUSTOM drafts
+    scoring_rules = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     @property
     def total_picks(self):
         return self.num_teams * self.num_rounds
 
+    @property
+    def scoring(self):
+        """ScoringRules for CUSTOM drafts, else the built-in format name"""
+        if self.scoring_format == CUSTOM_FORMAT:
+            return ScoringRules.from_dict(self.scoring_rules or {})
+        return self.scoring_format
+
     def get_team_for_pick(self, overall_pick):
         """Snake draft order: odd rounds 1->N, even rounds N->1"""
         round_num = (overall_pick - 1) // self.num_teams + 1
@@ -0,0 +1,224 @@
+"""
+Pick Recommendations
+
+What the user should take on their turn, looking ahead to their next one.
+
+HOW IT WORKS:
+-------------
+- Value over replacement (VOR): a player's points minus those of the
+  first non-starter at the same position league-wide (the player ranked
+  num_teams x starters), so a 20-point TE isn't compared raw to a
+  20-point WR when TEs run out sooner
+- The top CANDIDATES by VOR are each evaluated with rollouts: the candidate
+  is removed from the pool, opponents draft until the user's next turn
+  (simulator.advance_drafts, all rollouts in lockstep), and the user then
+  takes whichever available player adds the most to their lineup
+- Expected roster value = starting lineup points with the candidate, plus
+  the mean lineup gain of that next pick. Rollouts run in chunks until
+  TIME_BUDGET_MS is spent, so the response time is bounded however deep
+  the pool is
+- Scarcity: how many points the best player at a position is expected to
+  lose before the user's next turn
+"""
+
+import time
+
+import numpy as np
+
+from .engine import DraftEngine
+from .simulator import DEFAULT_NOISE, POSITIONS, advance_drafts
+
+# Starting lineup, as in best_team: QB, 2 RB, 2 WR, TE + one RB/WR/TE flex
+STARTERS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1}
+FLEX_POSITIONS = ("RB", "WR", "TE")
+
+TIME_BUDGET_MS = 200
+CANDIDATES = 8  # Players evaluated with rollouts
+ROLLOUT_CHUNK = 16  # Rollouts per candidate per chunk
+MAX_ROLLOUTS = 512  # Per candidate
+
+
+def _lineup(by_position):
+    """
+    Starting lineup of a roster.
+
+    Args:
+        by_position: {position: [points]}
+
+    Returns:
+        (lineup points, {position: weakest starter (0 if a slot is open)},
+        flex points)
+    """
+    total = 0.0
+    weakest = {}
+    bench = []
+    for position, slots in STARTERS.items():
+        points = sorted(by_position.get(position, []), reverse=True)
+        starters = points[:slots]
+        total += sum(starters)
+        weakest[position] = starters[-1] if len(starters) == slots else 0.0
+        if position in FLEX_POSITIONS:
+            bench.extend(points[slots:])
+    flex = max(bench, default=0.0)
+    return total + flex, weakest, flex
+
+
+def _lineup_gain(points, position, weakest, flex):
+    """
+    Lineup points added by one more player, vectorized over `points`.
+
+    A player better than the weakest starter takes that slot, and whichever
+    of the two is left over can still take the flex spot.
+    """
+    gain = np.maximum(points - weakest, 0.0)
+    if position in FLEX_POSITIONS:
+        gain += np.maximum(np.minimum(points, weakest) - flex, 0.0)
+    return gain
+
+
+def next_user_pick(session):
+    """Overall number of the user's pick after the current one (None if last)"""
+    for overall_pick in range(session.current_pick + 1, session.total_picks + 1):
+        if session.get_team_for_pick(overall_pick) == session.user_team_position:
+            return overall_pick
+    return None
+
+
+def recommend(session, top=5, budget_ms=TIME_BUDGET_MS, noise=DEFAULT_NOISE):
+    """
+    Best picks for the user's current turn.
+
+    Args:
+        session: DraftSession on the user's turn
+        top: Recommendations to return (at most CANDIDATES)
+        budget_ms: Time budget for the whole call; at least one chunk of
+            rollouts always runs
+
+    Returns:
+        {"next_pick", "rollouts", "elapsed_ms", "recommendations": [{
+        "player_id", "avg_fpts", "vor", "scarcity", "expected_roster_value"}]}
+        best first
+    """
+    start = time.perf_counter()
+    deadline = start + budget_ms / 1000
+    engine = DraftEngine.load(session)
+    user = session.user_team_position
+
+    pool = list(engine.players.values())
+    ids = [entry[0] for entry in pool]
+    values = np.array([entry[3] for entry in pool], dtype=np.float32)
+    positions = np.array([POSITIONS.index(entry[2]) for entry in pool])
+    available = np.array([player_id not in engine.drafted for player_id in ids])
+
+    # VOR against the first non-starter at each position over the whole pool
+    replacement = np.zeros(len(POSITIONS), dtype=np.float32)
+    for index, position in enumerate(POSITIONS):
+        ranked = np.sort(values[positions == index])[::-1]
+        depth = session.num_teams * STARTERS[position]
+        replacement[index] = ranked[depth] if depth < len(ranked) else 0.0
+    vor = values - replacement[positions]
+
+    open_indices = np.flatnonzero(available)
+    candidates = open_indices[np.argsort(-vor[open_indices], kind="stable")][
+        :CANDIDATES
+    ]
+
+    roster = {}
+    for player_id in engine.team_players.get(user, []):
+        entry = engine.players.get(player_id)
+        if entry:
+            roster.setdefault(entry[2], []).append(entry[3])
+    lineups = []
+    for index in candidates:
+        position = POSITIONS[positions[index]]
+        with_candidate = {
+            **roster,
+            position: [*roster.get(position, []), values[index]],
+        }
+        lineups.append(_lineup(with_candidate))
+
+    next_pick = next_user_pick(session)
+    order = np.array(
+        [
+            session.get_team_for_pick(overall_pick) - 1
+            for overall_pick in range(session.current_pick + 1, next_pick or 0)
+        ],
+        dtype=np.int64,
+    )
+    counts = np.zeros((session.num_teams, len(POSITIONS)), dtype=np.int16)
+    for team, by_position in engine.rosters.items():
+        for position, count in by_position.items():
+            if team <= session.num_teams and position in POSITIONS:
+                counts[team - 1, POSITIONS.index(position)] = count
+
+    num_candidates = len(candidates)
+    gain_sums = np.zeros(num_candidates)
+    best_sums = np.zeros(len(POSITIONS))
+    rollouts = 0
+    rng = np.random.default_rng()
+    chunk_seconds = 0.0
+    while next_pick and num_candidates and rollouts < MAX_ROLLOUTS:
+        chunk_start = time.perf_counter()
+        if rollouts and chunk_start + chunk_seconds > deadline:
+            break
+
+        rows = num_candidates * ROLLOUT_CHUNK
+        state = np.repeat(available[None, :], rows, axis=0)
+        state[np.arange(rows), np.repeat(candidates, ROLLOUT_CHUNK)] = False
+        team_counts = np.repeat(counts[None, :, :], rows, axis=0)
+        advance_drafts(values, positions, order, state, team_counts, noise, rng)
+
+        # Best player left at each position when the user picks again
+        best = np.stack(
+            [
+                np.where(state & (positions == index), values, 0.0).max(axis=1)
+                for index in range(len(POSITIONS))
+            ]
+        ).reshape(len(POSITIONS), num_candidates, ROLLOUT_CHUNK)
+        best_sums += best.sum(axis=(1, 2))
+        for c, (_, weakest, flex) in enumerate(lineups):
+            gains = [
+                _lineup_gain(best[index, c], position, weakest[position], flex)
+                for index, position in enumerate(POSITIONS)
+            ]
+            gain_sums[c] += np.max(gains, axis=0).sum()
+
+        rollouts += ROLLOUT_CHUNK
+        chunk_seconds = time.perf_counter() - chunk_start
+
+    best_now = [
+        values[available & (positions == index)].max(initial=0.0)
+        for index in range(len(POSITIONS))
+    ]
+    scarcity = [
+        (
+            best_now[index] - best_sums[index] / (rollouts * num_candidates)
+            if rollouts
+            else 0.0
+        )
+        for index in range(len(POSITIONS))
+    ]
+
+    recommendations = []
+    for c, index in enumerate(candidates):
+        lineup_points = lineups[c][0]
+        expected = lineup_points + (gain_sums[c] / rollouts if rollouts else 0.0)
+        recommendations.append(
+            {
+                "player_id": ids[index],
+                "avg_fpts": round(float(values[index]), 1),
+                "vor": round(float(vor[index]), 1),
+                "scarcity": round(float(scarcity[positions[index]]), 1),
+                "expected_roster_value": round(float(expected), 1),
+            }
+        )
+    recommendations.sort(
+        key=lambda rec: (rec["expected_roster_value"], rec["vor"]), reverse=True
+    )
+
+    return {
+        "next_pick": next_pick,
+        "rollouts": rollouts,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "recommendations": recommendations[:top],
+    }
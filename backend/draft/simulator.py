@@ -0,0 +1,282 @@
+"""
+Monte Carlo Mock Drafts
+
+Average draft position (ADP) for the live draft UI, from thousands of
+simulated snake drafts instead of one interactive session at a time.
+
+HOW IT WORKS:
+-------------
+- The ranked pool (DraftAI.get_ranked_players) becomes a value array and a
+  position-index array, trimmed to twice the number of picks (players
+  further down are never reached)
+- A batch of drafts runs in lockstep: at each pick, every draft's team
+  scores every player as value + noise * N(0, 1), drafted players and
+  positions at POSITION_LIMITS are masked out, and argmax picks. So one
+  pick of 1,000 drafts is one (1000 x players) NumPy operation
+- Batches are independent (own seeded generator), so simulate_drafts()
+  spreads them across a process pool
+- summarize() turns the (drafts x picks) matrix into ADP, round
+  distribution and how often each player went during a positional run
+
+cached_adp() reads results cached per (format, teams, rounds, noise) until
+the stats change. A miss is simulated by a Celery task (draft.tasks), never
+inside the request; `manage.py simulate_drafts` fills the same key with a
+larger run. Noise is rounded to whole points so the keys form a small fixed
+grid.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.core.cache import cache
+
+from api.cache_utils import ALL_STATS_TAG, versioned_key
+
+from .engine import POSITION_LIMITS
+from .models import DraftSession
+from .services import DraftAI
+
+POSITIONS = ("QB", "RB", "WR", "TE")
+RUN_LENGTH = 3  # Consecutive picks at one position that count as a run
+DEFAULT_NOISE = 2.0  # Std dev of a team's valuation error, fantasy points
+MAX_NOISE = 20.0
+DEFAULT_DRAFTS = 1000
+BATCH_SIZE = 250
+
+
+def player_pool(scoring, total_picks) -> dict:
+    """
+    Ranked pool as parallel arrays.
+
+    Args:
+        scoring: Built-in scoring format (PPR, HALF, STD)
+        total_picks: Picks per draft; the pool is trimmed to twice this
+
+    Raises:
+        ValueError: Fewer players than picks
+    """
+    session = DraftSession(scoring_format=scoring)
+    players = list(
+        DraftAI.get_ranked_players(session).values(
+            "id", "name", "position", "team__abbreviation", "avg_fpts"
+        )[: total_picks * 2]
+    )
+    if len(players) < total_picks:
+        raise ValueError(
+            f"Only {len(players)} ranked players for {total_picks} picks per draft"
+        )
+    return {
+        "ids": [p["id"] for p in players],
+        "names": [p["name"] for p in players],
+        "teams": [p["team__abbreviation"] for p in players],
+        "positions": np.array([POSITIONS.index(p["position"]) for p in players]),
+        "values": np.array([p["avg_fpts"] or 0.0 for p in players]),
+    }
+
+
+def snake_order(num_teams, num_rounds) -> np.ndarray:
+    """0-based team index for each pick of a snake draft"""
+    order = np.tile(np.arange(num_teams), (num_rounds, 1))
+    order[1::2] = order[1::2, ::-1]
+    return order.ravel()
+
+
+def advance_drafts(values, positions, order, available, counts, noise, rng):
+    """
+    Make the picks in `order` in every draft row, updating state in place.
+
+    Args:
+        values: float32 points per player, pool order
+        positions: POSITIONS index per player
+        order: 0-based team index of each pick to make
+        available: (rows, players) bool, cleared as players go
+        counts: (rows, teams, positions) roster counts, incremented
+        rng: numpy Generator for the valuation noise
+
+    Returns:
+        (rows, len(order)) array of pool indices in pick order
+    """
+    limits = np.array([POSITION_LIMITS.get(pos, 0) for pos in POSITIONS])
+    num_rows = available.shape[0]
+    rows = np.arange(num_rows)
+    picks = np.empty((num_rows, len(order)), dtype=np.int32)
+    for pick, team in enumerate(order):
+        allowed = available & (counts[:, team, :] < limits)[:, positions]
+        # Every open position is full: best available regardless of limits
+        full = ~allowed.any(axis=1)
+        allowed[full] = available[full]
+
+        scores = rng.standard_normal((num_rows, len(values)), dtype=np.float32)
+        scores *= noise
+        scores += values
+        choice = np.where(allowed, scores, -np.inf).argmax(axis=1)
+
+        picks[:, pick] = choice
+        available[rows, choice] = False
+        counts[rows, team, positions[choice]] += 1
+    return picks
+
+
+def _simulate_batch(values, positions, num_teams, num_rounds, num_drafts, noise, seed):
+    """
+    Run num_drafts drafts in lockstep.
+
+    Returns:
+        (num_drafts, picks) array of pool indices in pick order
+    """
+    available = np.ones((num_drafts, len(values)), dtype=bool)
+    counts = np.zeros((num_drafts, num_teams, len(POSITIONS)), dtype=np.int16)
+    return advance_drafts(
+        values.astype(np.float32),
+        positions,
+        snake_order(num_teams, num_rounds),
+        available,
+        counts,
+        noise,
+        np.random.default_rng(seed),
+    )
+
+
+def simulate_drafts(
+    values,
+    positions,
+    num_teams,
+    num_rounds,
+    num_drafts=DEFAULT_DRAFTS,
+    noise=DEFAULT_NOISE,
+    workers=1,
+    seed=None,
+) -> np.ndarray:
+    """
+    Simulate num_drafts snake drafts.
+
+    Args:
+        values: Points per player, pool order
+        positions: POSITIONS index per player
+        workers: Processes to spread batches across (1 = run in-process)
+        seed: Seed for reproducible runs
+
+    Returns:
+        (num_drafts, num_teams * num_rounds) array of pool indices
+    """
+    sizes = [BATCH_SIZE] * (num_drafts // BATCH_SIZE)
+    if num_drafts % BATCH_SIZE:
+        sizes.append(num_drafts % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (values, positions, num_teams, num_rounds, size, noise, batch_seed)
+        for size, batch_seed in zip(sizes, seeds)
+    ]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_simulate_batch, *zip(*args)))
+    else:
+        batches = [_simulate_batch(*batch) for batch in args]
+    return np.concatenate(batches)
+
+
+def summarize(picks, pool, num_teams) -> list:
+    """
+    Per-player results of a simulation, by ADP.
+
+    Returns:
+        [{"id", "name", "position", "team", "avg_fpts", "adp", "drafted_pct",
+        "rounds", "run_pct"}] for every player drafted at least once.
+        "rounds" is the share of drafts the player went in each round (%);
+        "run_pct" the share of their selections made during a run of
+        RUN_LENGTH+ picks at their position
+    """
+    num_drafts, num_picks = picks.shape
+    num_rounds = num_picks // num_teams
+    size = len(pool["values"])
+
+    players = picks.ravel()
+    pick_numbers = np.tile(np.arange(1, num_picks + 1), num_drafts)
+    drafted = np.bincount(players, minlength=size)
+    pick_sums = np.bincount(players, weights=pick_numbers, minlength=size)
+    rounds = np.zeros((size, num_rounds))
+    np.add.at(rounds, (players, (pick_numbers - 1) // num_teams), 1)
+
+    # Runs: label each stretch of same-position picks, then look up its length
+    pick_positions = pool["positions"][picks]
+    starts = np.ones(picks.shape, dtype=bool)
+    starts[:, 1:] = pick_positions[:, 1:] != pick_positions[:, :-1]
+    run_ids = np.cumsum(starts.ravel()) - 1
+    in_run = np.bincount(run_ids)[run_ids] >= RUN_LENGTH
+    run_picks = np.bincount(players, weights=in_run, minlength=size)
+
+    results = []
+    for index in np.flatnonzero(drafted):
+        count = drafted[index]
+        results.append(
+            {
+                "id": pool["ids"][index],
+                "name": pool["names"][index],
+                "position": POSITIONS[pool["positions"][index]],
+                "team": pool["teams"][index],
+                "avg_fpts": round(float(pool["values"][index]), 1),
+                "adp": round(pick_sums[index] / count, 1),
+                "drafted_pct": round(count / num_drafts * 100, 1),
+                "rounds": [round(n / num_drafts * 100, 1) for n in rounds[index]],
+                "run_pct": round(run_picks[index] / count * 100, 1),
+            }
+        )
+    results.sort(key=lambda player: player["adp"])
+    return results
+
+
+def compute_adp(
+    scoring,
+    num_teams,
+    num_rounds,
+    num_drafts=DEFAULT_DRAFTS,
+    noise=DEFAULT_NOISE,
+    workers=1,
+    seed=None,
+) -> dict:
+    """
+    Simulate drafts from the current rankings and summarize them.
+
+    Raises:
+        ValueError: Not enough ranked players to fill the drafts
+    """
+    pool = player_pool(scoring, num_teams * num_rounds)
+    picks = simulate_drafts(
+        pool["values"],
+        pool["positions"],
+        num_teams,
+        num_rounds,
+        num_drafts=num_drafts,
+        noise=noise,
+        workers=workers,
+        seed=seed,
+    )
+    return {
+        "scoring_format": scoring,
+        "num_teams": num_teams,
+        "num_rounds": num_rounds,
+        "noise": noise,
+        "drafts": num_drafts,
+        "players": summarize(picks, pool, num_teams),
+    }
+
+
+def noise_level(noise) -> float:
+    """Noise rounded to the whole point ADP is simulated and cached at"""
+    return float(round(noise))
+
+
+def adp_cache_key(scoring, num_teams, num_rounds, noise):
+    return versioned_key(
+        f"draft_adp_{scoring}_{num_teams}_{num_rounds}_{noise_level(noise)}",
+        [ALL_STATS_TAG],
+    )
+
+
+def cached_adp(scoring, num_teams, num_rounds, noise=DEFAULT_NOISE):
+    """
+    The cached run at noise_level(noise): a compute_adp() result, {"error"}
+    if the pool was too small, or None if it hasn't been simulated yet.
+    """
+    return cache.get(adp_cache_key(scoring, num_teams, num_rounds, noise))
@@ -0,0 +1,106 @@
+"""
+Streaming Draft Picks (Server-Sent Events)
+
+POST /api/draft/<id>/pick/stream/ is the streaming variant of
+/api/draft/<id>/pick/: the user's pick is saved the same way, then each AI
+pick up to the user's next turn goes out as its own `pick` event, followed
+by a `done` event with the session state. The board can animate pick by
+pick instead of waiting for the whole batch.
+
+- It's a plain async Django view, served through asgi.py: events are
+  written as they are yielded, without holding a worker thread per stream
+- The user's pick and the AI turn are saved in one transaction
+  (views.take_turn) before the first event, so neither a failure nor a
+  dropped connection leaves a half-saved turn. Clients that reconnect
+  catch up with /api/draft/<id>/board/?since_pick=N
+- ?interval_ms=N spaces the events out for the UI (capped at 2s)
+- Not being a DRF view, it applies DRF's default throttles itself, sharing
+  /pick/'s rate limit
+
+    event: pick
+    data: {"overall_pick": 2, "team_number": 2, "player_name": ...}
+
+    event: done
+    data: {"status": "active", "current_pick": 20, "current_round": 2}
+"""
+
+import asyncio
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .views import ai_pick_data, take_turn
+
+MAX_INTERVAL_MS = 2000
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _throttle_wait(request):
+    """
+    Check DEFAULT_THROTTLE_CLASSES the way APIView.check_throttles does.
+
+    Returns:
+        None if the request is allowed, else seconds until it would be
+    """
+    drf_request = Request(request)
+    waits = [
+        throttle.wait()
+        for throttle in (cls() for cls in api_settings.DEFAULT_THROTTLE_CLASSES)
+        if not throttle.allow_request(drf_request, None)
+    ]
+    if not waits:
+        return None
+    return max((wait for wait in waits if wait is not None), default=0)
+
+
+async def pick_stream(request, pk):
+    """User pick, then the AI picks as server-sent events."""
+    if request.method != "POST":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    wait = await sync_to_async(_throttle_wait)(request)
+    if wait is not None:
+        response = JsonResponse({"error": "Request was throttled"}, status=429)
+        response["Retry-After"] = str(math.ceil(wait))
+        return response
+
+    try:
+        data = json.loads(request.body or b"{}")
+        interval_ms = int(request.GET.get("interval_ms", 0))
+    except ValueError:
+        return JsonResponse({"error": "Invalid request"}, status=400)
+    interval = max(0, min(interval_ms, MAX_INTERVAL_MS)) / 1000
+
+    session, ai_picks, error = await sync_to_async(take_turn)(pk, data.get("player_id"))
+    if error:
+        return JsonResponse({"error": error[0]}, status=error[1])
+
+    async def events():
+        for index, pick in enumerate(ai_picks):
+            if index and interval:
+                await asyncio.sleep(interval)
+            yield _event("pick", ai_pick_data(pick))
+        yield _event(
+            "done",
+            {
+                "status": session.status,
+                "current_pick": session.current_pick,
+                "current_round": session.current_round,
+            },
+        )
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Don't let a proxy batch the events
+    return response
+
+
+# Not a DRF view, so exempt it from CSRF the way APIView does
+pick_stream.csrf_exempt = True
@@ -0,0 +1,50 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+
+from .simulator import adp_cache_key, compute_adp, noise_level
+
+logger = logging.getLogger(__name__)
+
+"""
+============================================
+Background ADP Simulations
+============================================
+"""
+
+# Lets a simulation whose worker died be queued again
+PENDING_TIMEOUT = 5 * 60
+
+
+def _pending_key(scoring, num_teams, num_rounds, noise):
+    return f"{adp_cache_key(scoring, num_teams, num_rounds, noise)}:pending"
+
+
+def request_adp(scoring, num_teams, num_rounds, noise):
+    # Queue simulate_adp for a missing run, unless a request already has
+    noise = noise_level(noise)
+    if cache.add(
+        _pending_key(scoring, num_teams, num_rounds, noise), True, PENDING_TIMEOUT
+    ):
+        simulate_adp.delay(scoring, num_teams, num_rounds, noise)
+
+
+@shared_task
+def simulate_adp(scoring, num_teams, num_rounds, noise):
+    # Cache compute_adp() under the key /api/draft/adp/ reads. A pool too
+    # small for the drafts is cached as the error the endpoint returns
+    key = adp_cache_key(scoring, num_teams, num_rounds, noise)
+    try:
+        try:
+            result = compute_adp(scoring, num_teams, num_rounds, noise=noise)
+        except ValueError as e:
+            result = {"error": str(e)}
+        cache.set(key, result, settings.CACHE_TTL["draft"])
+        logger.info(
+            f"Simulated ADP for {scoring} {num_teams}x{num_rounds} at noise {noise}"
+        )
+        return result.get("error", "ADP simulated")
+    finally:
+        cache.delete(_pending_key(scoring, num_teams, num_rounds, noise))
@@ -1,11 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import streaming, views
 
 router = DefaultRouter()
 router.register(r"", views.DraftViewSet, basename="draft")
 
 urlpatterns = [
+    path("<int:pk>/pick/stream/", streaming.pick_stream, name="draft-pick-stream"),
     path("", include(router.urls)),
 ]
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import Avg
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -5,9 +6,97 @@ from rest_framework.response import Response
 
 from players.models import Player
 from stats.models import FootballPlayerGameStat
+from stats.scoring import CUSTOM_FORMAT, FORMAT_COLUMNS, ScoringRules, fantasy_points
 
+from .board import append_picks, board_row, board_rows, expand_row
+from .engine import DraftEngine, ranked_pool
 from .models import DraftPick, DraftSession
+from .recommendations import CANDIDATES, TIME_BUDGET_MS, recommend
 from .services import DraftAI
+from .simulator import DEFAULT_NOISE, MAX_NOISE, cached_adp
+from .tasks import request_adp
+
+ADP_RETRY_AFTER = 5  # Seconds a client waits before polling a pending ADP run
+
+
+def record_user_pick(pk, player_id):
+    """
+    Validate and save the user's pick; the session is advanced but not saved.
+    Call inside a transaction (take_turn): the session row stays locked
+    until the turn is saved.
+
+    Returns:
+        (session, None), or (None, (error message, HTTP status))
+    """
+    try:
+        session = DraftSession.objects.select_for_update().get(pk=pk)
+    except DraftSession.DoesNotExist:
+        return None, ("Session not found", status.HTTP_404_NOT_FOUND)
+
+    if session.status != "active":
+        return None, ("Draft is not active", status.HTTP_400_BAD_REQUEST)
+
+    if not player_id:
+        return None, ("player_id is required", status.HTTP_400_BAD_REQUEST)
+
+    # Verify it's the user's turn
+    current_team = session.get_team_for_pick(session.current_pick)
+    if current_team != session.user_team_position:
+        return None, ("Not your turn", status.HTTP_400_BAD_REQUEST)
+
+    # Verify player is available
+    try:
+        player = Player.objects.select_related("team").get(pk=player_id)
+    except Player.DoesNotExist:
+        return None, ("Player not found", status.HTTP_404_NOT_FOUND)
+
+    if session.picks.filter(player=player).exists():
+        return None, ("Player already drafted", status.HTTP_400_BAD_REQUEST)
+
+    # Make the user's pick
+    round_num = (session.current_pick - 1) // session.num_teams + 1
+    pick = DraftPick.objects.create(
+        session=session,
+        player=player,
+        team_number=session.user_team_position,
+        round_number=round_num,
+        overall_pick=session.current_pick,
+        is_user=True,
+    )
+    row = board_row(
+        pick, player.team.abbreviation if player.team else None, player.image_url
+    )
+    transaction.on_commit(lambda: append_picks(session.id, [row]))
+
+    session.current_pick += 1
+    session.current_round = (session.current_pick - 1) // session.num_teams + 1
+    return session, None
+
+
+def take_turn(pk, player_id):
+    """
+    The user's pick and the AI picks up to their next turn, saved in one
+    transaction: a failure part-way leaves the session as it was.
+
+    Returns:
+        (session, AI picks, None), or (None, None, (error message, HTTP status))
+    """
+    with transaction.atomic():
+        session, error = record_user_pick(pk, player_id)
+        if error:
+            return None, None, error
+        return session, DraftEngine.load(session).auto_pick_until_user(), None
+
+
+def ai_pick_data(pick):
+    return {
+        "overall_pick": pick.overall_pick,
+        "round_number": pick.round_number,
+        "team_number": pick.team_number,
+        "player_id": pick.player_id,
+        "player_name": pick.player.name,
+        "player_position": pick.player.position,
+    }
 
 
 class DraftViewSet(viewsets.ViewSet):
@@ -19,25 +108,38 @@ class DraftViewSet(viewsets.ViewSet):
         num_teams = int(request.data.get("num_teams", 10))
         num_rounds = int(request.data.get("num_rounds", 15))
         user_team_position = int(request.data.get("user_team_position", 1))
-        scoring_format = request.data.get("scoring_format", "PPR")
+        scoring_format = str(request.data.get("scoring_format", "PPR")).upper()
+        scoring_rules = None
 
         if not 1 <= user_team_position <= num_teams:
             return Response(
                 {"error": "user_team_position must be between 1 and num_teams"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if scoring_format == CUSTOM_FORMAT:
+            try:
+                rules = ScoringRules.from_dict(request.data.get("scoring_rules"))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            scoring_rules = rules.to_dict()
+        elif scoring_format not in FORMAT_COLUMNS:
+            return Response(
+                {"error": "scoring_format must be one of PPR, HALF, STD or CUSTOM"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        session = DraftSession.objects.create(
-            num_teams=num_teams,
-            num_rounds=num_rounds,
-            user_team_position=user_team_position,
-            scoring_format=scoring_format,
-            status="active",
-        )
+        with transaction.atomic():
+            session = DraftSession.objects.create(
+                num_teams=num_teams,
+                num_rounds=num_rounds,
+                user_team_position=user_team_position,
+                scoring_format=scoring_format,
+                scoring_rules=scoring_rules,
+                status="active",
+            )
 
-        # Auto-pick AI turns before user's first pick
-        DraftAI.auto_pick_until_user(session)
-        session.refresh_from_db()
+            # Auto-pick AI turns before user's first pick
+            DraftEngine.load(session).auto_pick_until_user()
 
         return Response(
             {
@@ -51,88 +153,69 @@ class DraftViewSet(viewsets.ViewSet):
             status=status.HTTP_201_CREATED,
         )
 
-    @action(detail=True, methods=["post"], url_path="pick")
-    def make_pick(self, request, pk=None):
-        """User makes a pick, then AI auto-advances until user's next turn."""
-        try:
-            session = DraftSession.objects.get(pk=pk)
-        except DraftSession.DoesNotExist:
-            return Response(
-                {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        if session.status != "active":
-            return Response(
-                {"error": "Draft is not active"}, status=status.HTTP_400_BAD_REQUEST
-            )
+    @action(detail=False, methods=["get"], url_path="adp")
+    def adp(self, request):
+        """
+        Average draft position from simulated mock drafts.
 
-        player_id = request.data.get("player_id")
-        if not player_id:
+        Runs that aren't cached yet are simulated in the background: the
+        response is 202 with Retry-After until the result is ready.
+        """
+        try:
+            num_teams = int(request.query_params.get("num_teams", 10))
+            num_rounds = int(request.query_params.get("num_rounds", 15))
+            noise = float(request.query_params.get("noise", DEFAULT_NOISE))
+        except ValueError:
             return Response(
-                {"error": "player_id is required"}, status=status.HTTP_400_BAD_REQUEST
+                {"error": "num_teams, num_rounds and noise must be numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        scoring_format = request.query_params.get("scoring_format", "PPR").upper()
 
-        # Verify it's the user's turn
-        current_team = session.get_team_for_pick(session.current_pick)
-        if current_team != session.user_team_position:
+        if scoring_format not in FORMAT_COLUMNS:
             return Response(
-                {"error": "Not your turn"}, status=status.HTTP_400_BAD_REQUEST
+                {"error": "scoring_format must be one of PPR, HALF or STD"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-
-        # Verify player is available
-        try:
-            player = Player.objects.get(pk=player_id)
-        except Player.DoesNotExist:
+        if not (
+            2 <= num_teams <= 16 and 1 <= num_rounds <= 20 and 0 <= noise <= MAX_NOISE
+        ):
             return Response(
-                {"error": "Player not found"}, status=status.HTTP_404_NOT_FOUND
+                {"error": "Expected 2-16 teams, 1-20 rounds and noise of 0-20 points"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if session.picks.filter(player=player).exists():
+        result = cached_adp(scoring_format, num_teams, num_rounds, noise)
+        if result is None:
+            request_adp(scoring_format, num_teams, num_rounds, noise)
             return Response(
-                {"error": "Player already drafted"}, status=status.HTTP_400_BAD_REQUEST
+                {"status": "pending"},
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Retry-After": str(ADP_RETRY_AFTER)},
             )
+        if "error" in result:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
 
-        # Make the user's pick
-        round_num = (session.current_pick - 1) // session.num_teams + 1
-        DraftPick.objects.create(
-            session=session,
-            player=player,
-            team_number=session.user_team_position,
-            round_number=round_num,
-            overall_pick=session.current_pick,
-            is_user=True,
-        )
-
-        session.current_pick += 1
-        session.current_round = (session.current_pick - 1) // session.num_teams + 1
-        session.save()
-
-        # AI auto-picks until user's next turn
-        ai_picks = DraftAI.auto_pick_until_user(session)
-        session.refresh_from_db()
+    @action(detail=True, methods=["post"], url_path="pick")
+    def make_pick(self, request, pk=None):
+        """User makes a pick, then AI auto-advances until user's next turn."""
+        session, ai_picks, error = take_turn(pk, request.data.get("player_id"))
+        if error:
+            return Response({"error": error[0]}, status=error[1])
 
         return Response(
             {
                 "status": session.status,
                 "current_pick": session.current_pick,
                 "current_round": session.current_round,
-                "ai_picks": [
-                    {
-                        "overall_pick": p.overall_pick,
-                        "round_number": p.round_number,
-                        "team_number": p.team_number,
-                        "player_id": p.player_id,
-                        "player_name": p.player.name,
-                        "player_position": p.player.position,
-                    }
-                    for p in ai_picks
-                ],
+                "ai_picks": [ai_pick_data(p) for p in ai_picks],
             }
         )
 
     @action(detail=True, methods=["get"], url_path="board")
     def board(self, request, pk=None):
-        """Full draft board state."""
+        """Draft board state; ?since_pick=N returns only picks after N."""
         try:
             session = DraftSession.objects.get(pk=pk)
         except DraftSession.DoesNotExist:
@@ -140,27 +223,16 @@ class DraftViewSet(viewsets.ViewSet):
                 {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        picks = session.picks.select_related("player", "player__team").all()
-        board = []
-        for pick in picks:
-            board.append(
-                {
-                    "overall_pick": pick.overall_pick,
-                    "round_number": pick.round_number,
-                    "team_number": pick.team_number,
-                    "is_user": pick.is_user,
-                    "player": {
-                        "id": pick.player.id,
-                        "name": pick.player.name,
-                        "position": pick.player.position,
-                        "team": (
-                            pick.player.team.abbreviation if pick.player.team else None
-                        ),
-                        "image_url": pick.player.image_url,
-                    },
-                }
+        try:
+            since_pick = int(request.query_params.get("since_pick", 0))
+        except ValueError:
+            return Response(
+                {"error": "since_pick must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
+        board = [expand_row(row) for row in board_rows(session) if row[0] > since_pick]
+
         return Response(
             {
                 "session_id": session.id,
@@ -172,6 +244,8 @@ class DraftViewSet(viewsets.ViewSet):
                 "num_rounds": session.num_rounds,
                 "user_team_position": session.user_team_position,
                 "scoring_format": session.scoring_format,
+                "scoring_rules": session.scoring_rules,
+                "since_pick": since_pick,
                 "picks": board,
             }
         )
@@ -215,6 +289,59 @@ class DraftViewSet(viewsets.ViewSet):
             }
         )
 
+    @action(detail=True, methods=["get"], url_path="recommendations")
+    def recommendations(self, request, pk=None):
+        """Best picks for the user's turn, looking ahead to their next one."""
+        try:
+            session = DraftSession.objects.get(pk=pk)
+        except DraftSession.DoesNotExist:
+            return Response(
+                {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        if session.status != "active":
+            return Response(
+                {"error": "Draft is not active"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if (
+            session.get_team_for_pick(session.current_pick)
+            != session.user_team_position
+        ):
+            return Response(
+                {"error": "Not your turn"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            top = int(request.query_params.get("top", 5))
+            budget_ms = int(request.query_params.get("budget_ms", TIME_BUDGET_MS))
+        except ValueError:
+            return Response(
+                {"error": "top and budget_ms must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        top = max(1, min(top, CANDIDATES))
+        budget_ms = max(0, min(budget_ms, 1000))
+
+        result = recommend(session, top=top, budget_ms=budget_ms)
+        players = Player.objects.select_related("team").in_bulk(
+            [rec["player_id"] for rec in result["recommendations"]]
+        )
+        for rec in result["recommendations"]:
+            p = players[rec.pop("player_id")]
+            rec["player"] = {
+                "id": p.id,
+                "name": p.name,
+                "position": p.position,
+                "team": p.team.abbreviation if p.team else None,
+                "image_url": p.image_url,
+            }
+        return Response(
+            {
+                "current_pick": session.current_pick,
+                **result,
+            }
+        )
+
     @action(detail=True, methods=["get"], url_path="roster")
     def roster(self, request, pk=None):
         """User's roster with projected total."""
@@ -225,33 +352,33 @@ class DraftViewSet(viewsets.ViewSet):
                 {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        picks = session.picks.filter(
-            team_number=session.user_team_position
-        ).select_related("player", "player__team")
+        rows = [
+            row for row in board_rows(session) if row[2] == session.user_team_position
+        ]
+
+        # Projections from the session's ranked pool; players outside it
+        # (no stats when the draft started) in one grouped aggregate
+        projections = {entry[0]: entry[3] for entry in ranked_pool(session)}
+        missing = [row[4] for row in rows if row[4] not in projections]
+        if missing:
+            projections.update(
+                FootballPlayerGameStat.objects.filter(player_id__in=missing)
+                .values("player_id")
+                .annotate(avg=Avg(fantasy_points(session.scoring)))
+                .order_by()
+                .values_list("player_id", "avg")
+            )
 
         roster = []
         total_projected = 0
-        for pick in picks:
-            avg = (
-                FootballPlayerGameStat.objects.filter(player=pick.player).aggregate(
-                    avg=Avg("fantasy_points_ppr")
-                )["avg"]
-                or 0
-            )
-
+        for row in rows:
+            pick = expand_row(row)
+            avg = projections.get(pick["player"]["id"]) or 0
             roster.append(
                 {
-                    "round_number": pick.round_number,
-                    "overall_pick": pick.overall_pick,
-                    "player": {
-                        "id": pick.player.id,
-                        "name": pick.player.name,
-                        "position": pick.player.position,
-                        "team": (
-                            pick.player.team.abbreviation if pick.player.team else None
-                        ),
-                        "image_url": pick.player.image_url,
-                    },
+                    "round_number": pick["round_number"],
+                    "overall_pick": pick["overall_pick"],
+                    "player": pick["player"],
                     "avg_fpts": round(avg, 1),
                 }
             )
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
-from .models import Game
+from .models import Game, TeamGameLog, TeamStanding
 
 admin.site.register(Game)
+admin.site.register(TeamGameLog)
+admin.site.register(TeamStanding)
@@ -3,3 +3,9 @@ STAGE_CHOICES = [
     ("REG", "Regular Season"),
     ("POST", "Post Season"),
 ]
+
+RESULT_CHOICES = [
+    ("W", "Win"),
+    ("L", "Loss"),
+    ("T", "Tie"),
+]
@@ -1,9 +1,19 @@
 import datetime
+from collections import defaultdict
 
 import nflreadpy as nfl
 from django.core.management.base import BaseCommand
 
+from api.cache_utils import (
+    CALENDAR_TAG,
+    game_tag,
+    invalidate_tags,
+    season_tag,
+    team_tag,
+)
 from games.models import Game
+from games.services import refresh_standings, sync_team_game_logs
+from games.signals import deferred_game_sync
 from teams.constants import TEAM_IDS
 from teams.models import Team
 
@@ -36,59 +46,79 @@ class Command(BaseCommand):
         self.stdout.write(f"Found {total_games} games to process")
 
         processed = 0
-        for row in games_df.iter_rows(named=True):
-            game_id = row["game_id"]
-            game_season = row["season"]
-            game_stage = row["game_type"]
-            game_week = row["week"]
-            game_day = row["gameday"].split("-")
-            game_time = row["gametime"]
-            away_team_id = TEAM_IDS.get(row["away_team"])
-            away_score = row["away_score"]
-            home_team_id = TEAM_IDS.get(row["home_team"])
-            home_score = row["home_score"]
-            location = row["location"]
-            total_score = row["total"]
-            overtime = True if row["overtime"] == 1 else False
-            game_roof = row["roof"]
-            game_temp = row["temp"]
-            game_wind = row["wind"]
+        seeded = defaultdict(list)
+        # Logs, standings and cache tags are synced once per season below,
+        # not by the per-game signal handlers
+        with deferred_game_sync():
+            for row in games_df.iter_rows(named=True):
+                game_id = row["game_id"]
+                game_season = row["season"]
+                game_stage = row["game_type"]
+                game_week = row["week"]
+                game_day = row["gameday"].split("-")
+                game_time = row["gametime"]
+                away_team_id = TEAM_IDS.get(row["away_team"])
+                away_score = row["away_score"]
+                home_team_id = TEAM_IDS.get(row["home_team"])
+                home_score = row["home_score"]
+                location = row["location"]
+                total_score = row["total"]
+                overtime = True if row["overtime"] == 1 else False
+                game_roof = row["roof"]
+                game_temp = row["temp"]
+                game_wind = row["wind"]
 
-            # Skip if team not found (e.g., old team abbreviations)
-            if not away_team_id or not home_team_id:
-                continue
+                # Skip if team not found (e.g., old team abbreviations)
+                if not away_team_id or not home_team_id:
+                    continue
 
-            date = datetime.date(int(game_day[0]), int(game_day[1]), int(game_day[2]))
+                date = datetime.date(
+                    int(game_day[0]), int(game_day[1]), int(game_day[2])
+                )
 
-            try:
-                away_team_obj = Team.objects.get(id=away_team_id)
-                home_team_obj = Team.objects.get(id=home_team_id)
-            except Team.DoesNotExist:
-                continue
+                try:
+                    away_team_obj = Team.objects.get(id=away_team_id)
+                    home_team_obj = Team.objects.get(id=home_team_id)
+                except Team.DoesNotExist:
+                    continue
 
-            Game.objects.update_or_create(
-                id=game_id,
-                defaults={
-                    "season": game_season,
-                    "week": game_week,
-                    "time": game_time,
-                    "date": date,
-                    "away_team": away_team_obj,
-                    "home_team": home_team_obj,
-                    "stage": game_stage,
-                    "away_score": away_score,
-                    "home_score": home_score,
-                    "total_score": total_score,
-                    "overtime": overtime,
-                    "location": location,
-                    "roof": game_roof,
-                    "temp": game_temp,
-                    "wind": game_wind,
-                },
-            )
+                game, _ = Game.objects.update_or_create(
+                    id=game_id,
+                    defaults={
+                        "season": game_season,
+                        "week": game_week,
+                        "time": game_time,
+                        "date": date,
+                        "away_team": away_team_obj,
+                        "home_team": home_team_obj,
+                        "stage": game_stage,
+                        "away_score": away_score,
+                        "home_score": home_score,
+                        "total_score": total_score,
+                        "overtime": overtime,
+                        "location": location,
+                        "roof": game_roof,
+                        "temp": game_temp,
+                        "wind": game_wind,
+                    },
+                )
+
+                seeded[game_season].append(game)
+                processed += 1
+                if processed % 100 == 0:
+                    self.stdout.write(f"Processed {processed}/{total_games} games...")
 
-            processed += 1
-            if processed % 100 == 0:
-                self.stdout.write(f"Processed {processed}/{total_games} games...")
+        for season, games in seeded.items():
+            sync_team_game_logs(games)
+            refresh_standings([season])
+            team_ids = {game.home_team_id for game in games} | {
+                game.away_team_id for game in games
+            }
+            invalidate_tags(
+                CALENDAR_TAG,
+                season_tag(season),
+                *(game_tag(game.id) for game in games),
+                *(team_tag(team_id) for team_id in team_ids),
+            )
 
         self.stdout.write(self.style.SUCCESS(f"Successfully seeded {processed} games"))
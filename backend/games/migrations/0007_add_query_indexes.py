@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0006_alter_game_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="game",
+            name="stage",
+            field=models.CharField(
+                choices=[
+                    ("PRE", "Pre Season"),
+                    ("REG", "Regular Season"),
+                    ("POST", "Post Season"),
+                ],
+                default="REG",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["home_team", "date"], name="game_home_team_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["away_team", "date"], name="game_away_team_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["season", "week"], name="game_season_week_idx"),
+        ),
+    ]
@@ -0,0 +1,132 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_team_game_logs(apps, schema_editor):
+    """Create the two per-team rows for every existing game."""
+    Game = apps.get_model("games", "Game")
+    TeamGameLog = apps.get_model("games", "TeamGameLog")
+
+    def result(points_for, points_against):
+        if points_for is None or points_against is None:
+            return None
+        if points_for > points_against:
+            return "W"
+        return "L" if points_for < points_against else "T"
+
+    rows = []
+    for game in Game.objects.all().iterator(chunk_size=500):
+        for team_id, opponent_id, is_home, points_for, points_against in (
+            (
+                game.home_team_id,
+                game.away_team_id,
+                True,
+                game.home_score,
+                game.away_score,
+            ),
+            (
+                game.away_team_id,
+                game.home_team_id,
+                False,
+                game.away_score,
+                game.home_score,
+            ),
+        ):
+            rows.append(
+                TeamGameLog(
+                    team_id=team_id,
+                    opponent_id=opponent_id,
+                    game_id=game.id,
+                    season=game.season,
+                    week=game.week,
+                    date=game.date,
+                    is_home=is_home,
+                    points_for=points_for,
+                    points_against=points_against,
+                    result=result(points_for, points_against),
+                )
+            )
+    TeamGameLog.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0006_delete_team_players"),
+        ("games", "0007_add_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TeamGameLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("season", models.IntegerField(default=0)),
+                ("week", models.IntegerField(default=0)),
+                ("date", models.DateField()),
+                ("is_home", models.BooleanField(default=False)),
+                ("points_for", models.IntegerField(null=True)),
+                ("points_against", models.IntegerField(null=True)),
+                (
+                    "result",
+                    models.CharField(
+                        choices=[("W", "Win"), ("L", "Loss"), ("T", "Tie")],
+                        max_length=1,
+                        null=True,
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="team_logs",
+                        to="games.game",
+                    ),
+                ),
+                (
+                    "opponent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="teams.team",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="game_logs",
+                        to="teams.team",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["team", "date"], name="teamgamelog_team_date_idx"
+                    ),
+                    models.Index(
+                        fields=["team", "season", "week"],
+                        name="teamgamelog_team_week_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="teamgamelog",
+            constraint=models.UniqueConstraint(
+                fields=("team", "game", "is_home"), name="unique_team_game_log"
+            ),
+        ),
+        migrations.RunPython(backfill_team_game_logs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_team_standings(apps, schema_editor):
+    """Running W/L/T totals per team, season and week from the game log."""
+    TeamGameLog = apps.get_model("games", "TeamGameLog")
+    TeamStanding = apps.get_model("games", "TeamStanding")
+
+    totals = {}
+    rows = []
+    logs = TeamGameLog.objects.filter(result__isnull=False).order_by(
+        "team_id", "season", "week"
+    )
+    for log in logs.iterator(chunk_size=1000):
+        key = (log.team_id, log.season)
+        wins, losses, ties = totals.get(key, (0, 0, 0))
+        wins += log.result == "W"
+        losses += log.result == "L"
+        ties += log.result == "T"
+        totals[key] = (wins, losses, ties)
+        if rows and (rows[-1].team_id, rows[-1].season, rows[-1].week) == (
+            log.team_id,
+            log.season,
+            log.week,
+        ):
+            rows.pop()
+        rows.append(
+            TeamStanding(
+                team_id=log.team_id,
+                season=log.season,
+                week=log.week,
+                wins=wins,
+                losses=losses,
+                ties=ties,
+            )
+        )
+    TeamStanding.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0006_delete_team_players"),
+        ("games", "0008_teamgamelog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TeamStanding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("season", models.IntegerField()),
+                ("week", models.IntegerField()),
+                ("wins", models.IntegerField(default=0)),
+                ("losses", models.IntegerField(default=0)),
+                ("ties", models.IntegerField(default=0)),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="standings",
+                        to="teams.team",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="teamstanding",
+            constraint=models.UniqueConstraint(
+                fields=("season", "week", "team"), name="unique_team_standing"
+            ),
+        ),
+        migrations.RunPython(backfill_team_standings, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 
 from teams.models import Team
 
-from .constants import STAGE_CHOICES
+from .constants import RESULT_CHOICES, STAGE_CHOICES
 
 
 class Game(models.Model):
@@ -31,5 +31,87 @@ class Game(models.Model):
     temp = models.IntegerField(default=0, null=True)
     wind = models.IntegerField(default=0, null=True)
 
+    class Meta:
+        indexes = [
+            # "Team's games before a date, newest first" (home and away halves
+            # of the Q(home_team) | Q(away_team) filters each use one)
+            models.Index(fields=["home_team", "date"], name="game_home_team_date_idx"),
+            models.Index(fields=["away_team", "date"], name="game_away_team_date_idx"),
+            models.Index(fields=["season", "week"], name="game_season_week_idx"),
+        ]
+
     def __str__(self):
         return f"{self.away_team} @ {self.home_team} - Week {self.week}"
+
+
+class TeamGameLog(models.Model):
+    """
+    One row per team per game: the game from that team's point of view.
+
+    Derived from Game (two rows per game) so "team X's games" is a single
+    indexed range scan instead of OR-ing home_team/away_team and working out
+    the team's side in Python. Kept in sync by games.services.sync_team_game_logs
+    (called whenever a Game is saved).
+    """
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="game_logs")
+    opponent = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="team_logs")
+
+    season = models.IntegerField(default=0)
+    week = models.IntegerField(default=0)
+    date = models.DateField()
+    is_home = models.BooleanField(default=False)
+
+    # Null until the game has been played
+    points_for = models.IntegerField(null=True)
+    points_against = models.IntegerField(null=True)
+    result = models.CharField(max_length=1, choices=RESULT_CHOICES, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "game", "is_home"], name="unique_team_game_log"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["team", "date"], name="teamgamelog_team_date_idx"),
+            models.Index(
+                fields=["team", "season", "week"], name="teamgamelog_team_week_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.team} vs {self.opponent} - {self.season} Week {self.week}"
+
+
+class TeamStanding(models.Model):
+    """
+    A team's cumulative season record through a week.
+
+    One row per week in which the team completed a game; its record through
+    a bye week is the row for the last week it played. Rebuilt from
+    TeamGameLog by games.services.refresh_standings so serializers can read
+    every team's record from one query per season.
+    """
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="standings")
+    season = models.IntegerField()
+    week = models.IntegerField()
+
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["season", "week", "team"], name="unique_team_standing"
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.team} {self.season} Week {self.week}: "
+            f"{self.wins}-{self.losses}-{self.ties}"
+        )
@@ -0,0 +1,212 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Game, TeamGameLog, TeamStanding
+
+# Games processed per delete/insert round trip
+SYNC_BATCH_SIZE = 500
+
+
+def game_result(points_for, points_against):
+    """'W', 'L' or 'T' from one team's perspective (None if unplayed)."""
+    if points_for is None or points_against is None:
+        return None
+    if points_for > points_against:
+        return "W"
+    if points_for < points_against:
+        return "L"
+    return "T"
+
+
+def team_game_logs_for(game):
+    """Build the home and away TeamGameLog rows for a game (unsaved)."""
+    return [
+        TeamGameLog(
+            team_id=team_id,
+            opponent_id=opponent_id,
+            game_id=game.id,
+            season=game.season,
+            week=game.week,
+            date=game.date,
+            is_home=is_home,
+            points_for=points_for,
+            points_against=points_against,
+            result=game_result(points_for, points_against),
+        )
+        for team_id, opponent_id, is_home, points_for, points_against in (
+            (
+                game.home_team_id,
+                game.away_team_id,
+                True,
+                game.home_score,
+                game.away_score,
+            ),
+            (
+                game.away_team_id,
+                game.home_team_id,
+                False,
+                game.away_score,
+                game.home_score,
+            ),
+        )
+    ]
+
+
+def sync_team_game_logs(games=None) -> int:
+    """
+    Rebuild TeamGameLog rows for the given games.
+
+    Args:
+        games: Iterable of Game instances (None = every game)
+
+    Returns:
+        Number of log rows written
+    """
+    if games is None:
+        games = Game.objects.all().iterator(chunk_size=SYNC_BATCH_SIZE)
+
+    written = 0
+    batch = []
+    for game in games:
+        batch.append(game)
+        if len(batch) >= SYNC_BATCH_SIZE:
+            written += _sync_batch(batch)
+            batch = []
+    if batch:
+        written += _sync_batch(batch)
+    return written
+
+
+def _sync_batch(games) -> int:
+    rows = [row for game in games for row in team_game_logs_for(game)]
+    with transaction.atomic():
+        TeamGameLog.objects.filter(game_id__in=[game.id for game in games]).delete()
+        TeamGameLog.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_standings(seasons, team_ids=None) -> int:
+    """
+    Rebuild TeamStanding rows from TeamGameLog.
+
+    Wins, losses and ties per (team, season, week) come from one grouped
+    aggregate; running totals are summed here in week order.
+
+    Args:
+        seasons: Seasons to rebuild
+        team_ids: Only rebuild these teams (None = every team)
+
+    Returns:
+        Number of standing rows written
+    """
+    logs = TeamGameLog.objects.filter(season__in=seasons, result__isnull=False)
+    standings = TeamStanding.objects.filter(season__in=seasons)
+    if team_ids is not None:
+        logs = logs.filter(team_id__in=team_ids)
+        standings = standings.filter(team_id__in=team_ids)
+
+    weekly = (
+        logs.values("team_id", "season", "week")
+        .annotate(
+            wins=Count("id", filter=Q(result="W")),
+            losses=Count("id", filter=Q(result="L")),
+            ties=Count("id", filter=Q(result="T")),
+        )
+        .order_by("team_id", "season", "week")
+    )
+
+    rows = []
+    totals = {}
+    for row in weekly:
+        wins, losses, ties = totals.get((row["team_id"], row["season"]), (0, 0, 0))
+        totals[(row["team_id"], row["season"])] = (
+            wins + row["wins"],
+            losses + row["losses"],
+            ties + row["ties"],
+        )
+        rows.append(
+            TeamStanding(
+                team_id=row["team_id"],
+                season=row["season"],
+                week=row["week"],
+                wins=wins + row["wins"],
+                losses=losses + row["losses"],
+                ties=ties + row["ties"],
+            )
+        )
+
+    with transaction.atomic():
+        standings.delete()
+        TeamStanding.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def season_records(season, through_week=None) -> dict:
+    """
+    Every team's record in a season, from one query.
+
+    Args:
+        season: Season year
+        through_week: Count games up to and including this week
+            (None = the whole season so far)
+
+    Returns:
+        {team_id: (wins, losses, ties)}
+    """
+    standings = TeamStanding.objects.filter(season=season)
+    if through_week is not None:
+        standings = standings.filter(week__lte=through_week)
+
+    # Ascending weeks: each team's last row (its latest record) wins
+    return {
+        team_id: (wins, losses, ties)
+        for team_id, wins, losses, ties in standings.order_by("week").values_list(
+            "team_id", "wins", "losses", "ties"
+        )
+    }
+
+
+def format_record(wins, losses, ties) -> str:
+    """'W-L', or 'W-L-T' once a team has tied"""
+    if ties > 0:
+        return f"{wins}-{losses}-{ties}"
+    return f"{wins}-{losses}"
+
+
+def _first_per_team(logs, team_ids, order_by, limit):
+    """First `limit` logs per team (every team if team_ids is None), as one windowed query"""
+    if team_ids is not None:
+        logs = logs.filter(team_id__in=team_ids)
+    return logs.annotate(
+        row=Window(RowNumber(), partition_by=F("team_id"), order_by=order_by)
+    ).filter(row__lte=limit)
+
+
+def recent_game_windows(team_ids, num_games, before=None) -> dict:
+    """
+    {team_id: [game_id, ...]} of each team's last N completed games.
+
+    Args:
+        team_ids: Teams to include (None = every team with a completed game)
+        before: Only count games played before this date
+    """
+    windows = {team_id: [] for team_id in team_ids or ()}
+    logs = TeamGameLog.objects.filter(result__isnull=False)
+    if before is not None:
+        logs = logs.filter(date__lt=before)
+    logs = _first_per_team(logs, team_ids, F("date").desc(), num_games)
+    for team_id, game_id in logs.values_list("team_id", "game_id"):
+        windows.setdefault(team_id, []).append(game_id)
+    return windows
+
+
+def next_games(team_ids, cutoff) -> dict:
+    """{team_id: TeamGameLog} of each team's first game on/after cutoff"""
+    logs = _first_per_team(
+        TeamGameLog.objects.filter(date__gte=cutoff).select_related("game", "opponent"),
+        team_ids,
+        F("date").asc(),
+        1,
+    )
+    return {log.team_id: log for log in logs}
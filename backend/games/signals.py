@@ -0,0 +1,96 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.cache_utils import (
+    CALENDAR_TAG,
+    game_tag,
+    invalidate_tags,
+    season_tag,
+    team_tag,
+)
+
+from .models import Game
+from .services import refresh_standings, sync_team_game_logs
+
+_state = threading.local()
+
+
+@contextmanager
+def deferred_game_sync():
+    """
+    Skip the per-game handlers below for Game writes in this block.
+
+    For bulk writers (seed_games) that sync logs, standings and cache tags
+    once per season afterwards instead of once per row.
+    """
+    previous = getattr(_state, "deferred", False)
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def _deferred():
+    return getattr(_state, "deferred", False)
+
+
+def _game_tags(game):
+    """Cache tags a game write touches: both teams' logs change with it"""
+    return [
+        CALENDAR_TAG,
+        season_tag(game.season),
+        game_tag(game.id),
+        team_tag(game.home_team_id),
+        team_tag(game.away_team_id),
+    ]
+
+
+@receiver(pre_save, sender=Game)
+def remember_stored_sides(sender, instance, raw=False, **kwargs):
+    """Note the stored season and teams, whose standings a save may move the game out of."""
+    if raw or _deferred():
+        return
+    instance._stored_sides = (
+        Game.objects.filter(pk=instance.pk)
+        .values_list("season", "home_team_id", "away_team_id")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Game)
+def sync_game_logs_on_save(sender, instance, raw=False, **kwargs):
+    """Keep TeamGameLog, TeamStanding and cached game data in step with every Game write (admin, shell, ...)."""
+    if raw or _deferred():
+        return  # loaddata: fixtures bring their own logs
+    sync_team_game_logs([instance])
+
+    # (season, team) standings to rebuild: the game's sides now and, if the
+    # save changed its season or teams, the ones it was stored under
+    sides = {
+        (instance.season, instance.home_team_id),
+        (instance.season, instance.away_team_id),
+    }
+    tags = _game_tags(instance)
+    stored = getattr(instance, "_stored_sides", None)
+    if stored:
+        season, home_team_id, away_team_id = stored
+        sides |= {(season, home_team_id), (season, away_team_id)}
+        tags += [season_tag(season), team_tag(home_team_id), team_tag(away_team_id)]
+    for season in {season for season, _ in sides}:
+        refresh_standings([season], team_ids=[team for s, team in sides if s == season])
+    invalidate_tags(*dict.fromkeys(tags))
+
+
+@receiver(post_delete, sender=Game)
+def sync_game_logs_on_delete(sender, instance, **kwargs):
+    """Logs cascade with the game; standings and cached game data are refreshed."""
+    if _deferred():
+        return
+    refresh_standings(
+        [instance.season], team_ids=[instance.home_team_id, instance.away_team_id]
+    )
+    invalidate_tags(*_game_tags(instance))
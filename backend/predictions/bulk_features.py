@@ -0,0 +1,361 @@
+"""
+Bulk Feature Extraction
+
+FeatureExtractor answers one question at a time: "what did team X look like
+before date D?" Each answer costs a handful of ORM queries, so building a
+training set game-by-game means tens of thousands of database round trips.
+
+This module answers the same question for many (team, date) pairs at once.
+
+HOW IT WORKS:
+-------------
+1. Load every completed Game and FootballTeamGameStat row ONCE
+2. Lay each team's games out as a timeline (sorted by date) in NumPy arrays
+3. Take running (cumulative) sums down the timelines
+4. "Average over the last N games before D" is then a subtraction:
+
+       k = number of games the team played before D   (binary search)
+       window_sum = cumsum[k] - cumsum[k - N]
+       window_avg = window_sum / N
+
+Every (team, date) lookup is O(log n), and all lookups are done together
+with array operations instead of Python loops.
+
+The output matches FeatureExtractor.build_game_features() column-for-column
+(see FeatureExtractor.get_feature_names()), including its edge cases:
+missing stat rows, ties counting as losses in trends, and the "at least 3
+prior games" rule.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from games.models import Game
+from stats.models import FootballTeamGameStat
+
+from .features import (
+    DEFENSIVE_FEATURES,
+    OFFENSIVE_FEATURES,
+    TEAM_FEATURES,
+    TREND_FEATURES,
+    FeatureExtractor,
+)
+
+# Columns of the team's own stat rows that features are averaged from
+OWN_STAT_FIELDS = [
+    "pass_yards",
+    "pass_touchdowns",
+    "pass_attempts",
+    "pass_completions",
+    "rush_yards",
+    "rush_touchdowns",
+    "rush_attempts",
+    "interceptions",
+    "fumbles_lost",
+    "def_sacks",
+    "def_interceptions",
+    "def_fumbles_forced",
+]
+
+# Columns of the OPPONENT's stat rows (what the defense allowed)
+OPP_STAT_FIELDS = ["pass_yards", "rush_yards", "pass_touchdowns", "rush_touchdowns"]
+
+# Layout of the per team-game value matrix that gets cumulatively summed
+_OWN = {name: i for i, name in enumerate(OWN_STAT_FIELDS)}
+_OWN_COUNT = len(OWN_STAT_FIELDS)
+_OPP = {name: _OWN_COUNT + 1 + i for i, name in enumerate(OPP_STAT_FIELDS)}
+_OPP_COUNT = _OWN_COUNT + 1 + len(OPP_STAT_FIELDS)
+_POINTS_FOR = _OPP_COUNT + 1
+_POINTS_AGAINST = _OPP_COUNT + 2
+_NUM_COLUMNS = _OPP_COUNT + 3
+
+# Team features that depend only on history (situational ones depend on the game)
+HISTORY_FEATURES = OFFENSIVE_FEATURES + DEFENSIVE_FEATURES + TREND_FEATURES
+
+# Trend features always look at the last 5 games (see extract_trend_features)
+TREND_GAMES = 5
+
+# Minimum prior games needed before features are considered reliable
+MIN_GAMES = 3
+
+# Spacing between teams in the combined (team, date) sort key.
+# Date ordinals are ~740,000, so teams never overlap.
+_KEY_STRIDE = 10_000_000
+
+
+class BulkFeatureBuilder:
+    """
+    Computes game feature vectors for many games from one pass over the data.
+
+    Example usage:
+        builder = BulkFeatureBuilder(num_games=5)
+        X, valid = builder.build(games)
+        X = X[valid]  # Drop games without enough history
+    """
+
+    def __init__(self, num_games: int = 5):
+        """
+        Args:
+            num_games: Number of recent games to average (same meaning as
+                       FeatureExtractor.num_games)
+        """
+        self.num_games = num_games
+        self._loaded_until = None
+        self._teams = np.zeros(0, dtype=np.int64)
+
+    def load(self, until_date: date = None) -> "BulkFeatureBuilder":
+        """
+        Load completed games (and their team stats) into timeline arrays.
+
+        History is NOT limited to specific seasons: a week 4 game still
+        averages over the tail end of the previous season, exactly like the
+        per-game extractor does.
+
+        Args:
+            until_date: Only load games before this date (None = everything)
+        """
+        games = Game.objects.filter(home_score__isnull=False)
+        stats = FootballTeamGameStat.objects.filter(game__home_score__isnull=False)
+        if until_date is not None:
+            games = games.filter(date__lt=until_date)
+            stats = stats.filter(game__date__lt=until_date)
+
+        game_rows = list(
+            games.values_list(
+                "id", "date", "home_team_id", "away_team_id", "home_score", "away_score"
+            )
+        )
+        stat_rows = list(
+            stats.values_list("game_id", "team_id", *OWN_STAT_FIELDS).order_by()
+        )
+
+        # Two timeline entries per game: one for each team
+        num_rows = 2 * len(game_rows)
+        team_ids = np.empty(num_rows, dtype=np.int64)
+        ordinals = np.empty(num_rows, dtype=np.int64)
+        values = np.zeros((num_rows, _NUM_COLUMNS), dtype=np.float64)
+        game_index = {}
+        row_index = {}
+
+        for i, (game_id, game_date, home_id, away_id, home_pts, away_pts) in enumerate(
+            game_rows
+        ):
+            home_pts = home_pts or 0
+            away_pts = away_pts or 0
+            game_index[game_id] = i
+            for row, team_id, points_for, points_against in (
+                (2 * i, home_id, home_pts, away_pts),
+                (2 * i + 1, away_id, away_pts, home_pts),
+            ):
+                team_ids[row] = team_id
+                ordinals[row] = game_date.toordinal()
+                values[row, _POINTS_FOR] = points_for
+                values[row, _POINTS_AGAINST] = points_against
+                row_index.setdefault((game_id, team_id), row)
+
+        # Per-game totals across all teams, so "opponent" = game total - own
+        game_totals = np.zeros((len(game_rows), len(OPP_STAT_FIELDS) + 1))
+        opp_source = [2 + OWN_STAT_FIELDS.index(name) for name in OPP_STAT_FIELDS]
+
+        for stat in stat_rows:
+            game_id, team_id = stat[0], stat[1]
+            i = game_index.get(game_id)
+            if i is None:
+                continue
+            opp_values = [stat[j] for j in opp_source]
+            game_totals[i, :-1] += opp_values
+            game_totals[i, -1] += 1
+
+            row = row_index.get((game_id, team_id))
+            if row is not None:
+                values[row, :_OWN_COUNT] += stat[2:]
+                values[row, _OWN_COUNT] += 1
+
+        # Opponent stats = everything recorded in the game minus our own rows
+        own_opp = values[:, [_OWN[name] for name in OPP_STAT_FIELDS] + [_OWN_COUNT]]
+        rows_game = np.repeat(np.arange(len(game_rows)), 2)
+        opp = game_totals[rows_game] - own_opp
+        values[:, [_OPP[name] for name in OPP_STAT_FIELDS] + [_OPP_COUNT]] = opp
+
+        # Sort timeline by (team, date)
+        self._teams, team_idx = np.unique(team_ids, return_inverse=True)
+        keys = team_idx.astype(np.int64) * _KEY_STRIDE + ordinals
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._ordinals = ordinals[order]
+        values = values[order]
+        sorted_teams = team_idx[order]
+
+        # Where each team's timeline starts inside the combined arrays
+        self._team_starts = np.searchsorted(sorted_teams, np.arange(len(self._teams)))
+
+        # Running sums with a leading zero row: window sum = cum[end] - cum[start]
+        self._cumsum = np.vstack(
+            [np.zeros((1, _NUM_COLUMNS)), np.cumsum(values, axis=0)]
+        )
+
+        # Win/loss streak length ending at each game (ties count as losses,
+        # matching extract_trend_features)
+        won = values[:, _POINTS_FOR] > values[:, _POINTS_AGAINST]
+        positions = np.arange(len(won))
+        breaks = np.ones(len(won), dtype=bool)
+        breaks[1:] = (won[1:] != won[:-1]) | (sorted_teams[1:] != sorted_teams[:-1])
+        run_starts = np.maximum.accumulate(np.where(breaks, positions, 0))
+        self._won = won
+        self._run_lengths = positions - run_starts + 1
+
+        self._loaded_until = until_date or date.max
+        return self
+
+    def team_features(
+        self, team_ids, before_dates
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute history-based features for many (team, date) pairs.
+
+        Call load() first with an until_date after every date in before_dates.
+
+        Args:
+            team_ids: Sequence of team IDs
+            before_dates: Sequence of dates (only games before each date count)
+
+        Returns:
+            Tuple of (features, games_before, last_game_dates):
+            - features: array of shape (n, len(HISTORY_FEATURES))
+            - games_before: completed games each team played before the date
+            - last_game_dates: date of the previous game (None if no games)
+        """
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        ordinals = np.array([d.toordinal() for d in before_dates], dtype=np.int64)
+        n = len(team_ids)
+        if n == 0 or len(self._teams) == 0:
+            return (
+                np.zeros((n, len(HISTORY_FEATURES))),
+                np.zeros(n, dtype=np.int64),
+                [None] * n,
+            )
+
+        # Locate each team's timeline (teams with no games get an empty one)
+        team_pos = np.minimum(
+            np.searchsorted(self._teams, team_ids), len(self._teams) - 1
+        )
+        known = self._teams[team_pos] == team_ids
+
+        # end = index just past the team's last game before the date
+        end = np.searchsorted(self._keys, team_pos * _KEY_STRIDE + ordinals, "left")
+        end = np.where(known, end, 0)
+        starts = np.where(known, self._team_starts[team_pos], 0)
+        games_before = end - starts
+
+        def mean(total, count):
+            return np.divide(
+                total, count, out=np.zeros_like(total), where=count > 0
+            ).astype(np.float64)
+
+        length = np.minimum(games_before, self.num_games)
+        sums = self._cumsum[end] - self._cumsum[end - length]
+        own_count = sums[:, _OWN_COUNT]
+        opp_count = sums[:, _OPP_COUNT]
+
+        def own(name):
+            return mean(sums[:, _OWN[name]], own_count)
+
+        def opp(name):
+            return mean(sums[:, _OPP[name]], opp_count)
+
+        # Avg() of nothing is None, and the extractor uses `or 1` for attempts
+        pass_attempts = own("pass_attempts")
+        pass_attempts = np.where(pass_attempts == 0, 1, pass_attempts)
+
+        feats = {
+            "off_pass_yards": own("pass_yards"),
+            "off_pass_tds": own("pass_touchdowns"),
+            "off_completion_pct": own("pass_completions") / pass_attempts * 100,
+            "off_rush_yards": own("rush_yards"),
+            "off_rush_tds": own("rush_touchdowns"),
+            "off_total_yards": own("pass_yards") + own("rush_yards"),
+            "off_points_scored": mean(sums[:, _POINTS_FOR], length.astype(float)),
+            "off_turnovers": own("interceptions") + own("fumbles_lost"),
+            "def_pass_yards_allowed": opp("pass_yards"),
+            "def_rush_yards_allowed": opp("rush_yards"),
+            "def_total_yards_allowed": opp("pass_yards") + opp("rush_yards"),
+            "def_points_allowed": mean(sums[:, _POINTS_AGAINST], length.astype(float)),
+            "def_sacks": own("def_sacks"),
+            "def_interceptions": own("def_interceptions"),
+            "def_turnovers_forced": own("def_interceptions")
+            + own("def_fumbles_forced"),
+        }
+
+        # Trends: streak of identical results ending at the most recent game,
+        # but never looking back further than the last TREND_GAMES games
+        trend_games = np.minimum(games_before, TREND_GAMES)
+        last = np.maximum(end - 1, 0)
+        has_games = trend_games > 0
+        won_last = has_games & self._won[last]
+        streak = np.where(
+            has_games, np.minimum(self._run_lengths[last], trend_games), 0
+        )
+        feats["current_streak"] = np.where(won_last, streak, -streak).astype(float)
+
+        # extract_trend_features stops counting wins when the streak ends, but
+        # counts the win that ends a losing streak before it stops
+        wins = np.where(won_last, streak, (streak < trend_games).astype(int))
+        feats["recent_win_pct"] = np.where(
+            has_games, mean(wins.astype(float), trend_games.astype(float)), 0.5
+        )
+
+        features = np.column_stack([feats[name] for name in HISTORY_FEATURES])
+        last_dates = [
+            date.fromordinal(int(self._ordinals[i])) if has else None
+            for i, has in zip(last, games_before > 0)
+        ]
+        return features, games_before, last_dates
+
+    def build(self, games) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Build feature vectors for a list of games.
+
+        Args:
+            games: Sequence of Game instances
+
+        Returns:
+            Tuple of (X, valid):
+            - X: Feature matrix of shape (n_games, 44), float32
+            - valid: Boolean mask; False where build_game_features() would
+                     raise InsufficientDataError (rows are zero-filled)
+        """
+        games = list(games)
+        num_features = len(FeatureExtractor.get_feature_names())
+        if not games:
+            return np.zeros((0, num_features), dtype=np.float32), np.zeros(0, bool)
+
+        latest = max(game.date for game in games)
+        if self._loaded_until is None or self._loaded_until < latest:
+            self.load(until_date=latest)
+
+        dates = [game.date for game in games]
+        sides = {}
+        for side, attr in (("home", "home_team_id"), ("away", "away_team_id")):
+            team_ids = [getattr(game, attr) for game in games]
+            sides[side] = (team_ids, *self.team_features(team_ids, dates))
+
+        X = np.zeros((len(games), num_features), dtype=np.float32)
+        valid = np.ones(len(games), dtype=bool)
+        history_cols = [TEAM_FEATURES.index(name) for name in HISTORY_FEATURES]
+
+        for offset, side in ((0, "home"), (len(TEAM_FEATURES), "away")):
+            team_ids, features, games_before, last_dates = sides[side]
+            valid &= np.minimum(games_before, self.num_games) >= MIN_GAMES
+            X[:, [offset + col for col in history_cols]] = features
+
+            # Situational features come from the game itself (no queries)
+            for row, game in enumerate(games):
+                situational = FeatureExtractor.situational_features(
+                    game, team_ids[row], last_dates[row]
+                )
+                for name, value in situational.items():
+                    X[row, offset + TEAM_FEATURES.index(name)] = value
+
+        X[~valid] = 0
+        return X, valid
@@ -0,0 +1,333 @@
+"""
+Team Feature Store
+
+Serving a prediction with FeatureExtractor re-aggregates each team's recent
+games from raw stat rows on every request (~14 queries per game). But a
+team's history only changes when it plays, so those aggregates can be
+computed ONCE, right after each game, and stored.
+
+HOW IT WORKS:
+-------------
+- After each completed game we store a TeamFeatureSnapshot: the team's
+  offensive, defensive and trend features INCLUDING that game
+- To predict a game on date D, read the team's latest snapshot before D
+  (one indexed lookup per team) and add situational features, which come
+  from the game itself
+- A whole week is built with build_many_game_features(): one snapshot query
+  for every team in it, and one BulkFeatureBuilder pass for the teams whose
+  snapshot is missing or stale
+- Snapshots are refreshed by the seeding pipeline (seed_stats) for the
+  teams it touched, or in bulk with `manage.py refresh_feature_store`
+
+WHY CHECK FOR STALENESS?
+------------------------
+If results land and the refresh hasn't run (or failed), the latest snapshot
+is missing the newest games. Serving it would silently predict from old
+form. The lookup checks, in the same query, whether the team has a
+completed game between the snapshot and D; if so (or if there is no
+snapshot at all) we fall back to FeatureExtractor, which is always correct,
+just slower.
+"""
+
+import logging
+from datetime import date, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import RowNumber
+
+from games.models import Game
+
+from .bulk_features import HISTORY_FEATURES, MIN_GAMES, BulkFeatureBuilder
+from .features import FeatureExtractor, InsufficientDataError
+from .models import TeamFeatureSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Snapshots read per team by build_many_game_features: a week's games are
+# days apart, so a team's latest snapshot before its own game is almost
+# always one of its newest two before the week's last game
+SNAPSHOTS_PER_TEAM = 2
+
+
+class TeamFeatureStore:
+    """
+    Read side of the feature store: builds game feature vectors from
+    snapshots, falling back to FeatureExtractor when a snapshot is missing
+    or stale.
+
+    Usage:
+        store = TeamFeatureStore(num_games=5)
+        features = store.build_game_features(game)
+    """
+
+    def __init__(self, num_games: int = 5):
+        """
+        Args:
+            num_games: Number of recent games averaged (which snapshots to read)
+        """
+        self.num_games = num_games
+        self.extractor = FeatureExtractor(num_games=num_games)
+
+    def get_snapshot(self, team_id: int, before_date: date):
+        """
+        Get the team's latest fresh snapshot before a date.
+
+        Returns:
+            TeamFeatureSnapshot, or None if missing or stale
+        """
+        newer_games = Game.objects.filter(
+            Q(home_team_id=team_id) | Q(away_team_id=team_id),
+            home_score__isnull=False,
+            date__gt=OuterRef("as_of_date"),
+            date__lt=before_date,
+        )
+        snapshot = (
+            TeamFeatureSnapshot.objects.filter(
+                team_id=team_id,
+                num_games=self.num_games,
+                as_of_date__lt=before_date,
+            )
+            .annotate(is_stale=Exists(newer_games))
+            .order_by("-as_of_date")
+            .first()
+        )
+        if snapshot is None or snapshot.is_stale:
+            return None
+        return snapshot
+
+    def team_features(self, game: Game, team_id: int) -> dict:
+        """
+        Get all features for one team in a game.
+
+        Raises:
+            InsufficientDataError: If the team has fewer than 3 prior games
+        """
+        snapshot = self.get_snapshot(team_id, game.date)
+        if snapshot is None:
+            logger.debug(
+                "No fresh feature snapshot for team %s before %s; extracting",
+                team_id,
+                game.date,
+            )
+            return {
+                **self.extractor.extract_team_offensive_features(team_id, game.date),
+                **self.extractor.extract_team_defensive_features(team_id, game.date),
+                **self.extractor.extract_situational_features(game, team_id),
+                **self.extractor.extract_trend_features(team_id, game.date),
+            }
+
+        games_used = min(snapshot.games_played, self.num_games)
+        if games_used < MIN_GAMES:
+            raise InsufficientDataError(
+                f"Team {team_id} has only {games_used} games before {game.date}"
+            )
+
+        return {
+            **snapshot.features,
+            **FeatureExtractor.situational_features(game, team_id, snapshot.as_of_date),
+        }
+
+    def build_game_features(self, game: Game) -> np.ndarray:
+        """
+        Build the feature vector for a game (same layout as
+        FeatureExtractor.build_game_features).
+        """
+        home = self.team_features(game, game.home_team_id)
+        away = self.team_features(game, game.away_team_id)
+        return FeatureExtractor.combine_team_features(home, away)
+
+    def _latest_snapshots(self, team_ids, before_date) -> dict:
+        """
+        {team_id: [TeamFeatureSnapshot, ...]} newest first: each team's
+        SNAPSHOTS_PER_TEAM latest snapshots before a date, annotated with
+        the date of the team's next completed game (None if none), in one
+        query.
+        """
+        next_game = (
+            Game.objects.filter(
+                Q(home_team_id=OuterRef("team_id"))
+                | Q(away_team_id=OuterRef("team_id")),
+                home_score__isnull=False,
+                date__gt=OuterRef("as_of_date"),
+            )
+            .order_by("date")
+            .values("date")[:1]
+        )
+        snapshots = (
+            TeamFeatureSnapshot.objects.filter(
+                team_id__in=team_ids,
+                num_games=self.num_games,
+                as_of_date__lt=before_date,
+            )
+            .annotate(
+                next_game_date=Subquery(next_game),
+                row=Window(
+                    RowNumber(),
+                    partition_by=F("team_id"),
+                    order_by=F("as_of_date").desc(),
+                ),
+            )
+            .filter(row__lte=SNAPSHOTS_PER_TEAM)
+            .order_by("team_id", "-as_of_date")
+        )
+        latest = {}
+        for snapshot in snapshots:
+            latest.setdefault(snapshot.team_id, []).append(snapshot)
+        return latest
+
+    def build_many_game_features(self, games) -> list:
+        """
+        build_game_features() for many games at once.
+
+        Fresh snapshots for every team come from one query; teams without
+        one (missing, stale, or older than the snapshots read) are computed
+        together by one BulkFeatureBuilder pass instead of FeatureExtractor.
+
+        Returns:
+            Per game, in order: its feature vector, or the
+            InsufficientDataError build_game_features() would have raised
+        """
+        games = list(games)
+        if not games:
+            return []
+        pairs = [
+            (game, team_id)
+            for game in games
+            for team_id in (game.home_team_id, game.away_team_id)
+        ]
+        latest = self._latest_snapshots(
+            {team_id for _, team_id in pairs}, max(game.date for game in games)
+        )
+
+        team_features = {}
+        misses = []
+        for game, team_id in pairs:
+            snapshot = next(
+                (s for s in latest.get(team_id, []) if s.as_of_date < game.date),
+                None,
+            )
+            if snapshot is None or (
+                snapshot.next_game_date and snapshot.next_game_date < game.date
+            ):
+                misses.append((game, team_id))
+                continue
+            team_features[(game.id, team_id)] = (
+                min(snapshot.games_played, self.num_games),
+                {
+                    **snapshot.features,
+                    **FeatureExtractor.situational_features(
+                        game, team_id, snapshot.as_of_date
+                    ),
+                },
+            )
+
+        if misses:
+            logger.debug(
+                "No fresh feature snapshot for %d teams; bulk building", len(misses)
+            )
+            builder = BulkFeatureBuilder(num_games=self.num_games).load(
+                until_date=max(game.date for game, _ in misses)
+            )
+            features, games_before, last_dates = builder.team_features(
+                [team_id for _, team_id in misses], [game.date for game, _ in misses]
+            )
+            for (game, team_id), row, played, last_date in zip(
+                misses, features, games_before, last_dates
+            ):
+                team_features[(game.id, team_id)] = (
+                    min(int(played), self.num_games),
+                    {
+                        **dict(zip(HISTORY_FEATURES, row)),
+                        **FeatureExtractor.situational_features(
+                            game, team_id, last_date
+                        ),
+                    },
+                )
+
+        results = []
+        for game in games:
+            try:
+                home, away = [
+                    self._checked(game, team_id, *team_features[(game.id, team_id)])
+                    for team_id in (game.home_team_id, game.away_team_id)
+                ]
+            except InsufficientDataError as e:
+                results.append(e)
+                continue
+            results.append(FeatureExtractor.combine_team_features(home, away))
+        return results
+
+    @staticmethod
+    def _checked(game, team_id, games_used, features) -> dict:
+        if games_used < MIN_GAMES:
+            raise InsufficientDataError(
+                f"Team {team_id} has only {games_used} games before {game.date}"
+            )
+        return features
+
+
+def refresh_snapshots(team_ids=None, since: date = None, num_games: int = 5) -> int:
+    """
+    Recompute feature snapshots.
+
+    Rolling windows mean a changed game affects every later snapshot for
+    that team, so everything from `since` onward is rebuilt.
+
+    Args:
+        team_ids: Teams to refresh (None = all teams)
+        since: Only rebuild snapshots for games on/after this date (None = all)
+        num_games: Rolling window size
+
+    Returns:
+        Number of snapshots written
+    """
+    games = Game.objects.filter(home_score__isnull=False)
+    snapshots = TeamFeatureSnapshot.objects.filter(num_games=num_games)
+    if team_ids is not None:
+        team_ids = set(team_ids)
+        games = games.filter(
+            Q(home_team_id__in=team_ids) | Q(away_team_id__in=team_ids)
+        )
+        snapshots = snapshots.filter(team_id__in=team_ids)
+    if since is not None:
+        games = games.filter(date__gte=since)
+        snapshots = snapshots.filter(as_of_date__gte=since)
+
+    # One (team, game date) pair per team per game
+    pairs = set()
+    for game_date, home_id, away_id in games.values_list(
+        "date", "home_team_id", "away_team_id"
+    ):
+        for team_id in (home_id, away_id):
+            if team_id is not None and (team_ids is None or team_id in team_ids):
+                pairs.add((team_id, game_date))
+    pairs = sorted(pairs)
+
+    new_snapshots = []
+    if pairs:
+        builder = BulkFeatureBuilder(num_games=num_games).load()
+        # Features "before the day after" the game include the game itself
+        features, games_played, _ = builder.team_features(
+            [team_id for team_id, _ in pairs],
+            [game_date + timedelta(days=1) for _, game_date in pairs],
+        )
+        for (team_id, game_date), row, played in zip(pairs, features, games_played):
+            new_snapshots.append(
+                TeamFeatureSnapshot(
+                    team_id=team_id,
+                    as_of_date=game_date,
+                    num_games=num_games,
+                    games_played=int(played),
+                    features={
+                        name: float(value) for name, value in zip(HISTORY_FEATURES, row)
+                    },
+                )
+            )
+
+    with transaction.atomic():
+        snapshots.delete()
+        TeamFeatureSnapshot.objects.bulk_create(new_snapshots, batch_size=1000)
+
+    return len(new_snapshots)
@@ -23,9 +23,40 @@ from datetime import date
 import numpy as np
 from django.db.models import Avg, Q
 
-from games.models import Game
+from games.models import Game, TeamGameLog
 from stats.models import FootballTeamGameStat
 
+# Per-team feature layout. A game vector is every TEAM_FEATURES value for the
+# home team followed by every TEAM_FEATURES value for the away team (44 total).
+OFFENSIVE_FEATURES = [
+    "off_pass_yards",
+    "off_pass_tds",
+    "off_completion_pct",
+    "off_rush_yards",
+    "off_rush_tds",
+    "off_total_yards",
+    "off_points_scored",
+    "off_turnovers",
+]
+DEFENSIVE_FEATURES = [
+    "def_pass_yards_allowed",
+    "def_rush_yards_allowed",
+    "def_total_yards_allowed",
+    "def_points_allowed",
+    "def_sacks",
+    "def_interceptions",
+    "def_turnovers_forced",
+]
+SITUATIONAL_FEATURES = ["is_home", "temperature", "wind", "is_dome", "rest_days"]
+TREND_FEATURES = ["recent_win_pct", "current_streak"]
+TEAM_FEATURES = (
+    OFFENSIVE_FEATURES + DEFENSIVE_FEATURES + SITUATIONAL_FEATURES + TREND_FEATURES
+)
+
+# Rest days when a team has no previous game, and the cap (a bye week)
+DEFAULT_REST_DAYS = 7
+MAX_REST_DAYS = 14
+
 
 class FeatureExtractor:
     """
@@ -193,11 +224,6 @@ class FeatureExtractor:
 
         These capture the circumstances of the game, not team performance.
         """
-        is_home = game.home_team_id == team_id
-
-        # Check if it's a dome game (weather doesn't matter indoors)
-        is_dome = game.roof in ["dome", "closed", "retractable"]
-
         # Calculate rest days since last game
         last_game = (
             Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
@@ -207,10 +233,27 @@ class FeatureExtractor:
             .first()
         )
 
-        if last_game:
-            rest_days = (game.date - last_game.date).days
+        return self.situational_features(
+            game, team_id, last_game.date if last_game else None
+        )
+
+    @staticmethod
+    def situational_features(game: Game, team_id: int, last_game_date) -> dict:
+        """
+        Build situational features once the team's previous game date is known.
+
+        Split out from extract_situational_features() so bulk builders that
+        already know the previous game date don't need another query.
+        """
+        is_home = game.home_team_id == team_id
+
+        # Check if it's a dome game (weather doesn't matter indoors)
+        is_dome = game.roof in ["dome", "closed", "retractable"]
+
+        if last_game_date:
+            rest_days = (game.date - last_game_date).days
         else:
-            rest_days = 7  # Default to normal rest
+            rest_days = DEFAULT_REST_DAYS  # Default to normal rest
 
         return {
             "is_home": 1 if is_home else 0,  # Binary: 1 = home, 0 = away
@@ -219,7 +262,7 @@ class FeatureExtractor:
             ),  # Default to 70°F for domes
             "wind": game.wind if game.wind and not is_dome else 0,
             "is_dome": 1 if is_dome else 0,
-            "rest_days": min(rest_days, 14),  # Cap at 14 (bye week)
+            "rest_days": min(rest_days, MAX_REST_DAYS),  # Cap at 14 (bye week)
         }
 
     def extract_trend_features(self, team_id: int, before_date: date) -> dict:
@@ -228,23 +271,21 @@ class FeatureExtractor:
 
         Win streaks and recent form can indicate team confidence and momentum.
         """
-        # Get last 5 games
-        games = (
-            Game.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
-            .filter(date__lt=before_date)
-            .filter(home_score__isnull=False)
-            .order_by("-date")[:5]
+        # Get last 5 results (W/L/T from this team's side)
+        results = list(
+            TeamGameLog.objects.filter(
+                team_id=team_id, date__lt=before_date, result__isnull=False
+            )
+            .order_by("-date")
+            .values_list("result", flat=True)[:5]
         )
 
         wins = 0
         current_streak = 0
         streak_type = None  # 'W' or 'L'
 
-        for game in games:
-            if game.home_team_id == team_id:
-                won = game.home_score > game.away_score
-            else:
-                won = game.away_score > game.home_score
+        for result in results:
+            won = result == "W"  # Ties count as losses
 
             if won:
                 wins += 1
@@ -264,7 +305,7 @@ class FeatureExtractor:
                 else:
                     break  # Streak ended
 
-        win_pct = wins / len(games) if games else 0.5
+        win_pct = wins / len(results) if results else 0.5
 
         return {
             "recent_win_pct": win_pct,
@@ -300,61 +341,21 @@ class FeatureExtractor:
 
         # Combine into feature vector
         # Order matters and must be consistent between training and prediction!
-        features = [
-            # Home team offensive features
-            home_off["off_pass_yards"],
-            home_off["off_pass_tds"],
-            home_off["off_completion_pct"],
-            home_off["off_rush_yards"],
-            home_off["off_rush_tds"],
-            home_off["off_total_yards"],
-            home_off["off_points_scored"],
-            home_off["off_turnovers"],
-            # Home team defensive features
-            home_def["def_pass_yards_allowed"],
-            home_def["def_rush_yards_allowed"],
-            home_def["def_total_yards_allowed"],
-            home_def["def_points_allowed"],
-            home_def["def_sacks"],
-            home_def["def_interceptions"],
-            home_def["def_turnovers_forced"],
-            # Home situational
-            home_sit["is_home"],  # Always 1 for home team
-            home_sit["temperature"],
-            home_sit["wind"],
-            home_sit["is_dome"],
-            home_sit["rest_days"],
-            # Home trends
-            home_trend["recent_win_pct"],
-            home_trend["current_streak"],
-            # Away team offensive features
-            away_off["off_pass_yards"],
-            away_off["off_pass_tds"],
-            away_off["off_completion_pct"],
-            away_off["off_rush_yards"],
-            away_off["off_rush_tds"],
-            away_off["off_total_yards"],
-            away_off["off_points_scored"],
-            away_off["off_turnovers"],
-            # Away team defensive features
-            away_def["def_pass_yards_allowed"],
-            away_def["def_rush_yards_allowed"],
-            away_def["def_total_yards_allowed"],
-            away_def["def_points_allowed"],
-            away_def["def_sacks"],
-            away_def["def_interceptions"],
-            away_def["def_turnovers_forced"],
-            # Away situational
-            away_sit["is_home"],  # Always 0 for away team
-            away_sit["temperature"],
-            away_sit["wind"],
-            away_sit["is_dome"],
-            away_sit["rest_days"],
-            # Away trends
-            away_trend["recent_win_pct"],
-            away_trend["current_streak"],
-        ]
+        home = {**home_off, **home_def, **home_sit, **home_trend}
+        away = {**away_off, **away_def, **away_sit, **away_trend}
+        return self.combine_team_features(home, away)
+
+    @staticmethod
+    def combine_team_features(home: dict, away: dict) -> np.ndarray:
+        """
+        Lay out per-team feature dicts as a single game vector.
 
+        Both dicts must contain every name in TEAM_FEATURES. The result is
+        [home features..., away features...] in TEAM_FEATURES order, which
+        is exactly what get_feature_names() describes.
+        """
+        features = [home[name] for name in TEAM_FEATURES]
+        features += [away[name] for name in TEAM_FEATURES]
         return np.array(features, dtype=np.float32)
 
     @staticmethod
@@ -363,54 +364,9 @@ class FeatureExtractor:
         Return names of all features in order.
         Useful for feature importance analysis.
         """
-        prefixes = ["home", "away"]
-        names = []
-
-        for prefix in prefixes:
-            # Offensive
-            names.extend(
-                [
-                    f"{prefix}_off_pass_yards",
-                    f"{prefix}_off_pass_tds",
-                    f"{prefix}_off_completion_pct",
-                    f"{prefix}_off_rush_yards",
-                    f"{prefix}_off_rush_tds",
-                    f"{prefix}_off_total_yards",
-                    f"{prefix}_off_points_scored",
-                    f"{prefix}_off_turnovers",
-                ]
-            )
-            # Defensive
-            names.extend(
-                [
-                    f"{prefix}_def_pass_yards_allowed",
-                    f"{prefix}_def_rush_yards_allowed",
-                    f"{prefix}_def_total_yards_allowed",
-                    f"{prefix}_def_points_allowed",
-                    f"{prefix}_def_sacks",
-                    f"{prefix}_def_interceptions",
-                    f"{prefix}_def_turnovers_forced",
-                ]
-            )
-            # Situational
-            names.extend(
-                [
-                    f"{prefix}_is_home",
-                    f"{prefix}_temperature",
-                    f"{prefix}_wind",
-                    f"{prefix}_is_dome",
-                    f"{prefix}_rest_days",
-                ]
-            )
-            # Trends
-            names.extend(
-                [
-                    f"{prefix}_recent_win_pct",
-                    f"{prefix}_current_streak",
-                ]
-            )
-
-        return names
+        return [
+            f"{prefix}_{name}" for prefix in ("home", "away") for name in TEAM_FEATURES
+        ]
 
 
 class InsufficientDataError(Exception):
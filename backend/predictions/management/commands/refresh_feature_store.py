@@ -0,0 +1,56 @@
+"""
+Django Management Command: Refresh Feature Store
+
+Rebuilds the precomputed team feature snapshots used to serve predictions
+(see predictions/feature_store.py). seed_stats refreshes the teams it
+touches automatically; use this for a full backfill or after changing
+feature definitions.
+
+Usage:
+    python manage.py refresh_feature_store
+    python manage.py refresh_feature_store --team 12 --since 2025-09-01
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.feature_store import refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild precomputed team feature snapshots for predictions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team",
+            type=int,
+            action="append",
+            default=None,
+            help="Team ID to refresh (repeatable, default: all teams)",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            default=None,
+            help="Only rebuild snapshots for games on/after this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--num-games",
+            type=int,
+            default=5,
+            help="Number of prior games averaged in each snapshot (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError(f"Invalid --since date: {options['since']}")
+
+        count = refresh_snapshots(
+            team_ids=options["team"], since=since, num_games=options["num_games"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {count} feature snapshots"))
@@ -63,6 +63,11 @@ class Command(BaseCommand):
             default=5,
             help="Number of prior games to use for feature averaging (default: 5)",
         )
+        parser.add_argument(
+            "--per-game-features",
+            action="store_true",
+            help="Extract features one game at a time instead of in bulk (slow)",
+        )
 
     def handle(self, *args, **options):
         start_season = options["start_season"]
@@ -92,7 +97,9 @@ class Command(BaseCommand):
         builder = TrainingDataBuilder(seasons=seasons, num_games_for_features=num_games)
 
         try:
-            X, y_winner, y_spread, y_total = builder.build()
+            X, y_winner, y_spread, y_total = builder.build(
+                bulk=not options["per_game_features"]
+            )
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error building training data: {e}"))
             return
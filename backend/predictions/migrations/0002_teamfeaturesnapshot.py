@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-17 12:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0006_delete_team_players"),
+        ("predictions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TeamFeatureSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("as_of_date", models.DateField()),
+                ("num_games", models.IntegerField(default=5)),
+                ("games_played", models.IntegerField(default=0)),
+                ("features", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feature_snapshots",
+                        to="teams.team",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="teamfeaturesnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("team", "num_games", "as_of_date"),
+                name="unique_team_feature_snapshot",
+            ),
+        ),
+    ]
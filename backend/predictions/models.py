@@ -77,3 +77,48 @@ class PredictionModelVersion(models.Model):
         PredictionModelVersion.objects.update(is_active=False)
         self.is_active = True
         self.save()
+
+
+class TeamFeatureSnapshot(models.Model):
+    """
+    Precomputed rolling features for a team right after one of its games.
+
+    Building features from raw game rows takes ~7 queries per team. Instead,
+    the seeding pipeline stores one snapshot per (team, game date) holding the
+    offensive, defensive and trend features that include that game. To predict
+    a game on date D we read the team's latest snapshot before D: one indexed
+    lookup instead of a pile of aggregates.
+
+    A snapshot is STALE when the team has played a completed game after
+    as_of_date but before D (new results landed and the snapshot wasn't
+    refreshed). See predictions/feature_store.py.
+    """
+
+    team = models.ForeignKey(
+        "teams.Team", on_delete=models.CASCADE, related_name="feature_snapshots"
+    )
+
+    # Date of the most recent game included in the snapshot
+    as_of_date = models.DateField()
+
+    # Number of games the rolling averages cover (FeatureExtractor.num_games)
+    num_games = models.IntegerField(default=5)
+
+    # Completed games the team had played up to and including as_of_date
+    games_played = models.IntegerField(default=0)
+
+    # Offensive, defensive and trend features keyed by feature name
+    features = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "num_games", "as_of_date"],
+                name="unique_team_feature_snapshot",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.team} features as of {self.as_of_date}"
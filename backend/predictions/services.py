@@ -15,17 +15,32 @@ prediction request. This speeds up Django startup.
 
 import logging
 
+import numpy as np
 from django.conf import settings
 from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+from api.cache_utils import (  # noqa: E402
+    ALL_STATS_TAG,
+    PREDICTIONS_TAG,
+    invalidate_tags,
+    key_version,
+)
 from games.models import Game  # noqa: E402
 
-from .features import FeatureExtractor, InsufficientDataError  # noqa: E402
+from .feature_store import TeamFeatureStore  # noqa: E402
+from .features import InsufficientDataError  # noqa: E402
 from .ml_models import GamePredictionModel  # noqa: E402
 from .models import PredictionModelVersion  # noqa: E402
 
+# Predictions go stale when the model changes or any stats land
+PREDICTION_TAGS = [PREDICTIONS_TAG, ALL_STATS_TAG]
+
+NO_MODEL_MESSAGE = (
+    "No trained model available. Run 'python manage.py train_model --activate' first."
+)
+
 
 class PredictionService:
     """
@@ -51,7 +66,8 @@ class PredictionService:
         return cls._instance
 
     def __init__(self):
-        self.feature_extractor = FeatureExtractor(num_games=5)
+        # Reads precomputed snapshots, falls back to FeatureExtractor
+        self.feature_store = TeamFeatureStore(num_games=5)
 
     def _load_model(self) -> bool:
         """
@@ -107,16 +123,14 @@ class PredictionService:
             ValueError: If game not found or prediction not possible
         """
         # Check cache first (use separate prefix for simulation)
-        cache_key = f'{"sim:" if simulate else ""}prediction:{game_id}'
+        cache_key = self._cache_key(game_id, simulate, key_version(PREDICTION_TAGS))
         cached = cache.get(cache_key)
         if cached:
             return cached
 
         # Load model if needed
         if not self._load_model():
-            raise ValueError(
-                "No trained model available. Run 'python manage.py train_model --activate' first."
-            )
+            raise ValueError(NO_MODEL_MESSAGE)
 
         # Get the game (Game model uses 'id' as primary key)
         try:
@@ -132,37 +146,12 @@ class PredictionService:
 
         # Extract features
         try:
-            features = self.feature_extractor.build_game_features(game)
+            features = self.feature_store.build_game_features(game)
         except InsufficientDataError as e:
             raise ValueError(f"Cannot make prediction: {e}")
 
-        # Make prediction
-        prediction = self._model.predict(features)
-
-        # Format response
-        result = {
-            "game_id": game_id,
-            "home_team": game.home_team.abbreviation if game.home_team else "UNK",
-            "away_team": game.away_team.abbreviation if game.away_team else "UNK",
-            "game_date": game.date.isoformat() if game.date else None,
-            "prediction": prediction,
-            "model_version": self._model_version,
-        }
-
-        # Include actual results when simulating a completed game
-        if simulate and game.home_score is not None:
-            home_score = game.home_score
-            away_score = game.away_score
-            result["actual"] = {
-                "home_score": home_score,
-                "away_score": away_score,
-                # Use "home"/"away" to match predicted_winner format from ml_models.py
-                "winner": (
-                    "home"
-                    if home_score > away_score
-                    else "away" if away_score > home_score else "TIE"
-                ),
-            }
+        # Make prediction and format response
+        result = self._format_prediction(game, self._model.predict(features), simulate)
 
         # Cache for 15 minutes
         cache_ttl = settings.CACHE_TTL.get("predictions", 900)
@@ -176,6 +165,11 @@ class PredictionService:
         """
         Make predictions for all games in a week.
 
+        Features for every game are stacked into one matrix so each model
+        runs once for the whole week instead of once per game. The
+        per-game results are cached under the same keys predict_game()
+        uses, so later single-game requests are cache hits.
+
         Args:
             season: Season year (e.g., 2025)
             week: Week number (1-18)
@@ -185,7 +179,8 @@ class PredictionService:
             List of prediction dictionaries for each game
         """
         # Check cache (use separate prefix for simulation)
-        cache_key = f'{"sim:" if simulate else ""}predictions:week:{season}:{week}'
+        cache_version = key_version(PREDICTION_TAGS)
+        cache_key = f'{"sim:" if simulate else ""}predictions:week:{season}:{week}:{cache_version}'
         cached = cache.get(cache_key)
         if cached:
             return cached
@@ -198,32 +193,104 @@ class PredictionService:
         if not simulate:
             games = games.filter(home_score__isnull=True)  # Only upcoming games
 
-        predictions = []
-        for game in games:
-            try:
-                pred = self.predict_game(game.id, simulate=simulate)
-                predictions.append(pred)
-            except ValueError as e:
-                # Skip games we can't predict
-                predictions.append(
-                    {
-                        "game_id": game.id,
-                        "home_team": (
-                            game.home_team.abbreviation if game.home_team else "UNK"
-                        ),
-                        "away_team": (
-                            game.away_team.abbreviation if game.away_team else "UNK"
-                        ),
-                        "error": str(e),
-                    }
+        games = list(games)
+        cached_games = cache.get_many(
+            [self._cache_key(game.id, simulate, cache_version) for game in games]
+        )
+        results = {}
+        to_predict = [
+            game
+            for game in games
+            if self._cache_key(game.id, simulate, cache_version) not in cached_games
+        ]
+
+        if to_predict and not self._load_model():
+            for game in to_predict:
+                results[game.id] = self._format_error(game, NO_MODEL_MESSAGE)
+            to_predict = []
+
+        # Build the week's feature matrix in one pass, skipping games we
+        # can't predict
+        rows = []
+        predictable = []
+        week_features = self.feature_store.build_many_game_features(to_predict)
+        for game, features in zip(to_predict, week_features):
+            if isinstance(features, InsufficientDataError):
+                results[game.id] = self._format_error(
+                    game, f"Cannot make prediction: {features}"
                 )
+                continue
+            rows.append(features)
+            predictable.append(game)
 
-        # Cache for 15 minutes
         cache_ttl = settings.CACHE_TTL.get("predictions", 900)
+        if rows:
+            # One predict call per model for the whole week
+            outputs = self._model.predict(np.vstack(rows))
+            if isinstance(outputs, dict):
+                outputs = [outputs]  # predict() unwraps single-row results
+
+            fresh = {}
+            for game, prediction in zip(predictable, outputs):
+                result = self._format_prediction(game, prediction, simulate)
+                results[game.id] = result
+                fresh[self._cache_key(game.id, simulate, cache_version)] = result
+            cache.set_many(fresh, cache_ttl)
+
+        predictions = [
+            cached_games.get(self._cache_key(game.id, simulate, cache_version))
+            or results[game.id]
+            for game in games
+        ]
+
+        # Cache for 15 minutes
         cache.set(cache_key, predictions, cache_ttl)
 
         return predictions
 
+    @staticmethod
+    def _cache_key(game_id: str, simulate: bool, cache_version: str) -> str:
+        """Per-game prediction cache key (shared by predict_game/predict_week)."""
+        return f'{"sim:" if simulate else ""}prediction:{game_id}:{cache_version}'
+
+    def _format_prediction(self, game: Game, prediction: dict, simulate: bool) -> dict:
+        """Wrap a model prediction with game info (and actual results when simulating)."""
+        result = {
+            "game_id": game.id,
+            "home_team": game.home_team.abbreviation if game.home_team else "UNK",
+            "away_team": game.away_team.abbreviation if game.away_team else "UNK",
+            "game_date": game.date.isoformat() if game.date else None,
+            "prediction": prediction,
+            "model_version": self._model_version,
+        }
+
+        # Include actual results when simulating a completed game
+        if simulate and game.home_score is not None:
+            home_score = game.home_score
+            away_score = game.away_score
+            result["actual"] = {
+                "home_score": home_score,
+                "away_score": away_score,
+                # Use "home"/"away" to match predicted_winner format from ml_models.py
+                "winner": (
+                    "home"
+                    if home_score > away_score
+                    else "away" if away_score > home_score else "TIE"
+                ),
+            }
+
+        return result
+
+    @staticmethod
+    def _format_error(game: Game, error: str) -> dict:
+        """Entry for a game in a week listing that couldn't be predicted."""
+        return {
+            "game_id": game.id,
+            "home_team": game.home_team.abbreviation if game.home_team else "UNK",
+            "away_team": game.away_team.abbreviation if game.away_team else "UNK",
+            "error": error,
+        }
+
     def get_model_info(self) -> dict:
         """
         Get information about the currently active model.
@@ -255,10 +322,9 @@ class PredictionService:
     @classmethod
     def clear_cache(cls):
         """Clear prediction cache (call after model retrain)."""
-        # Clear all prediction-related cache keys
-        # Note: This is a simple approach; for production, use cache versioning
-        cache.delete_pattern("prediction:*")
-        cache.delete_pattern("predictions:week:*")
+        # Prediction keys embed the predictions generation, so bumping it
+        # orphans all of them at once (works on Redis and LocMem alike)
+        invalidate_tags(PREDICTIONS_TAG)
 
     @classmethod
     def reload_model(cls):
@@ -17,6 +17,13 @@ For each historical game, we create:
 - y_spread: home_score - away_score (e.g., 7 means home won by 7)
 - y_total: home_score + away_score (e.g., 45 total points)
 
+BULK VS PER-GAME FEATURES:
+--------------------------
+By default features come from BulkFeatureBuilder, which loads all games and
+team stats once and computes every game's features with array operations.
+The per-game path (FeatureExtractor.build_game_features) produces the same
+matrix but runs ~14 queries per game; it is kept for debugging and parity checks.
+
 WHY EXCLUDE EARLY SEASON GAMES?
 -------------------------------
 The feature extractor needs historical data to calculate averages.
@@ -29,6 +36,7 @@ from tqdm import tqdm
 
 from games.models import Game
 
+from .bulk_features import BulkFeatureBuilder
 from .features import FeatureExtractor, InsufficientDataError
 
 
@@ -48,10 +56,11 @@ class TrainingDataBuilder:
             num_games_for_features: How many prior games to average for features
         """
         self.seasons = seasons
+        self.num_games_for_features = num_games_for_features
         self.feature_extractor = FeatureExtractor(num_games=num_games_for_features)
 
     def build(
-        self, min_week: int = 4
+        self, min_week: int = 4, bulk: bool = True
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Build training data from completed historical games.
@@ -59,6 +68,8 @@ class TrainingDataBuilder:
         Args:
             min_week: Minimum week number to include (earlier weeks have
                      insufficient history for reliable features)
+            bulk: Compute features in one vectorized pass (default) instead of
+                  querying the database for every game
 
         Returns:
             Tuple of (X, y_winner, y_spread, y_total):
@@ -77,43 +88,34 @@ class TrainingDataBuilder:
             .order_by("date")
         )
 
-        print(f"Found {games.count()} games from seasons {self.seasons}")
+        games = list(games)
+        print(f"Found {len(games)} games from seasons {self.seasons}")
         print("Extracting features (this may take a moment)...")
 
-        X_list = []
-        y_winner_list = []
-        y_spread_list = []
-        y_total_list = []
-
-        skipped_count = 0
+        if bulk:
+            X_all, valid = BulkFeatureBuilder(
+                num_games=self.num_games_for_features
+            ).build(games)
+        else:
+            X_all, valid = self._build_per_game(games)
 
-        for game in tqdm(games, desc="Processing games"):
-            try:
-                # Extract features for this game
-                features = self.feature_extractor.build_game_features(game)
+        kept_games = [game for game, ok in zip(games, valid) if ok]
+        skipped_count = len(games) - len(kept_games)
 
-                # Calculate target values
-                home_win = 1 if game.home_score > game.away_score else 0
-                spread = game.home_score - game.away_score
-                total = game.home_score + game.away_score
-
-                X_list.append(features)
-                y_winner_list.append(home_win)
-                y_spread_list.append(spread)
-                y_total_list.append(total)
-
-            except InsufficientDataError:
-                # Skip games where we don't have enough history
-                skipped_count += 1
-                continue
+        # Calculate target values
+        X = X_all[valid]
+        y_winner_list = [
+            1 if game.home_score > game.away_score else 0 for game in kept_games
+        ]
+        y_spread_list = [game.home_score - game.away_score for game in kept_games]
+        y_total_list = [game.home_score + game.away_score for game in kept_games]
 
         if skipped_count > 0:
             print(f"Skipped {skipped_count} games due to insufficient historical data")
 
-        print(f"Successfully processed {len(X_list)} games")
+        print(f"Successfully processed {len(X)} games")
 
         # Convert lists to numpy arrays
-        X = np.array(X_list, dtype=np.float32)
         y_winner = np.array(y_winner_list, dtype=np.int32)
         y_spread = np.array(y_spread_list, dtype=np.float32)
         y_total = np.array(y_total_list, dtype=np.float32)
@@ -128,6 +130,26 @@ class TrainingDataBuilder:
 
         return X, y_winner, y_spread, y_total
 
+    def _build_per_game(self, games: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extract features one game at a time with FeatureExtractor.
+
+        Returns the same (X, valid) pair as BulkFeatureBuilder.build().
+        """
+        num_features = len(FeatureExtractor.get_feature_names())
+        X = np.zeros((len(games), num_features), dtype=np.float32)
+        valid = np.zeros(len(games), dtype=bool)
+
+        for i, game in enumerate(tqdm(games, desc="Processing games")):
+            try:
+                X[i] = self.feature_extractor.build_game_features(game)
+                valid[i] = True
+            except InsufficientDataError:
+                # Skip games where we don't have enough history
+                continue
+
+        return X, valid
+
 
 def train_test_split_by_season(
     games_seasons: list[int], test_season: int
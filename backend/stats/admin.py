@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import FootballPlayerGameStat
+from .models import FootballPlayerGameStat, PlayerRollingStat
 
 admin.site.register(FootballPlayerGameStat)
+admin.site.register(PlayerRollingStat)
@@ -0,0 +1,467 @@
+"""
+In-Process Stats Cube
+
+Team analytics (recent stats, defense allowed, player stats, usage metrics,
+player trends) each aggregate a handful of rows out of the same ~50k player
+and ~600 team stat lines per season, and each asks the database again.
+
+WHY:
+----
+The whole stats table fits comfortably in memory as NumPy columns (a few MB
+per season), and it only changes when a sync writes new rows. Loading it
+once per worker turns each analytics read into a few array slices.
+
+HOW IT WORKS:
+-------------
+- Games are sorted by date; player and team stat rows are sorted by game,
+  so "rows in these games" is a set of contiguous slices and "a team's last
+  N games" is the tail of a per-team index
+- Stat values live in one float64 matrix per table, columns by field name
+- get_stats_cube() returns a process-wide cube, rebuilt when the stats or
+  calendar cache tags move (one cache read per call), or None when
+  settings.STATS_CUBE_ENABLED is off, in which case callers use the ORM
+
+Each method returns the same shapes the ORM aggregates in
+api/viewsets/analytics.py produce, so views format both paths identically.
+`manage.py benchmark_stats_cube` compares the two.
+"""
+
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from api.cache_utils import ALL_STATS_TAG, CALENDAR_TAG, key_version
+from games.models import Game
+from players.models import Player
+from teams.models import Team
+
+from .models import FootballPlayerGameStat, FootballTeamGameStat
+
+PLAYER_COLUMNS = (
+    "rush_attempts",
+    "rush_yards",
+    "rush_touchdowns",
+    "pass_attempts",
+    "pass_completions",
+    "pass_yards",
+    "pass_touchdowns",
+    "interceptions",
+    "sacks",
+    "targets",
+    "receptions",
+    "receiving_yards",
+    "receiving_touchdowns",
+    "fantasy_points_ppr",
+    "snap_count",
+    "snap_pct",
+    "air_yards",
+    "yards_after_catch",
+)
+
+TEAM_COLUMNS = (
+    "pass_attempts",
+    "pass_completions",
+    "pass_yards",
+    "pass_touchdowns",
+    "rush_attempts",
+    "rush_yards",
+    "rush_touchdowns",
+    "interceptions",
+    "fumbles_lost",
+    "def_interceptions",
+    "def_fumbles_forced",
+)
+
+# Float fields; everything else is returned as int like the ORM does
+FLOAT_COLUMNS = {"fantasy_points_ppr", "snap_pct", "air_yards", "yards_after_catch"}
+
+NO_TEAM = -1  # team column value for stat rows without a team
+
+# player_stats names for averaged columns (the rest keep the field name)
+AVERAGE_NAMES = {
+    "fantasy_points_ppr": "fantasy_points",
+    "snap_count": "avg_snap_count",
+    "snap_pct": "avg_snap_pct",
+    "air_yards": "avg_air_yards",
+    "yards_after_catch": "avg_yac",
+}
+
+
+def _value(column, value):
+    return float(value) if column in FLOAT_COLUMNS else int(value)
+
+
+class StatsCube:
+    """Columnar, read-only snapshot of games and stat rows."""
+
+    def __init__(self):
+        self._load_games()
+        self._load_player_stats()
+        self._load_team_stats()
+
+    def _load_games(self):
+        rows = list(
+            Game.objects.order_by("date", "id").values_list(
+                "id", "week", "home_team_id", "away_team_id", "home_score", "away_score"
+            )
+        )
+        self.game_ids = [row[0] for row in rows]
+        self.game_index = {game_id: i for i, game_id in enumerate(self.game_ids)}
+        self.game_week = np.array([row[1] for row in rows], dtype=np.int16)
+        self.home_team = np.array([row[2] for row in rows], dtype=np.int64)
+        self.away_team = np.array([row[3] for row in rows], dtype=np.int64)
+        self.home_score = np.array([row[4] for row in rows], dtype=np.float64)
+        self.away_score = np.array([row[5] for row in rows], dtype=np.float64)
+        self.completed = ~np.isnan(self.home_score)
+        self.team_abbreviations = dict(Team.objects.values_list("id", "abbreviation"))
+
+    def _load_player_stats(self):
+        rows = list(
+            FootballPlayerGameStat.objects.values_list(
+                "player_id", "game_id", "team_id", "position", *PLAYER_COLUMNS
+            )
+        )
+        game = np.array([self.game_index[row[1]] for row in rows], dtype=np.int32)
+        order = np.argsort(game, kind="stable")
+
+        self.player_game = game[order]
+        self.player_ids = np.array([row[0] for row in rows], dtype=object)[order]
+        self.player_team = np.array(
+            [NO_TEAM if row[2] is None else row[2] for row in rows], dtype=np.int64
+        )[order]
+        self.player_position = np.array([row[3] for row in rows], dtype="U8")[order]
+        self.player_values = np.array(
+            [row[4:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(PLAYER_COLUMNS))[order]
+        self.player_column = {name: i for i, name in enumerate(PLAYER_COLUMNS)}
+
+        # Row range of each game: rows of game g are [bounds[g], bounds[g + 1])
+        self._game_bounds = np.searchsorted(
+            self.player_game, np.arange(len(self.game_ids) + 1)
+        )
+        self._player_rows = {}
+        for row, player_id in enumerate(self.player_ids):
+            self._player_rows.setdefault(player_id, []).append(row)
+        self.player_names = dict(
+            Player.objects.filter(id__in=self._player_rows).values_list("id", "name")
+        )
+
+    def _load_team_stats(self):
+        rows = list(
+            FootballTeamGameStat.objects.values_list(
+                "team_id", "game_id", *TEAM_COLUMNS
+            )
+        )
+        game = np.array([self.game_index[row[1]] for row in rows], dtype=np.int32)
+        order = np.argsort(game, kind="stable")
+
+        self.team_game = game[order]
+        self.team_values = np.array(
+            [row[2:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(TEAM_COLUMNS))[order]
+        self.team_column = {name: i for i, name in enumerate(TEAM_COLUMNS)}
+        team = np.array([row[0] for row in rows], dtype=np.int64)[order]
+        # Each team's stat rows, oldest game first
+        self._team_rows = {
+            int(team_id): np.flatnonzero(team == team_id) for team_id in np.unique(team)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the NumPy columns"""
+        return sum(
+            array.nbytes
+            for array in vars(self).values()
+            if isinstance(array, np.ndarray)
+        )
+
+    # ---- Slices ----
+
+    def recent_games(self, team_id, num_games):
+        """Indices of the team's last N completed games, newest first"""
+        played = np.flatnonzero(
+            self.completed & ((self.home_team == team_id) | (self.away_team == team_id))
+        )
+        return played[::-1][:num_games]
+
+    def _rows_in_games(self, games):
+        bounds = self._game_bounds
+        if not len(games):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(bounds[g], bounds[g + 1]) for g in games])
+
+    def _recent_team_rows(self, team_id, num_games):
+        """Team stat rows for the team's last N stat lines, newest first"""
+        return self._team_rows.get(int(team_id), np.empty(0, dtype=np.int64))[::-1][
+            :num_games
+        ]
+
+    def _team_mean(self, rows, column):
+        if not len(rows):
+            return None
+        return float(self.team_values[rows, self.team_column[column]].mean())
+
+    def _player_sum(self, rows, column):
+        if not len(rows):
+            return None
+        return _value(
+            column, self.player_values[rows, self.player_column[column]].sum()
+        )
+
+    def _group_by_player(self, rows):
+        """(player_id, position) groups of rows: [(player_id, position, rows), ...]"""
+        if not len(rows):
+            return []
+        keys = np.char.add(
+            self.player_ids[rows].astype(str),
+            np.char.add("|", self.player_position[rows]),
+        )
+        groups = []
+        unique, inverse = np.unique(keys, return_inverse=True)
+        for i in range(len(unique)):
+            group = rows[inverse == i]
+            groups.append(
+                (self.player_ids[group[0]], str(self.player_position[group[0]]), group)
+            )
+        return groups
+
+    # ---- Analytics aggregates ----
+
+    def team_recent_stats(self, team_id, num_games) -> dict:
+        """recent_stats aggregates over the team's last N stat lines"""
+        team_id = int(team_id)
+        rows = self._recent_team_rows(team_id, num_games)
+        values = self.team_values[rows]
+        col = self.team_column
+
+        attempts = values[:, col["pass_attempts"]]
+        with_attempts = attempts > 0
+        completion_pct = (
+            float(
+                (
+                    values[with_attempts, col["pass_completions"]]
+                    * 100.0
+                    / attempts[with_attempts]
+                ).mean()
+            )
+            if with_attempts.any()
+            else None
+        )
+
+        # Points scored in the same games (unplayed games don't count)
+        games = self.team_game[rows]
+        points = np.where(
+            self.home_team[games] == team_id,
+            self.home_score[games],
+            self.away_score[games],
+        )
+        points = points[~np.isnan(points)]
+
+        return {
+            "pass_att": self._team_mean(rows, "pass_attempts"),
+            "pass_yds": self._team_mean(rows, "pass_yards"),
+            "pass_tds": self._team_mean(rows, "pass_touchdowns"),
+            "completion_pct": completion_pct,
+            "rush_att": self._team_mean(rows, "rush_attempts"),
+            "rush_yds": self._team_mean(rows, "rush_yards"),
+            "rush_tds": self._team_mean(rows, "rush_touchdowns"),
+            "total_yards": (
+                float(
+                    (values[:, col["rush_yards"]] + values[:, col["pass_yards"]]).mean()
+                )
+                if len(rows)
+                else None
+            ),
+            "off_turnovers_total": (
+                int(values[:, [col["interceptions"], col["fumbles_lost"]]].sum())
+                if len(rows)
+                else None
+            ),
+            "def_turnovers_total": (
+                int(
+                    values[
+                        :, [col["def_interceptions"], col["def_fumbles_forced"]]
+                    ].sum()
+                )
+                if len(rows)
+                else None
+            ),
+            "points": float(points.mean()) if len(points) else None,
+        }
+
+    def defense_allowed(self, team_id, num_games, position):
+        """
+        defense_allowed sums: what players at a position put up against the
+        team in its last N completed games.
+
+        Returns:
+            (games analyzed, {aggregate: sum or None})
+        """
+        team_id = int(team_id)
+        games = self.recent_games(team_id, num_games)
+        rows = self._rows_in_games(games)
+        rows = rows[
+            (self.player_position[rows] == position)
+            & (self.player_team[rows] != team_id)
+        ]
+
+        yards = self.player_values[rows][
+            :,
+            [
+                self.player_column["rush_yards"],
+                self.player_column["receiving_yards"],
+                self.player_column["pass_yards"],
+            ],
+        ]
+        return len(games), {
+            "rush_att": self._player_sum(rows, "rush_attempts"),
+            "rush_yds": self._player_sum(rows, "rush_yards"),
+            "rush_tds": self._player_sum(rows, "rush_touchdowns"),
+            "targets": self._player_sum(rows, "targets"),
+            "rec_receptions": self._player_sum(rows, "receptions"),
+            "rec_yds": self._player_sum(rows, "receiving_yards"),
+            "rec_tds": self._player_sum(rows, "receiving_touchdowns"),
+            "pass_att": self._player_sum(rows, "pass_attempts"),
+            "pass_comp": self._player_sum(rows, "pass_completions"),
+            "pass_yds": self._player_sum(rows, "pass_yards"),
+            "pass_tds": self._player_sum(rows, "pass_touchdowns"),
+            "interceptions": self._player_sum(rows, "interceptions"),
+            "sacks": self._player_sum(rows, "sacks"),
+            "fantasy_pts": self._player_sum(rows, "fantasy_points_ppr"),
+            "total_yards_allowed": int(yards.sum()) if len(rows) else None,
+        }
+
+    def _team_rows_in_recent_games(self, team_id, num_games):
+        team_id = int(team_id)
+        games = self.recent_games(team_id, num_games)
+        rows = self._rows_in_games(games)
+        return games, rows[self.player_team[rows] == team_id]
+
+    def team_player_averages(self, team_id, num_games):
+        """
+        player_stats averages: each of the team's players over its last N
+        completed games.
+
+        Returns:
+            (games analyzed, [{"player_id", "player__name", "position",
+            <average per PLAYER_COLUMNS field, see AVERAGE_NAMES>,
+            "games_played"}, ...])
+        """
+        games, rows = self._team_rows_in_recent_games(team_id, num_games)
+        players = []
+        for player_id, position, group in self._group_by_player(rows):
+            averages = self.player_values[group].mean(axis=0)
+            players.append(
+                {
+                    "player_id": player_id,
+                    "player__name": self.player_names.get(player_id),
+                    "position": position,
+                    **{
+                        AVERAGE_NAMES.get(name, name): float(averages[i])
+                        for name, i in self.player_column.items()
+                    },
+                    "games_played": len(group),
+                }
+            )
+        return len(games), players
+
+    def usage(self, team_id, num_games):
+        """
+        usage_metrics inputs over the team's last N games.
+
+        Returns:
+            ({"pass_att", "rush_att"} averages over its last N stat lines,
+            [{"player_id", "player__name", "position", "total_targets"}] for
+            WR/TE, [{..., "total_carries"}] for RBs)
+        """
+        team_rows = self._recent_team_rows(team_id, num_games)
+        team_stats = {
+            "pass_att": self._team_mean(team_rows, "pass_attempts"),
+            "rush_att": self._team_mean(team_rows, "rush_attempts"),
+        }
+
+        _, rows = self._team_rows_in_recent_games(team_id, num_games)
+        targets, carries = [], []
+        for player_id, position, group in self._group_by_player(rows):
+            entry = {
+                "player_id": player_id,
+                "player__name": self.player_names.get(player_id),
+                "position": position,
+            }
+            if position in ("WR", "TE"):
+                targets.append(
+                    {**entry, "total_targets": self._player_sum(group, "targets")}
+                )
+            elif position == "RB":
+                carries.append(
+                    {**entry, "total_carries": self._player_sum(group, "rush_attempts")}
+                )
+        return team_stats, targets, carries
+
+    def player_games(self, player_id, team_id, num_games):
+        """
+        player_trend rows: the player's lines in his team's last N completed
+        games, oldest first.
+
+        Returns:
+            [{"week", "opponent", <PLAYER_COLUMNS field>: value}, ...]
+        """
+        team_id = int(team_id) if team_id is not None else NO_TEAM
+        games = set(self.recent_games(team_id, num_games).tolist())
+        lines = []
+        for row in self._player_rows.get(player_id, ()):
+            game = int(self.player_game[row])
+            if game not in games:
+                continue
+            home = self.home_team[game] == team_id
+            opponent = self.away_team[game] if home else self.home_team[game]
+            lines.append(
+                {
+                    "week": int(self.game_week[game]),
+                    "opponent": self.team_abbreviations.get(int(opponent)),
+                    **{
+                        name: _value(name, self.player_values[row, i])
+                        for name, i in self.player_column.items()
+                    },
+                }
+            )
+        return lines
+
+
+class _CubeLoader:
+    """Process-wide cube, rebuilt when stats or games change."""
+
+    def __init__(self):
+        self._cube = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self) -> StatsCube:
+        version = key_version([ALL_STATS_TAG, CALENDAR_TAG])
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._cube = StatsCube()
+                    self._version = version
+        return self._cube
+
+    def reset(self):
+        with self._lock:
+            self._cube = None
+            self._version = None
+
+
+_loader = _CubeLoader()
+
+
+def get_stats_cube():
+    """The current StatsCube, or None when settings.STATS_CUBE_ENABLED is off"""
+    if not getattr(settings, "STATS_CUBE_ENABLED", False):
+        return None
+    return _loader.get()
+
+
+def reset_stats_cube():
+    """Drop the loaded cube; the next get_stats_cube() rebuilds it"""
+    _loader.reset()
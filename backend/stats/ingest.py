@@ -0,0 +1,451 @@
+"""
+Bulk stat ingestion for seed_stats.
+
+The nflreadpy frames are reshaped entirely in Polars (game ID resolution,
+snap count join, column mapping) and then written with chunked
+bulk_create(update_conflicts=True), so a season costs a handful of queries
+instead of several per row.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date
+
+import nflreadpy as nfl
+import polars as pl
+
+from games.models import Game
+from players.constants import OFFENSIVE_POS
+from players.models import Player
+from predictions.feature_store import refresh_snapshots
+from teams.constants import TEAM_IDS
+from teams.models import Team
+
+from .models import FootballPlayerGameStat, FootballTeamGameStat
+from .rolling import refresh_rolling_stats
+from .scoring import FORMAT_COLUMNS, format_points
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... ON CONFLICT statement
+WRITE_BATCH_SIZE = 1000
+
+# FootballPlayerGameStat field -> load_player_stats column
+PLAYER_STAT_COLUMNS = {
+    "pass_completions": "completions",
+    "pass_attempts": "attempts",
+    "pass_yards": "passing_yards",
+    "pass_touchdowns": "passing_tds",
+    "interceptions": "passing_interceptions",
+    "sacks": "sacks_suffered",
+    "sack_yards_loss": "sack_yards_lost",
+    "rush_attempts": "carries",
+    "rush_yards": "rushing_yards",
+    "rush_touchdowns": "rushing_tds",
+    "receptions": "receptions",
+    "targets": "targets",
+    "receiving_yards": "receiving_yards",
+    "receiving_touchdowns": "receiving_tds",
+    "fumbles": ["sack_fumbles", "rushing_fumbles", "receiving_fumbles"],
+    # What fantasy scoring charges for
+    "fumbles_lost": [
+        "sack_fumbles_lost",
+        "rushing_fumbles_lost",
+        "receiving_fumbles_lost",
+    ],
+    "two_pt": [
+        "passing_2pt_conversions",
+        "rushing_2pt_conversions",
+        "receiving_2pt_conversions",
+    ],
+    "fantasy_points_ppr": "fantasy_points_ppr",
+    "air_yards": "receiving_air_yards",
+    "yards_after_catch": "receiving_yards_after_catch",
+}
+
+# FootballTeamGameStat field -> load_team_stats column(s) (lists are summed)
+TEAM_STAT_COLUMNS = {
+    "pass_attempts": "attempts",
+    "pass_completions": "completions",
+    "pass_yards": "passing_yards",
+    "pass_touchdowns": "passing_tds",
+    "rush_attempts": "carries",
+    "rush_yards": "rushing_yards",
+    "rush_touchdowns": "rushing_tds",
+    "interceptions": "passing_interceptions",
+    "sacks": "sacks_suffered",
+    "fumbles": ["sack_fumbles", "rushing_fumbles", "receiving_fumbles"],
+    "fumbles_lost": [
+        "sack_fumbles_lost",
+        "rushing_fumbles_lost",
+        "receiving_fumbles_lost",
+    ],
+    "receptions": "receptions",
+    "receiving_yards": "receiving_yards",
+    "receiving_touchdowns": "receiving_tds",
+    "special_teams_touchdowns": "special_teams_tds",
+    "def_tackles_for_loss": "def_tackles_for_loss",
+    "def_fumbles_forced": "def_fumbles_forced",
+    "def_sacks": "def_sacks",
+    "def_qb_hits": "def_qb_hits",
+    "def_interceptions": "def_interceptions",
+    "def_touchdowns": "def_tds",
+    "penalties": "penalties",
+    "penalty_yards": "penalty_yards",
+    "fg_attempts": "fg_att",
+    "fg_made": "fg_made",
+}
+
+# Snap counts are matched to player stats on these columns
+SNAP_JOIN_KEYS = ["player_id", "season", "week"]
+
+
+def resolve_game_ids(df: pl.DataFrame, game_ids) -> pl.DataFrame:
+    """
+    Add a game_id column and drop rows whose game isn't in the database.
+
+    Game IDs look like '2025_01_AWAY_HOME', but stat rows only say which
+    team and opponent, so both orderings are tried.
+    """
+    prefix = pl.concat_str(
+        [
+            pl.col("season").cast(pl.Utf8),
+            pl.col("week").cast(pl.Utf8).str.zfill(2),
+        ],
+        separator="_",
+    )
+    team_first = pl.concat_str(
+        [prefix, pl.col("team"), pl.col("opponent_team")], separator="_"
+    )
+    opponent_first = pl.concat_str(
+        [prefix, pl.col("opponent_team"), pl.col("team")], separator="_"
+    )
+    known = pl.Series(list(game_ids), dtype=pl.Utf8)
+
+    return df.with_columns(
+        pl.when(team_first.is_in(known))
+        .then(team_first)
+        .when(opponent_first.is_in(known))
+        .then(opponent_first)
+        .otherwise(None)
+        .alias("game_id")
+    ).filter(pl.col("game_id").is_not_null())
+
+
+def prepare_player_stats(
+    player_stats_df: pl.DataFrame, snap_counts_df, player_ids, game_ids, team_ids
+) -> pl.DataFrame:
+    """
+    Shape load_player_stats() rows into FootballPlayerGameStat columns.
+
+    Keeps offensive players that exist in the database, resolves game IDs,
+    records the team and position the player had in that game, and
+    left-joins snap counts (0 when missing).
+    """
+    df = player_stats_df.filter(
+        pl.col("position").is_in(OFFENSIVE_POS)
+        & pl.col("player_id").is_in(pl.Series(list(player_ids), dtype=pl.Utf8))
+    )
+    df = resolve_game_ids(df, game_ids)
+    df = df.join(_known_teams(team_ids), on="team", how="left")
+
+    if snap_counts_df is not None and set(SNAP_JOIN_KEYS) <= set(
+        snap_counts_df.columns
+    ):
+        snaps = snap_counts_df.select(
+            pl.col("player_id").cast(pl.Utf8),
+            pl.col("season").cast(df.schema["season"]),
+            pl.col("week").cast(df.schema["week"]),
+            pl.col("offense_snaps").alias("snap_count"),
+            pl.col("offense_pct").alias("snap_pct"),
+        ).unique(subset=SNAP_JOIN_KEYS, keep="first")
+        df = df.join(snaps, on=SNAP_JOIN_KEYS, how="left")
+    else:
+        df = df.with_columns(
+            pl.lit(0).alias("snap_count"), pl.lit(0.0).alias("snap_pct")
+        )
+
+    df = df.select(
+        pl.col("player_id"),
+        pl.col("game_id"),
+        pl.col("team_id"),
+        pl.col("position").cast(pl.Utf8),
+        *[
+            _column(df, source).alias(field)
+            for field, source in PLAYER_STAT_COLUMNS.items()
+        ],
+        pl.col("snap_count").fill_null(0),
+        pl.col("snap_pct").fill_null(0.0),
+    )
+    # Other built-in scoring formats, so rankings by format are column reads
+    df = df.with_columns(
+        format_points(scoring, pl.col("fantasy_points_ppr"), pl.col("receptions"))
+        .cast(pl.Float64)
+        .alias(column)
+        for scoring, column in FORMAT_COLUMNS.items()
+        if scoring != "PPR"
+    )
+    # Later rows win, like repeated update_or_create calls did
+    df = df.unique(subset=["player_id", "game_id"], keep="last", maintain_order=True)
+    return _with_source_hash(df, ["player_id", "game_id"])
+
+
+def _known_teams(team_ids) -> pl.DataFrame:
+    """Team abbreviation -> team_id frame, limited to teams in the database."""
+    # TEAM_IDS values are zero-padded strings ("0200" -> team 200)
+    return (
+        pl.DataFrame(
+            {"team": list(TEAM_IDS.keys()), "team_id": list(TEAM_IDS.values())},
+            schema={"team": pl.Utf8, "team_id": pl.Utf8},
+        )
+        .with_columns(pl.col("team_id").cast(pl.Int64))
+        .filter(pl.col("team_id").is_in(pl.Series(list(team_ids), dtype=pl.Int64)))
+    )
+
+
+def prepare_team_stats(team_stats_df: pl.DataFrame, team_ids, game_ids) -> pl.DataFrame:
+    """Shape load_team_stats() rows into FootballTeamGameStat columns."""
+    df = team_stats_df.join(_known_teams(team_ids), on="team", how="inner")
+    df = resolve_game_ids(df, game_ids)
+
+    df = df.select(
+        pl.col("team_id"),
+        pl.col("game_id"),
+        *[
+            _column(df, source).alias(field)
+            for field, source in TEAM_STAT_COLUMNS.items()
+        ],
+    ).unique(subset=["team_id", "game_id"], keep="last", maintain_order=True)
+    return _with_source_hash(df, ["team_id", "game_id"])
+
+
+def _with_source_hash(df: pl.DataFrame, key_columns) -> pl.DataFrame:
+    """
+    Add a source_hash column fingerprinting each row's stat values.
+
+    Polars hashes are only stable within a Polars version; after an upgrade
+    every row looks changed once and is rewritten.
+    """
+    stat_columns = [column for column in df.columns if column not in key_columns]
+    return df.with_columns(
+        pl.struct(stat_columns).hash(seed=0).cast(pl.Utf8).alias("source_hash")
+    )
+
+
+def _column(df: pl.DataFrame, source) -> pl.Expr:
+    """Source column (or sum of columns), 0 when missing or null."""
+    if isinstance(source, list):
+        return pl.sum_horizontal([_column(df, name) for name in source])
+    if source not in df.columns:
+        return pl.lit(0)
+    return pl.col(source).fill_null(0)
+
+
+def write_stats(model, df: pl.DataFrame, unique_fields, on_progress=None) -> int:
+    """
+    Upsert a prepared frame in chunks with bulk_create(update_conflicts=True).
+
+    Args:
+        model: FootballPlayerGameStat or FootballTeamGameStat
+        df: Frame from prepare_player_stats / prepare_team_stats
+        unique_fields: Conflict target, e.g. ["player", "game"]
+        on_progress: Optional callback(written, total, rows_per_second)
+
+    Returns:
+        Number of rows written
+    """
+    key_columns = [f"{field}_id" for field in unique_fields]
+    update_fields = [column for column in df.columns if column not in key_columns]
+    total = len(df)
+    written = 0
+    start = time.perf_counter()
+
+    for chunk in df.iter_slices(n_rows=WRITE_BATCH_SIZE):
+        model.objects.bulk_create(
+            [model(**row) for row in chunk.iter_rows(named=True)],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        written += len(chunk)
+        if on_progress:
+            elapsed = time.perf_counter() - start
+            on_progress(written, total, written / elapsed if elapsed else 0.0)
+
+    return written
+
+
+@dataclass
+class StatSyncResult:
+    """What a stats sync wrote, and what downstream caches need to know."""
+
+    player_rows: int = 0  # Rows inserted or changed
+    player_unchanged: int = 0  # Rows skipped because their hash matched
+    player_skipped: int = 0  # Rows with no matching player/game
+    team_rows: int = 0
+    team_unchanged: int = 0
+    team_skipped: int = 0
+    changed_games: set = field(default_factory=set)
+    changed_teams: set = field(default_factory=set)  # Both sides of changed games
+    changed_players: set = field(default_factory=set)
+    # Both sides of games whose team stat lines changed, and the earliest
+    # such game date (what the prediction feature store needs to rebuild)
+    feature_teams: set = field(default_factory=set)
+    feature_since: date = None
+    elapsed: float = 0.0
+
+    @property
+    def changed_seasons(self) -> set:
+        # Game IDs start with the season: '2025_01_DAL_PHI'
+        return {int(game_id[:4]) for game_id in self.changed_games}
+
+
+def seed_stats_frames(
+    player_stats_df,
+    team_stats_df,
+    snap_counts_df=None,
+    week: int = None,
+    game_ids=None,
+    on_progress=None,
+) -> StatSyncResult:
+    """
+    Upsert player and team stats from nflreadpy frames.
+
+    Rows whose source_hash matches the stored row are not written, so
+    re-running over a mostly-unchanged season only touches what moved.
+
+    Args:
+        week: Only sync this week (frames are already limited to seasons)
+        game_ids: Only sync these games
+        on_progress: Optional callback(label, written, total, rows_per_second)
+    """
+    start = time.perf_counter()
+    if week is not None:
+        player_stats_df = player_stats_df.filter(pl.col("week") == week)
+        team_stats_df = team_stats_df.filter(pl.col("week") == week)
+
+    player_ids = set(Player.objects.values_list("id", flat=True))
+    games = {
+        game_id: (game_date, home_id, away_id)
+        for game_id, game_date, home_id, away_id in Game.objects.values_list(
+            "id", "date", "home_team_id", "away_team_id"
+        )
+    }
+    known_games = games.keys() if game_ids is None else set(game_ids) & games.keys()
+
+    def progress(label):
+        if on_progress is None:
+            return None
+        return lambda written, total, rate: on_progress(label, written, total, rate)
+
+    result = StatSyncResult()
+
+    team_ids = set(Team.objects.values_list("id", flat=True))
+    player_rows = prepare_player_stats(
+        player_stats_df, snap_counts_df, player_ids, known_games, team_ids
+    )
+    changed_players = drop_unchanged(FootballPlayerGameStat, player_rows, "player")
+    result.player_rows = write_stats(
+        FootballPlayerGameStat, changed_players, ["player", "game"], progress("player")
+    )
+    result.player_unchanged = len(player_rows) - len(changed_players)
+    offensive_rows = player_stats_df.filter(pl.col("position").is_in(OFFENSIVE_POS))
+    result.player_skipped = len(offensive_rows) - len(player_rows)
+
+    team_rows = prepare_team_stats(team_stats_df, team_ids, known_games)
+    changed_teams = drop_unchanged(FootballTeamGameStat, team_rows, "team")
+    result.team_rows = write_stats(
+        FootballTeamGameStat, changed_teams, ["team", "game"], progress("team")
+    )
+    result.team_unchanged = len(team_rows) - len(changed_teams)
+    result.team_skipped = len(team_stats_df) - len(team_rows)
+
+    result.changed_players = set(changed_players["player_id"].to_list())
+    result.changed_games = set(changed_players["game_id"].to_list()) | set(
+        changed_teams["game_id"].to_list()
+    )
+    for game_id in result.changed_games:
+        result.changed_teams.update(games[game_id][1:])
+    # A team's line feeds its own offensive features and its opponent's
+    # def_*_allowed features, so both sides of the game are rebuilt
+    feature_games = set(changed_teams["game_id"].to_list())
+    for game_id in feature_games:
+        result.feature_teams.update(games[game_id][1:])
+    feature_dates = [games[game_id][0] for game_id in feature_games]
+    result.feature_since = min(feature_dates) if feature_dates else None
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def drop_unchanged(model, df: pl.DataFrame, owner: str) -> pl.DataFrame:
+    """
+    Remove rows whose stored source_hash already matches.
+
+    Only hashes for the games in the frame are fetched (one query).
+    """
+    key = f"{owner}_id"
+    if df.is_empty():
+        return df
+
+    existing = model.objects.filter(
+        game_id__in=df["game_id"].unique().to_list()
+    ).values_list(key, "game_id", "source_hash")
+    existing_df = pl.DataFrame(
+        list(existing),
+        schema={key: df.schema[key], "game_id": pl.Utf8, "source_hash": pl.Utf8},
+        orient="row",
+    )
+    return df.join(existing_df, on=[key, "game_id", "source_hash"], how="anti")
+
+
+def sync_stats(
+    seasons, week: int = None, game_ids=None, on_progress=None, log=logger.info
+) -> StatSyncResult:
+    """
+    Download stats from nflreadpy and sync them (see seed_stats_frames).
+
+    Also rebuilds prediction feature snapshots for both teams of every game
+    whose team stat lines changed.
+
+    Args:
+        seasons: Seasons to download
+        week: Only sync this week
+        game_ids: Only sync these games
+        on_progress: Optional callback(label, written, total, rows_per_second)
+        log: Callable for status messages (logger by default)
+    """
+    seasons = sorted(seasons)
+    log(f"Loading stats for seasons: {seasons}")
+    player_stats_df = nfl.load_player_stats(seasons=seasons)
+    team_stats_df = nfl.load_team_stats(seasons=seasons)
+
+    # Load snap counts for advanced metrics
+    try:
+        snap_counts_df = nfl.load_snap_counts(seasons=seasons)
+        log("Loaded snap counts data")
+    except Exception as e:
+        log(f"Could not load snap counts: {e}")
+        snap_counts_df = None
+
+    result = seed_stats_frames(
+        player_stats_df,
+        team_stats_df,
+        snap_counts_df,
+        week=week,
+        game_ids=game_ids,
+        on_progress=on_progress,
+    )
+
+    if result.feature_teams:
+        snapshots = refresh_snapshots(
+            team_ids=result.feature_teams, since=result.feature_since
+        )
+        log(f"Feature store: {snapshots} snapshots refreshed")
+
+    if result.changed_players:
+        rolling = refresh_rolling_stats(result.changed_players)
+        log(f"Rolling stats: {rolling} aggregates refreshed")
+
+    return result
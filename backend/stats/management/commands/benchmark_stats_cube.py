@@ -0,0 +1,135 @@
+"""
+Django Management Command: Benchmark Stats Cube
+
+Times the cube-backed analytics actions (see stats/cube.py) against their
+ORM path for one team and player, and reports how long the cube takes to
+build and how much memory it holds. Responses are computed directly,
+bypassing the response cache, and compared for equality.
+
+Usage:
+    python manage.py benchmark_stats_cube
+    python manage.py benchmark_stats_cube --team 12 --games 5 --repeat 50
+"""
+
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.viewsets.analytics import AnalyticsViewSet
+from stats.cube import StatsCube, get_stats_cube
+from stats.models import FootballPlayerGameStat
+
+# Analytics action -> extra query params
+CUBE_ENDPOINTS = {
+    "recent_stats": {},
+    "defense_allowed": {"position": "WR"},
+    "player_stats": {},
+    "usage_metrics": {},
+    "player_trend": {},
+}
+
+
+class Command(BaseCommand):
+    help = "Compare latency and memory of the in-process stats cube vs. the ORM"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team",
+            type=int,
+            default=None,
+            help="Team ID for team endpoints (default: team of the latest stat row)",
+        )
+        parser.add_argument(
+            "--player",
+            type=str,
+            default=None,
+            help="Player ID for player_trend (default: player of the latest stat row)",
+        )
+        parser.add_argument(
+            "--games",
+            type=int,
+            default=3,
+            help="Games window passed to each endpoint (default: 3)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Times to run each endpoint for timing (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        latest = (
+            FootballPlayerGameStat.objects.exclude(team=None)
+            .order_by("-game__date")
+            .values("player_id", "team_id")
+            .first()
+        )
+        if latest is None:
+            raise CommandError("No player stats found; seed data first")
+        team_id = options["team"] or latest["team_id"]
+        player_id = options["player"] or latest["player_id"]
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        cube = StatsCube()
+        build_ms = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Cube: {len(cube.player_game)} player rows, "
+                f"{len(cube.team_game)} team rows"
+            )
+        )
+        self.stdout.write(
+            f"  build {build_ms:.1f} ms, arrays {cube.nbytes / 1024:.0f} KiB, "
+            f"peak while building {peak / 1024:.0f} KiB"
+        )
+
+        # Load the process-wide cube up front so timings exclude the build
+        with override_settings(STATS_CUBE_ENABLED=True):
+            get_stats_cube()
+
+        factory = APIRequestFactory()
+        viewset = AnalyticsViewSet()
+        mismatches = 0
+        for endpoint, params in CUBE_ENDPOINTS.items():
+            owner = {"player_id": player_id} if endpoint == "player_trend" else {}
+            query = {"team_id": team_id, "games": options["games"], **owner, **params}
+            # The undecorated action: always computes, never hits the cache
+            compute = getattr(AnalyticsViewSet, endpoint).__wrapped__
+
+            timings = {}
+            results = {}
+            for enabled in (False, True):
+                with override_settings(STATS_CUBE_ENABLED=enabled):
+                    start = time.perf_counter()
+                    for _ in range(options["repeat"]):
+                        request = Request(factory.get("/", query))
+                        results[enabled] = compute(viewset, request).data
+                    timings[enabled] = (
+                        (time.perf_counter() - start) * 1000 / options["repeat"]
+                    )
+
+            orm_ms, cube_ms = timings[False], timings[True]
+            line = (
+                f"{endpoint:<16} orm {orm_ms:8.2f} ms   cube {cube_ms:8.2f} ms   "
+                f"x{orm_ms / cube_ms if cube_ms else 0:.1f}"
+            )
+            if results[False] == results[True]:
+                self.stdout.write(line)
+            else:
+                mismatches += 1
+                self.stdout.write(self.style.WARNING(f"{line}   RESPONSES DIFFER"))
+
+        if mismatches:
+            self.stdout.write(
+                self.style.WARNING(f"{mismatches} endpoint(s) differ from the ORM")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Cube responses match the ORM"))
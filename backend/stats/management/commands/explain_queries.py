@@ -0,0 +1,123 @@
+"""
+Django Management Command: Explain Hot Queries
+
+Prints the query plan and average runtime for the lookups that analytics
+endpoints and the prediction feature extractor run most often, and flags
+any that fall back to a full table scan. Run it before and after index
+migrations to confirm the planner actually uses the new indexes.
+
+Usage:
+    python manage.py explain_queries
+    python manage.py explain_queries --team 12 --repeat 50 --analyze
+"""
+
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+
+from games.models import Game, TeamGameLog
+from stats.models import FootballPlayerGameStat, FootballTeamGameStat
+
+# "Seq Scan on games_game" (PostgreSQL) or "SCAN games_game" (SQLite)
+FULL_SCAN_PATTERN = re.compile(r"Seq Scan on (\w+)|\bSCAN (\w+)\s*$", re.MULTILINE)
+
+
+class Command(BaseCommand):
+    help = "Show query plans and timings for hot analytics/prediction queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team",
+            type=int,
+            default=None,
+            help="Team ID to use in team queries (default: home team of latest game)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Times to run each query for timing (default: 20)",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Use EXPLAIN ANALYZE (PostgreSQL only)",
+        )
+
+    def handle(self, *args, **options):
+        game = (
+            Game.objects.filter(home_score__isnull=False)
+            .order_by("-date")
+            .select_related("home_team")
+            .first()
+        )
+        if game is None:
+            raise CommandError("No completed games found; seed data first")
+
+        team_id = options["team"] or game.home_team_id
+        player_stat = FootballPlayerGameStat.objects.filter(game=game).first()
+        player_id = player_stat.player_id if player_stat else None
+
+        queries = {
+            "team recent games": Game.objects.filter(
+                Q(home_team_id=team_id) | Q(away_team_id=team_id),
+                date__lt=game.date,
+                home_score__isnull=False,
+            ).order_by("-date")[:5],
+            "team game log": TeamGameLog.objects.filter(
+                team_id=team_id, date__lt=game.date, result__isnull=False
+            ).order_by("-date")[:5],
+            "games in week": Game.objects.filter(season=game.season, week=game.week),
+            "team game stat": FootballTeamGameStat.objects.filter(
+                team_id=team_id, game_id=game.id
+            ),
+            "player game stat": FootballPlayerGameStat.objects.filter(
+                player_id=player_id, game_id=game.id
+            ),
+            "game stats by position": FootballPlayerGameStat.objects.filter(
+                game_id=game.id, position="WR"
+            ),
+            "team player stats": FootballPlayerGameStat.objects.filter(
+                team_id=team_id, game_id=game.id
+            ),
+        }
+
+        explain_options = {}
+        if options["analyze"]:
+            if connection.vendor != "postgresql":
+                raise CommandError("--analyze is only supported on PostgreSQL")
+            explain_options = {"analyze": True}
+
+        full_scans = 0
+        for name, queryset in queries.items():
+            plan = queryset.explain(**explain_options)
+
+            start = time.perf_counter()
+            for _ in range(options["repeat"]):
+                list(queryset)
+            avg_ms = (time.perf_counter() - start) * 1000 / options["repeat"]
+
+            scanned = sorted(
+                {pg or lite for pg, lite in FULL_SCAN_PATTERN.findall(plan)}
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({avg_ms:.2f} ms)"))
+            self.stdout.write(plan)
+            if scanned:
+                full_scans += 1
+                self.stdout.write(
+                    self.style.WARNING(f"Full table scan on: {', '.join(scanned)}")
+                )
+            self.stdout.write("")
+
+        if full_scans:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{full_scans}/{len(queries)} queries use a full table scan "
+                    "(expected on tiny tables; check against production-sized data)"
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("All queries use indexes"))
@@ -0,0 +1,32 @@
+"""
+Django Management Command: Refresh Rolling Stats
+
+Rebuilds the per-player rolling aggregates behind best-team and player
+search (see stats/rolling.py). seed_stats refreshes the players it touches
+automatically; use this for the initial backfill or a full rebuild.
+
+Usage:
+    python manage.py refresh_rolling_stats
+    python manage.py refresh_rolling_stats --player 00-0033873
+"""
+
+from django.core.management.base import BaseCommand
+
+from stats.rolling import refresh_rolling_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-player rolling stat aggregates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--player",
+            type=str,
+            action="append",
+            default=None,
+            help="Player ID to refresh (repeatable, default: all players)",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_rolling_stats(player_ids=options["player"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {count} rolling aggregates"))
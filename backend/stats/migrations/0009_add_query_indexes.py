@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:04
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def delete_duplicate_stats(apps, schema_editor):
+    """Keep the newest row for each (player, game) and (team, game) pair."""
+    for model_name, owner in (
+        ("FootballPlayerGameStat", "player"),
+        ("FootballTeamGameStat", "team"),
+    ):
+        model = apps.get_model("stats", model_name)
+        duplicates = (
+            model.objects.values(owner, "game")
+            .annotate(rows=Count("id"), keep_id=Max("id"))
+            .filter(rows__gt=1)
+        )
+        for row in duplicates:
+            model.objects.filter(**{owner: row[owner], "game": row["game"]}).exclude(
+                id=row["keep_id"]
+            ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0008_add_advanced_metrics"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_stats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="footballplayergamestat",
+            constraint=models.UniqueConstraint(
+                fields=("player", "game"), name="unique_player_game_stat"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="footballteamgamestat",
+            constraint=models.UniqueConstraint(
+                fields=("team", "game"), name="unique_team_game_stat"
+            ),
+        ),
+    ]
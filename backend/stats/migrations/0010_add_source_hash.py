@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0009_add_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="source_hash",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+        migrations.AddField(
+            model_name="footballteamgamestat",
+            name="source_hash",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("players", "0007_player_season"),
+        ("stats", "0010_add_source_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerRollingStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("window", models.PositiveSmallIntegerField()),
+                ("season", models.IntegerField()),
+                ("position", models.CharField(max_length=25)),
+                ("games_played", models.PositiveIntegerField(default=0)),
+                ("total_fantasy_points", models.FloatField(default=0.0)),
+                ("avg_fantasy_points", models.FloatField(default=0.0)),
+                ("avg_targets", models.FloatField(default=0.0)),
+                ("avg_receptions", models.FloatField(default=0.0)),
+                ("avg_receiving_yards", models.FloatField(default=0.0)),
+                ("avg_rush_attempts", models.FloatField(default=0.0)),
+                ("avg_rush_yards", models.FloatField(default=0.0)),
+                ("avg_pass_yards", models.FloatField(default=0.0)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rolling_stats",
+                        to="players.player",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["window", "position", "-avg_fantasy_points"],
+                        name="rolling_window_pos_fpts_idx",
+                    ),
+                    models.Index(
+                        fields=["window", "-avg_fantasy_points"],
+                        name="rolling_window_fpts_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="playerrollingstat",
+            constraint=models.UniqueConstraint(
+                fields=("player", "window"), name="unique_player_rolling_stat"
+            ),
+        ),
+    ]
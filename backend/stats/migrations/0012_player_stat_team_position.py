@@ -0,0 +1,61 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def copy_player_team_position(apps, schema_editor):
+    """
+    Start existing rows from the player's current team and position (what
+    queries used before); the next seed_stats run rewrites every row with
+    the team the player actually played for, since its source_hash changes.
+    """
+    FootballPlayerGameStat = apps.get_model("stats", "FootballPlayerGameStat")
+    Player = apps.get_model("players", "Player")
+    player = Player.objects.filter(id=OuterRef("player_id"))
+    FootballPlayerGameStat.objects.update(
+        team_id=Subquery(player.values("team_id")[:1]),
+        position=Subquery(player.values("position")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0006_delete_team_players"),
+        ("players", "0007_player_season"),
+        ("stats", "0011_playerrollingstat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="position",
+            field=models.CharField(blank=True, default="", max_length=25),
+        ),
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="team",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="player_game_stats",
+                to="teams.team",
+            ),
+        ),
+        migrations.RunPython(copy_player_team_position, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="footballplayergamestat",
+            index=models.Index(
+                fields=["team", "game"], name="player_stat_team_game_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="footballplayergamestat",
+            index=models.Index(
+                fields=["game", "position"], name="player_stat_game_pos_idx"
+            ),
+        ),
+    ]
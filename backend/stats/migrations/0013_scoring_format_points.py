@@ -0,0 +1,78 @@
+# Generated by Django 4.2.23 on 2026-10-17 13:35
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_format_points(apps, schema_editor):
+    """Half PPR / Standard = PPR minus 0.5 / 1 point per reception."""
+    FootballPlayerGameStat = apps.get_model("stats", "FootballPlayerGameStat")
+    FootballPlayerGameStat.objects.update(
+        fantasy_points_half=F("fantasy_points_ppr") - 0.5 * F("receptions"),
+        fantasy_points_std=F("fantasy_points_ppr") - F("receptions"),
+    )
+    # Averages are linear, so the same adjustment applies to them
+    PlayerRollingStat = apps.get_model("stats", "PlayerRollingStat")
+    PlayerRollingStat.objects.update(
+        avg_fantasy_points_half=F("avg_fantasy_points") - 0.5 * F("avg_receptions"),
+        avg_fantasy_points_std=F("avg_fantasy_points") - F("avg_receptions"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0012_player_stat_team_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="fantasy_points_half",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="fantasy_points_std",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="playerrollingstat",
+            name="avg_fantasy_points_half",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="playerrollingstat",
+            name="avg_fantasy_points_std",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_format_points, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="playerrollingstat",
+            index=models.Index(
+                fields=["window", "position", "-avg_fantasy_points_half"],
+                name="rolling_window_pos_half_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playerrollingstat",
+            index=models.Index(
+                fields=["window", "-avg_fantasy_points_half"],
+                name="rolling_window_half_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playerrollingstat",
+            index=models.Index(
+                fields=["window", "position", "-avg_fantasy_points_std"],
+                name="rolling_window_pos_std_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playerrollingstat",
+            index=models.Index(
+                fields=["window", "-avg_fantasy_points_std"],
+                name="rolling_window_std_idx",
+            ),
+        ),
+    ]
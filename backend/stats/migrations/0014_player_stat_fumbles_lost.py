@@ -0,0 +1,26 @@
+# Generated by Django 4.2.23 on 2026-10-17 14:16
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def move_fumbles_lost(apps, schema_editor):
+    """Seeded rows stored fumbles lost in fumbles; the next seed refills both."""
+    FootballPlayerGameStat = apps.get_model("stats", "FootballPlayerGameStat")
+    FootballPlayerGameStat.objects.update(fumbles_lost=F("fumbles"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0013_scoring_format_points"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="footballplayergamestat",
+            name="fumbles_lost",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(move_fumbles_lost, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,8 @@ from games.models import Game
 from players.models import Player
 from teams.models import Team
 
+from .scoring import format_points
+
 
 class FootballPlayerGameStat(models.Model):
     player = models.ForeignKey(
@@ -13,10 +15,23 @@ class FootballPlayerGameStat(models.Model):
         Game, on_delete=models.CASCADE, related_name="player_game_id"
     )
 
+    # The player's team and position as of the game (written by seed_stats),
+    # so queries by team or position skip the Player join and traded players
+    # keep their old team
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="player_game_stats",
+    )
+    position = models.CharField(max_length=25, blank=True, default="")
+
     rush_attempts = models.PositiveIntegerField(default=0)
     rush_yards = models.IntegerField(default=0)
     rush_touchdowns = models.PositiveIntegerField(default=0)
     fumbles = models.PositiveIntegerField(default=0)
+    fumbles_lost = models.PositiveIntegerField(default=0)
 
     pass_yards = models.IntegerField(default=0)
     pass_attempts = models.PositiveIntegerField(default=0)
@@ -34,6 +49,9 @@ class FootballPlayerGameStat(models.Model):
     two_pt = models.PositiveIntegerField(default=0)
 
     fantasy_points_ppr = models.FloatField(default=0.0)
+    # Derived from PPR at write time (stats.scoring.format_points)
+    fantasy_points_half = models.FloatField(default=0.0)
+    fantasy_points_std = models.FloatField(default=0.0)
 
     # Advanced Metrics
     snap_count = models.PositiveIntegerField(default=0)
@@ -50,6 +68,9 @@ class FootballPlayerGameStat(models.Model):
     air_yards = models.FloatField(default=0.0)  # Total air yards on targets
     yards_after_catch = models.FloatField(default=0.0)
 
+    # Fingerprint of the source row, so unchanged rows can skip re-writes
+    source_hash = models.CharField(max_length=20, blank=True, default="")
+
     @property
     def adot(self):
         """Average Depth of Target"""
@@ -59,6 +80,27 @@ class FootballPlayerGameStat(models.Model):
 
     # completion_pct @property
 
+    class Meta:
+        constraints = [
+            # One row per player per game (also indexes player lookups)
+            models.UniqueConstraint(
+                fields=["player", "game"], name="unique_player_game_stat"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["team", "game"], name="player_stat_team_game_idx"),
+            models.Index(fields=["game", "position"], name="player_stat_game_pos_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.fantasy_points_half = format_points(
+            "HALF", self.fantasy_points_ppr, self.receptions
+        )
+        self.fantasy_points_std = format_points(
+            "STD", self.fantasy_points_ppr, self.receptions
+        )
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.player} - {self.game}"
 
@@ -101,6 +143,9 @@ class FootballTeamGameStat(models.Model):
     fg_attempts = models.PositiveIntegerField(default=0)
     fg_made = models.PositiveIntegerField(default=0)
 
+    # Fingerprint of the source row, so unchanged rows can skip re-writes
+    source_hash = models.CharField(max_length=20, blank=True, default="")
+
     @property
     def completion_percentage(self):
         return self.pass_completions * 100 / self.pass_attempts
@@ -112,3 +157,80 @@ class FootballTeamGameStat(models.Model):
     @property
     def rush_avg(self):
         return self.rush_yards / self.rush_attempts
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "game"], name="unique_team_game_stat"
+            )
+        ]
+
+
+class PlayerRollingStat(models.Model):
+    """
+    A player's averages over a rolling window: his last N games, or the
+    current season to date (window = SEASON_TO_DATE).
+
+    Maintained by stats.rolling.refresh_rolling_stats (for the players a
+    stats sync touched) so leaderboards are indexed top-N reads instead of
+    aggregating every stat row ever stored.
+    """
+
+    SEASON_TO_DATE = 0
+
+    player = models.ForeignKey(
+        Player, on_delete=models.CASCADE, related_name="rolling_stats"
+    )
+    window = models.PositiveSmallIntegerField()
+    season = models.IntegerField()  # Season of the latest game in the window
+    position = models.CharField(max_length=25)  # Copied from Player for the index
+
+    games_played = models.PositiveIntegerField(default=0)
+    total_fantasy_points = models.FloatField(default=0.0)
+    avg_fantasy_points = models.FloatField(default=0.0)  # PPR
+    avg_fantasy_points_half = models.FloatField(default=0.0)
+    avg_fantasy_points_std = models.FloatField(default=0.0)
+    avg_targets = models.FloatField(default=0.0)
+    avg_receptions = models.FloatField(default=0.0)
+    avg_receiving_yards = models.FloatField(default=0.0)
+    avg_rush_attempts = models.FloatField(default=0.0)
+    avg_rush_yards = models.FloatField(default=0.0)
+    avg_pass_yards = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["player", "window"], name="unique_player_rolling_stat"
+            )
+        ]
+        indexes = [
+            # Top-N by position ("best RBs over the last 3 games")
+            models.Index(
+                fields=["window", "position", "-avg_fantasy_points"],
+                name="rolling_window_pos_fpts_idx",
+            ),
+            models.Index(
+                fields=["window", "-avg_fantasy_points"],
+                name="rolling_window_fpts_idx",
+            ),
+            # Same boards in the other built-in scoring formats
+            models.Index(
+                fields=["window", "position", "-avg_fantasy_points_half"],
+                name="rolling_window_pos_half_idx",
+            ),
+            models.Index(
+                fields=["window", "-avg_fantasy_points_half"],
+                name="rolling_window_half_idx",
+            ),
+            models.Index(
+                fields=["window", "position", "-avg_fantasy_points_std"],
+                name="rolling_window_pos_std_idx",
+            ),
+            models.Index(
+                fields=["window", "-avg_fantasy_points_std"],
+                name="rolling_window_std_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - window {self.window}"
@@ -0,0 +1,132 @@
+"""
+Rolling Player Aggregates
+
+Leaderboards (best_team, player search) used to average every stat row a
+player ever had on each cache miss, whatever window was asked for. Instead,
+PlayerRollingStat keeps each player's averages over the windows the UI
+offers (last 1/3/5/10 games, season to date), and stat syncs rebuild them
+for just the players whose rows changed.
+"""
+
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Max
+
+from games.models import Game
+
+from .models import FootballPlayerGameStat, PlayerRollingStat
+
+ROLLING_WINDOWS = (1, 3, 5, 10)  # Last N games
+SEASON_TO_DATE = PlayerRollingStat.SEASON_TO_DATE
+
+# PlayerRollingStat average -> FootballPlayerGameStat field
+AVERAGED_FIELDS = {
+    "avg_fantasy_points": "fantasy_points_ppr",
+    "avg_fantasy_points_half": "fantasy_points_half",
+    "avg_fantasy_points_std": "fantasy_points_std",
+    "avg_targets": "targets",
+    "avg_receptions": "receptions",
+    "avg_receiving_yards": "receiving_yards",
+    "avg_rush_attempts": "rush_attempts",
+    "avg_rush_yards": "rush_yards",
+    "avg_pass_yards": "pass_yards",
+}
+
+# Scoring format -> PlayerRollingStat average
+FORMAT_AVERAGES = {
+    "PPR": "avg_fantasy_points",
+    "HALF": "avg_fantasy_points_half",
+    "STD": "avg_fantasy_points_std",
+}
+
+
+def parse_window(value) -> int:
+    """
+    Window from a 'games' query param: 1, 3, 5, 10 or 'season'.
+
+    Raises:
+        ValueError: For any other value
+    """
+    if value == "season":
+        return SEASON_TO_DATE
+    window = int(value)
+    if window not in ROLLING_WINDOWS:
+        raise ValueError(f"Unsupported window: {value}")
+    return window
+
+
+def _rolling_stat(player_id, position, window, rows):
+    """PlayerRollingStat averaging rows (newest first)"""
+    count = len(rows)
+    averages = {
+        name: sum(row[field] for row in rows) / count
+        for name, field in AVERAGED_FIELDS.items()
+    }
+    return PlayerRollingStat(
+        player_id=player_id,
+        window=window,
+        season=rows[0]["game__season"],
+        position=position,
+        games_played=count,
+        total_fantasy_points=sum(row["fantasy_points_ppr"] for row in rows),
+        **averages,
+    )
+
+
+def refresh_rolling_stats(player_ids=None) -> int:
+    """
+    Rebuild rolling aggregates.
+
+    Args:
+        player_ids: Players to rebuild (None = every player)
+
+    Returns:
+        Number of PlayerRollingStat rows written
+    """
+    current_season = Game.objects.exclude(home_score=None).aggregate(
+        season=Max("season")
+    )["season"]
+
+    stats = FootballPlayerGameStat.objects.all()
+    existing = PlayerRollingStat.objects.all()
+    if player_ids is not None:
+        player_ids = list(player_ids)
+        stats = stats.filter(player_id__in=player_ids)
+        existing = existing.filter(player_id__in=player_ids)
+
+    rows = stats.order_by("player_id", "-game__date").values(
+        "player_id", "player__position", "game__season", *AVERAGED_FIELDS.values()
+    )
+
+    new_stats = []
+    for player_id, player_rows in groupby(
+        rows.iterator(chunk_size=2000), key=lambda row: row["player_id"]
+    ):
+        player_rows = list(player_rows)
+        position = player_rows[0]["player__position"]
+        for window in ROLLING_WINDOWS:
+            new_stats.append(
+                _rolling_stat(player_id, position, window, player_rows[:window])
+            )
+
+        # Newest first, so this season's games are a prefix
+        season_rows = []
+        for row in player_rows:
+            if row["game__season"] != current_season:
+                break
+            season_rows.append(row)
+        if season_rows:
+            new_stats.append(
+                _rolling_stat(player_id, position, SEASON_TO_DATE, season_rows)
+            )
+
+    with transaction.atomic():
+        existing.delete()
+        # Players who haven't played since last season drop off season boards
+        PlayerRollingStat.objects.filter(window=SEASON_TO_DATE).exclude(
+            season=current_season
+        ).delete()
+        PlayerRollingStat.objects.bulk_create(new_stats, batch_size=1000)
+
+    return len(new_stats)
@@ -0,0 +1,162 @@
+"""
+Fantasy Scoring
+
+Every ranking used to read fantasy_points_ppr, whatever scoring format a
+draft was set up with.
+
+BUILT-IN FORMATS:
+-----------------
+PPR, Half PPR and Standard only differ in points per reception, so their
+totals are the source PPR total adjusted by receptions (format_points).
+This keeps everything else the source scores but we don't store (return
+TDs, for one) identical across formats.
+FootballPlayerGameStat stores one column per format, written at seed time,
+so ordering by a format costs the same as ordering by PPR.
+
+CUSTOM RULES:
+-------------
+ScoringRules holds per-stat weights plus threshold bonuses ("+3 for 100
+rushing yards"). ScoringRules.expression() turns them into one SQL
+expression over a stat row, so the database scores every row in the same
+pass that aggregates them.
+"""
+
+from dataclasses import dataclass, field, fields
+
+from django.db.models import Case, F, FloatField, Value, When
+
+# Scoring format -> FootballPlayerGameStat column
+FORMAT_COLUMNS = {
+    "PPR": "fantasy_points_ppr",
+    "HALF": "fantasy_points_half",
+    "STD": "fantasy_points_std",
+}
+CUSTOM_FORMAT = "CUSTOM"
+
+# ScoringRules weight -> FootballPlayerGameStat field it multiplies
+WEIGHT_FIELDS = {
+    "pass_yard": "pass_yards",
+    "pass_td": "pass_touchdowns",
+    "interception": "interceptions",
+    "rush_yard": "rush_yards",
+    "rush_td": "rush_touchdowns",
+    "reception": "receptions",
+    "receiving_yard": "receiving_yards",
+    "receiving_td": "receiving_touchdowns",
+    "fumble": "fumbles_lost",
+    "two_pt": "two_pt",
+}
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    """Points per unit of each stat, plus (stat field, threshold, points) bonuses."""
+
+    pass_yard: float = 0.04
+    pass_td: float = 4.0
+    interception: float = -2.0
+    rush_yard: float = 0.1
+    rush_td: float = 6.0
+    reception: float = 1.0
+    receiving_yard: float = 0.1
+    receiving_td: float = 6.0
+    fumble: float = -2.0
+    two_pt: float = 2.0
+    bonuses: tuple = field(default=())
+
+    @classmethod
+    def from_dict(cls, data) -> "ScoringRules":
+        """
+        Rules from a request payload, e.g.
+        {"reception": 0.5, "pass_td": 6, "bonuses": [["rush_yards", 100, 3]]}
+
+        Raises:
+            ValueError: Unknown weight or bonus stat, or a non-numeric value
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Scoring rules must be an object")
+        weights = {f.name for f in fields(cls)} - {"bonuses"}
+        unknown = set(data) - weights - {"bonuses"}
+        if unknown:
+            raise ValueError(f"Unknown scoring rules: {', '.join(sorted(unknown))}")
+
+        try:
+            values = {name: float(data[name]) for name in weights & set(data)}
+            bonuses = tuple(
+                (stat, float(threshold), float(points))
+                for stat, threshold, points in data.get("bonuses", [])
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Scoring rule values must be numbers")
+        for stat, _, _ in bonuses:
+            if stat not in WEIGHT_FIELDS.values():
+                raise ValueError(f"Unknown bonus stat: {stat}")
+        return cls(**values, bonuses=bonuses)
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in WEIGHT_FIELDS}
+        data["bonuses"] = [list(bonus) for bonus in self.bonuses]
+        return data
+
+    def expression(self, prefix=""):
+        """
+        Fantasy points of one stat row as a database expression.
+
+        Args:
+            prefix: Lookup path to the stat row, e.g. "player_id__" when
+                annotating players through their FootballPlayerGameStat rows
+        """
+        points = Value(0.0, output_field=FloatField())
+        for weight, stat in WEIGHT_FIELDS.items():
+            if getattr(self, weight):
+                points = points + F(f"{prefix}{stat}") * getattr(self, weight)
+        for stat, threshold, bonus in self.bonuses:
+            points = points + Case(
+                When(**{f"{prefix}{stat}__gte": threshold}, then=Value(bonus)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        return points
+
+
+SCORING_FORMATS = {
+    "PPR": ScoringRules(reception=1.0),
+    "HALF": ScoringRules(reception=0.5),
+    "STD": ScoringRules(reception=0.0),
+}
+
+
+def parse_format(value) -> str:
+    """
+    Built-in scoring format from a query param (default PPR).
+
+    Raises:
+        ValueError: For anything other than PPR, HALF or STD
+    """
+    scoring = (value or "PPR").upper()
+    if scoring not in FORMAT_COLUMNS:
+        raise ValueError(f"Unsupported scoring format: {value}")
+    return scoring
+
+
+def format_points(scoring, ppr, receptions):
+    """
+    Points in a built-in format from the PPR total.
+
+    Plain arithmetic, so ppr/receptions can be numbers, Polars expressions
+    or Django F() expressions.
+    """
+    return ppr + (SCORING_FORMATS[scoring].reception - 1.0) * receptions
+
+
+def fantasy_points(scoring, prefix=""):
+    """
+    Fantasy points of one stat row as a database expression.
+
+    Args:
+        scoring: Built-in format name or ScoringRules
+        prefix: Lookup path to the stat row (see ScoringRules.expression)
+    """
+    if isinstance(scoring, ScoringRules):
+        return scoring.expression(prefix)
+    return F(f"{prefix}{FORMAT_COLUMNS[scoring]}")
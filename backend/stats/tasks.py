@@ -1,12 +1,23 @@
 import logging
 from datetime import datetime, timedelta
 
-from celery import shared_task
-from django.core.cache import cache
+from celery import chord, shared_task
 from django.core.management import call_command
 
-from api.cache_utils import invalidate_team_cache
+from api.cache_utils import (
+    ALL_STATS_TAG,
+    game_tag,
+    invalidate_all_caches,
+    invalidate_tags,
+    invalidate_team_cache,
+    player_tag,
+    season_tag,
+    team_tag,
+)
+from api.cache_warmup import merge_timings, warm_team_endpoints, warm_week_predictions
 from games.models import Game
+from stats.ingest import sync_stats
+from teams.models import Team
 
 logger = logging.getLogger(__name__)
 
@@ -44,10 +55,10 @@ def seed_stats():
         logger.info("Successfully seeded stats")
 
         # Invalidate all caches after seeding stats
-        cache.clear()
-        logger.info("Cache cleared after seeding stats")
+        invalidate_all_caches()
+        logger.info("Cache invalidated after seeding stats")
 
-        return "Stats seeded successfully and cache cleared"
+        return "Stats seeded successfully and cache invalidated"
     except Exception as e:
         logger.error(f"Error seeding stats: {str(e)}")
         raise
@@ -65,8 +76,8 @@ def seed_all_data():
         call_command("seed_stats")
         logger.info("Stats seeded")
 
-        cache.clear()
-        logger.info("All data seeded and cache cleared")
+        invalidate_all_caches()
+        logger.info("All data seeded and cache invalidated")
 
         return "All data seeded successfully"
     except Exception as e:
@@ -109,18 +120,85 @@ def invalidate_recent_game_cache():
         raise
 
 
+def invalidate_sync_result(result):
+    # Invalidate cache for only the games, teams, players and seasons a stats sync changed
+    if not result.changed_games:
+        return
+    invalidate_tags(
+        ALL_STATS_TAG,
+        *[game_tag(game_id) for game_id in result.changed_games],
+        *[team_tag(team_id) for team_id in result.changed_teams],
+        *[player_tag(player_id) for player_id in result.changed_players],
+        *[season_tag(season) for season in result.changed_seasons],
+    )
+
+
 @shared_task
 def clear_all_cache():
-    # Clear all caches
+    # Invalidate all caches (bumps the global cache generation)
     try:
-        cache.clear()
-        logger.info("All caches cleared")
-        return "All caches cleared"
+        invalidate_all_caches()
+        logger.info("All caches invalidated")
+        return "All caches invalidated"
     except Exception as e:
         logger.error(f"Error clearing cache: {str(e)}")
         raise
 
 
+"""
+============================================
+Cache Warm-up
+============================================
+"""
+
+WARM_CHUNK_SIZE = 8  # Teams per parallel warm-up task
+
+
+@shared_task
+def warm_team_cache(team_ids):
+    # Precompute analytics payloads for a chunk of teams
+    return warm_team_endpoints(team_ids)
+
+
+@shared_task
+def warm_prediction_cache():
+    # Precompute predictions for the current week
+    return warm_week_predictions()
+
+
+@shared_task
+def report_cache_warmup(results):
+    # Chord callback: log total time spent per endpoint across all chunks
+    timings = merge_timings(results)
+    for endpoint, timing in sorted(timings.items()):
+        logger.info(
+            f"Warmed {endpoint}: {timing['requests']} requests in "
+            f"{timing['seconds']:.2f}s"
+        )
+    return timings
+
+
+@shared_task
+def warm_analytics_cache(team_ids=None):
+    # Warm the cache in parallel chunks (all teams by default)
+    try:
+        if team_ids is None:
+            team_ids = list(Team.objects.order_by("id").values_list("id", flat=True))
+
+        # ceil(n / WARM_CHUNK_SIZE) chunks, dealt round-robin
+        num_chunks = -(-len(team_ids) // WARM_CHUNK_SIZE)
+        chunks = [team_ids[i::num_chunks] for i in range(num_chunks)]
+        header = [warm_team_cache.s(chunk) for chunk in chunks]
+        chord([*header, warm_prediction_cache.s()])(report_cache_warmup.s())
+
+        logger.info(f"Warming cache for {len(team_ids)} teams in {len(chunks)} chunks")
+        return f"Cache warm-up started for {len(team_ids)} teams"
+
+    except Exception as e:
+        logger.error(f"Error warming cache: {str(e)}")
+        raise
+
+
 """
 ============================================
 Scheduled Refresh Tasks
@@ -140,20 +218,18 @@ def refresh_current_week_stats():
             logger.info("No games today, skipping stat refresh")
             return "No games today"
 
-        # Reseed stats (this will update_or_create, so safe to run multiple times)
-        call_command("seed_stats")
-
-        # Invalidate cache for teams playing today
-        team_ids = set()
-        for game in current_week_games:
-            team_ids.add(game.home_team_id)
-            team_ids.add(game.away_team_id)
-
-        for team_id in team_ids:
-            invalidate_team_cache(team_id)
+        # Resync only today's games; unchanged rows are skipped
+        result = sync_stats(
+            seasons={game.season for game in current_week_games},
+            game_ids=[game.id for game in current_week_games],
+        )
+        invalidate_sync_result(result)
 
-        logger.info(f"Refreshed stats for {len(team_ids)} teams playing today")
-        return f"Stats refreshed for {len(team_ids)} teams"
+        logger.info(
+            f"Refreshed stats for {len(result.changed_games)} changed games "
+            f"({len(result.changed_teams)} teams)"
+        )
+        return f"Stats refreshed for {len(result.changed_teams)} teams"
 
     except Exception as e:
         logger.error(f"Error refreshing current week stats: {str(e)}")
@@ -176,9 +252,10 @@ def weekly_data_refresh():
         call_command("seed_stats")
         logger.info("Stats updated")
 
-        # Clear all caches
-        cache.clear()
-        logger.info("Weekly refresh complete, cache cleared")
+        # Invalidate all caches, then rebuild the most-requested payloads
+        invalidate_all_caches()
+        warm_analytics_cache.delay()
+        logger.info("Weekly refresh complete, cache invalidated and warming")
 
         return "Weekly data refresh completed successfully"
 
@@ -221,19 +298,19 @@ def refresh_live_games():
         if not live_games:
             return "No live games right now"
 
-        # Reseed stats
-        call_command("seed_stats")
-
-        # Invalidate cache for teams in live games
-        team_ids = set()
-        for game in live_games:
-            team_ids.add(game.home_team_id)
-            team_ids.add(game.away_team_id)
-
-        for team_id in team_ids:
-            invalidate_team_cache(team_id)
-
-        logger.info(f"Refreshed {len(live_games)} live games")
+        # Resync only the live games; unchanged rows are skipped
+        result = sync_stats(
+            seasons={game.season for game in live_games},
+            game_ids=[game.id for game in live_games],
+        )
+        invalidate_sync_result(result)
+        if result.changed_teams:
+            warm_analytics_cache.delay(sorted(result.changed_teams))
+
+        logger.info(
+            f"Refreshed {len(live_games)} live games, "
+            f"{len(result.changed_games)} changed"
+        )
         return f"Refreshed {len(live_games)} live games"
 
     except Exception as e:
@@ -2,6 +2,9 @@
 ASGI config for untitled_football_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves it with gunicorn's uvicorn worker, so async views (e.g.
+the draft pick stream in draft/streaming.py) stream without tying up a
+thread per connection.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -44,15 +44,8 @@ app.conf.beat_schedule = {
         ),
         # Runs Tuesday at 3 AM (after Monday Night Football)
     },
-    """
-    ============================================
-    DAILY TASKS
-    ============================================
-    """
-    "clear-stale-cache-daily": {
-        "task": "stats.tasks.clear_all_cache",
-        "schedule": crontab(hour=4, minute=0),  # 4 AM
-    },
+    # No daily cache wipe: stat syncs invalidate exactly the teams, players
+    # and seasons they change (see api/cache_utils.py)
     # ===========================================
     # SEASON START TASKS (Manual/One-time)
     # ===========================================
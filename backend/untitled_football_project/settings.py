@@ -151,8 +151,18 @@ CACHE_TTL = {
     "team_stats": 60 * 10,
     "analytics": 60 * 15,
     "predictions": 60 * 15,  # Cache predictions for 15 minutes
+    "final": 60 * 60 * 24 * 7,  # Completed games / past seasons (tag-invalidated)
+    "draft": 60 * 60 * 6,  # Ranked player pool snapshot per draft session
 }
 
+# Serve team analytics from an in-process NumPy copy of the stats tables
+# (stats/cube.py) instead of the database; compare with benchmark_stats_cube
+STATS_CUBE_ENABLED = os.environ.get("STATS_CUBE_ENABLED", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
 
 """
 Scheduled Jobs (Celery)
@@ -41,6 +41,27 @@ export async function getDefenseAllowed(numGames, teamId, position) {
   return response.data
 }
 
+/*
+  Output of /api/analytics/defense-rankings API:
+  Param: games (default=3), position (optional: QB, RB, WR, TE)
+
+  {
+    'games_analyzed': <int>,
+    'positions': {
+      'QB': [{ team_id, team, games, fantasy_pts_allowed, yards_allowed, tds_allowed, rank, percentile }],
+      ...
+    }
+  }
+  Rank 1 allowed the fewest fantasy points per game; percentile 100 is the toughest defense.
+  Values are per-game totals for the whole position (yards include passing), unlike the
+  per-player averages in player-comparison's opponent_defense.
+*/
+export async function getDefenseRankings(numGames = 3, position = null) {
+  const positionParam = position ? `&position=${position}` : ''
+  const response = await api.get(`analytics/defense-rankings/?games=${numGames}${positionParam}`)
+  return response.data
+}
+
 /*
   Output of /api/analytics/player-stats API:
   Param: games (default=3), team_id
@@ -89,6 +110,22 @@ export async function getPlayerComparison(playerId, numGames = 3) {
   return response.data
 }
 
+/*
+  Output of /api/analytics/player-comparison-batch API:
+  Param: player_ids (comma-separated, max 25), games (default=3)
+
+  Returns:
+  {
+    'games_analyzed': <int>,
+    'players': [<player-comparison output>, ...],  // in request order
+    'not_found': [<player_id>, ...]
+  }
+*/
+export async function getPlayerComparisonBatch(playerIds, numGames = 3) {
+  const response = await api.get(`analytics/player-comparison-batch/?player_ids=${playerIds.join(',')}&games=${numGames}`)
+  return response.data
+}
+
 /*
   Output of /api/analytics/game-box-score API:
   Param: game_id (required)
@@ -137,7 +174,7 @@ export async function getPlayerTrend(playerId, numGames = 10) {
   return response.data
 }
 
-export async function getBestTeam(numGames = 3) {
-  const response = await api.get(`analytics/best-team/?games=${numGames}`)
+export async function getBestTeam(numGames = 3, scoring = 'PPR') {
+  const response = await api.get(`analytics/best-team/?games=${numGames}&scoring=${scoring}`)
   return response.data
 }
\ No newline at end of file
@@ -17,8 +17,52 @@ export async function makePick(sessionId, playerId) {
   return data
 }
 
-export async function getDraftBoard(sessionId) {
-  const { data } = await client.get(`/draft/${sessionId}/board/`)
+// Same as makePick, but calls onPick(aiPick) for each AI pick as the server
+// streams it (server-sent events). Resolves with the final session state.
+// Uses fetch because axios can't read a response body as a stream in the
+// browser; the draft endpoints take no simulation params, so skipping the
+// client's interceptors loses nothing. If the stream drops, the turn is
+// already saved: catch up with getDraftBoard(sessionId, { sincePick }).
+export async function makePickStream(sessionId, playerId, onPick, { intervalMs } = {}) {
+  // getUri joins baseURL like client requests do (with or without a
+  // trailing slash, absolute or relative)
+  const url = client.getUri({
+    url: `/draft/${sessionId}/pick/stream/`,
+    params: intervalMs ? { interval_ms: intervalMs } : undefined,
+  })
+  const response = await fetch(url, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ player_id: playerId }),
+  })
+  if (!response.ok) {
+    const { error } = await response.json().catch(() => ({}))
+    throw new Error(error || `Request failed with status code ${response.status}`)
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  let state = null
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    const events = buffer.split('\n\n')
+    buffer = events.pop()
+    for (const event of events) {
+      const [nameLine, dataLine] = event.split('\n')
+      const data = JSON.parse(dataLine.slice('data: '.length))
+      if (nameLine === 'event: pick') onPick(data)
+      else if (nameLine === 'event: done') state = data
+    }
+  }
+  return state
+}
+
+export async function getDraftBoard(sessionId, { sincePick } = {}) {
+  const params = {}
+  if (sincePick) params.since_pick = sincePick
+  const { data } = await client.get(`/draft/${sessionId}/board/`, { params })
   return data
 }
 
@@ -34,3 +78,29 @@ export async function getUserRoster(sessionId) {
   const { data } = await client.get(`/draft/${sessionId}/roster/`)
   return data
 }
+
+// A run that isn't cached yet is simulated in the background: the server
+// answers 202 with Retry-After, so poll until the result lands
+const ADP_MAX_POLLS = 30
+
+export async function getDraftADP({ num_teams, num_rounds, scoring_format, noise } = {}) {
+  const params = {}
+  if (num_teams) params.num_teams = num_teams
+  if (num_rounds) params.num_rounds = num_rounds
+  if (scoring_format) params.scoring_format = scoring_format
+  if (noise !== undefined) params.noise = noise
+  for (let poll = 0; poll < ADP_MAX_POLLS; poll++) {
+    const response = await client.get('/draft/adp/', { params })
+    if (response.status !== 202) return response.data
+    const retryAfter = Number(response.headers['retry-after']) || 5
+    await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000))
+  }
+  throw new Error('ADP simulation is taking too long, try again later')
+}
+
+export async function getPickRecommendations(sessionId, { top } = {}) {
+  const params = {}
+  if (top) params.top = top
+  const { data } = await client.get(`/draft/${sessionId}/recommendations/`, { params })
+  return data
+}
@@ -1,11 +1,32 @@
 import { useState, useCallback } from 'react'
-import { createDraftSession, makePick, getDraftBoard } from '../../api/draft'
+import { createDraftSession, makePickStream, getDraftBoard } from '../../api/draft'
 import DraftSetup from './components/DraftSetup'
 import DraftBoard from './components/DraftBoard'
 import AvailablePlayers from './components/AvailablePlayers'
 import UserRoster from './components/UserRoster'
 import './styles/Draft.css'
 
+// Spacing between streamed AI picks, so the board fills in pick by pick
+const PICK_INTERVAL_MS = 150
+
+// A streamed AI pick in the board's pick shape (team and image arrive with
+// the board catch-up after the turn)
+function streamedPick(pick) {
+  return {
+    overall_pick: pick.overall_pick,
+    round_number: pick.round_number,
+    team_number: pick.team_number,
+    is_user: false,
+    player: {
+      id: pick.player_id,
+      name: pick.player_name,
+      position: pick.player_position,
+      team: null,
+      image_url: null,
+    },
+  }
+}
+
 export default function Draft() {
   const [session, setSession] = useState(null)
   const [board, setBoard] = useState([])
@@ -24,24 +45,41 @@ export default function Draft() {
   const handlePick = useCallback(async (playerId) => {
     if (!session || picking) return
     setPicking(true)
+    const sincePick = board.length ? board[board.length - 1].overall_pick : 0
+    try {
+      await makePickStream(session.session_id, playerId, (pick) => {
+        setBoard(prev => [...prev, streamedPick(pick)])
+        setSession(prev => ({
+          ...prev,
+          current_pick: pick.overall_pick + 1,
+          current_round: pick.round_number,
+        }))
+      }, { intervalMs: PICK_INTERVAL_MS })
+    } catch (err) {
+      // A rejected pick or a dropped stream: the catch-up below shows
+      // whatever the server saved either way
+      console.error('Error making pick:', err)
+    }
     try {
-      const result = await makePick(session.session_id, playerId)
-      // Refresh board
-      const boardData = await getDraftBoard(session.session_id)
-      setBoard(boardData.picks)
+      // Only the picks after the last one we had, including the user's own
+      const boardData = await getDraftBoard(session.session_id, { sincePick })
+      setBoard(prev => [
+        ...prev.filter(pick => pick.overall_pick <= sincePick),
+        ...boardData.picks,
+      ])
       setSession(prev => ({
         ...prev,
-        status: result.status,
-        current_pick: result.current_pick,
-        current_round: result.current_round,
+        status: boardData.status,
+        current_pick: boardData.current_pick,
+        current_round: boardData.current_round,
       }))
       setRefreshKey(k => k + 1)
     } catch (err) {
-      console.error('Error making pick:', err)
+      console.error('Error refreshing board:', err)
     } finally {
       setPicking(false)
     }
-  }, [session, picking])
+  }, [session, picking, board])
 
   const isComplete = session?.status === 'completed'
   const isUserTurn = session && !isComplete